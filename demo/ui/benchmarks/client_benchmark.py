@@ -0,0 +1,137 @@
+"""Compares UI refresh throughput before and after connection pooling.
+
+A conversation server backed by the fake agent manager is started in
+process. Each refresh runs on a fresh event loop, the way Mesop runs event
+handlers, and is done two ways:
+
+  per-call: the four listing RPCs UpdateAppState used to make, each on a
+            brand new httpx.AsyncClient.
+  pooled:   one app_state/get RPC through the shared, pooled client.
+
+run (from demo/ui):
+  uv run python -m benchmarks.client_benchmark --refreshes 500
+"""
+
+import argparse
+import asyncio
+import os
+import threading
+import time
+import uuid
+
+import httpx
+import uvicorn
+
+from a2a.types import Message, Part, Role, Task, TaskState, TaskStatus, TextPart
+from fastapi import FastAPI
+from service.client.client import ConversationClient
+from service.types import (
+    AppStateParams,
+    GetAppStateRequest,
+    ListConversationRequest,
+    ListMessageRequest,
+    ListTaskRequest,
+    PendingMessageRequest,
+)
+
+
+def start_server(port: int, conversations: int, tasks: int) -> uvicorn.Server:
+    os.environ['A2A_HOST'] = 'FAKE'
+    from service.server.server import ConversationServer
+
+    app = FastAPI()
+    server = ConversationServer(app, httpx.AsyncClient())
+    for _ in range(conversations):
+        conversation = server.manager.create_conversation()
+        conversation.messages.append(
+            Message(
+                role=Role.user,
+                parts=[Part(root=TextPart(text='hello'))],
+                message_id=str(uuid.uuid4()),
+                context_id=conversation.conversation_id,
+            )
+        )
+    for _ in range(tasks):
+        server.manager.add_task(
+            Task(
+                id=str(uuid.uuid4()),
+                context_id=conversation.conversation_id,
+                status=TaskStatus(state=TaskState.completed),
+            )
+        )
+    uvicorn_server = uvicorn.Server(
+        uvicorn.Config(app, port=port, log_level='warning')
+    )
+    threading.Thread(target=uvicorn_server.run, daemon=True).start()
+    while not uvicorn_server.started:
+        time.sleep(0.05)
+    return uvicorn_server
+
+
+async def per_call_refresh(base_url: str, conversation_id: str):
+    requests = [
+        ListMessageRequest(params=conversation_id),
+        ListConversationRequest(),
+        ListTaskRequest(),
+        PendingMessageRequest(),
+    ]
+    for request in requests:
+        async with httpx.AsyncClient() as client:
+            response = await client.post(
+                f'{base_url}/{request.method}',
+                json=request.model_dump(mode='json', exclude_none=True),
+            )
+            response.raise_for_status()
+
+
+async def pooled_refresh(client: ConversationClient, conversation_id: str):
+    await client.get_app_state(
+        GetAppStateRequest(
+            params=AppStateParams(conversation_id=conversation_id)
+        )
+    )
+
+
+def measure(name: str, refreshes: int, rpcs: int, refresh):
+    began = time.perf_counter()
+    for _ in range(refreshes):
+        asyncio.run(refresh())
+    elapsed = time.perf_counter() - began
+    print(
+        f'{name:>10} {refreshes / elapsed:>12.1f} '
+        f'{refreshes * rpcs / elapsed:>12.1f}'
+    )
+
+
+def main(refreshes: int, port: int, conversations: int, tasks: int):
+    start_server(port, conversations, tasks)
+    base_url = f'http://127.0.0.1:{port}'
+    client = ConversationClient(base_url)
+    conversation_id = (
+        asyncio.run(client.list_conversation(ListConversationRequest()))
+        .result[0]
+        .conversation_id
+    )
+    print(f'{"mode":>10} {"refresh/s":>12} {"requests/s":>12}')
+    measure(
+        'per-call',
+        refreshes,
+        4,
+        lambda: per_call_refresh(base_url, conversation_id),
+    )
+    measure(
+        'pooled',
+        refreshes,
+        1,
+        lambda: pooled_refresh(client, conversation_id),
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--refreshes', type=int, default=500)
+    parser.add_argument('--port', type=int, default=12100)
+    parser.add_argument('--conversations', type=int, default=10)
+    parser.add_argument('--tasks', type=int, default=50)
+    args = parser.parse_args()
+    main(args.refreshes, args.port, args.conversations, args.tasks)
@@ -0,0 +1,80 @@
+"""Soaks the StateStore retention policy with synthetic events.
+
+Events are spread over a rotating set of conversations far larger than the
+retention limit, so without eviction memory would grow with every event.
+The resident set size is reported per batch and should level off once the
+store is full.
+
+run (from demo/ui):
+  uv run python -m benchmarks.retention_soak --events 1000000
+"""
+
+import argparse
+import os
+import resource
+import uuid
+
+from a2a.types import Message, Part, Role, Task, TaskState, TaskStatus, TextPart
+from service.server.retention import RetentionPolicy
+from service.server.state_store import StateStore
+from service.types import Conversation, Event
+
+
+def rss_mb() -> float:
+    """Current resident set size, falling back to the peak off Linux."""
+    try:
+        with open('/proc/self/statm') as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def make_event(context_id: str, index: int) -> Event:
+    return Event(
+        id=str(uuid.uuid4()),
+        actor='soak',
+        content=Message(
+            role=Role.agent,
+            parts=[Part(root=TextPart(text=f'event {index}'))],
+            message_id=str(uuid.uuid4()),
+            context_id=context_id,
+        ),
+        timestamp=float(index),
+    )
+
+
+def run(events: int, batch_size: int, events_per_conversation: int):
+    policy = RetentionPolicy.from_env()
+    store = StateStore(policy)
+    context_id = ''
+    print(f'{"events":>10} {"rss MB":>10} {"stored":>10} {"evicted":>10}')
+    for i in range(events):
+        if i % events_per_conversation == 0:
+            context_id = str(uuid.uuid4())
+            store.add_conversation(
+                Conversation(conversation_id=context_id, is_active=True)
+            )
+            store.add_task(
+                Task(
+                    id=str(uuid.uuid4()),
+                    context_id=context_id,
+                    status=TaskStatus(state=TaskState.working),
+                )
+            )
+        store.add_event(make_event(context_id, i))
+        if (i + 1) % batch_size == 0:
+            stats = store.stats()
+            print(
+                f'{i + 1:>10} {rss_mb():>10.1f} {stats.events:>10} '
+                f'{stats.evicted_events:>10}'
+            )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--events', type=int, default=1_000_000)
+    parser.add_argument('--batch-size', type=int, default=100_000)
+    parser.add_argument('--events-per-conversation', type=int, default=2_000)
+    args = parser.parse_args()
+    run(args.events, args.batch_size, args.events_per_conversation)
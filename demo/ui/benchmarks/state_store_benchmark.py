@@ -0,0 +1,88 @@
+"""Replays task status updates through ADKHostManager.task_callback.
+
+Every update targets a distinct task in a growing task set, so the cost of
+an update would grow with the number of tasks if lookups scanned the
+history. The per-update latency is reported per batch and should stay flat.
+
+run (from demo/ui):
+  uv run python -m benchmarks.state_store_benchmark --updates 100000
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+
+from a2a.types import (
+    AgentCapabilities,
+    AgentCard,
+    Message,
+    Part,
+    Role,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+from service.server.adk_host_manager import ADKHostManager
+
+
+AGENT_CARD = AgentCard(
+    name='benchmark_agent',
+    description='Synthetic agent used to replay task updates',
+    url='http://localhost:0',
+    version='1.0.0',
+    capabilities=AgentCapabilities(streaming=True),
+    default_input_modes=['text'],
+    default_output_modes=['text'],
+    skills=[],
+)
+
+
+def make_update(task_id: str, context_id: str) -> TaskStatusUpdateEvent:
+    return TaskStatusUpdateEvent(
+        task_id=task_id,
+        context_id=context_id,
+        final=False,
+        status=TaskStatus(
+            state=TaskState.working,
+            message=Message(
+                role=Role.agent,
+                parts=[Part(root=TextPart(text='working'))],
+                message_id=str(uuid.uuid4()),
+                context_id=context_id,
+                task_id=task_id,
+            ),
+        ),
+    )
+
+
+async def run(updates: int, batch_size: int, contexts: int):
+    async with httpx.AsyncClient() as client:
+        manager = ADKHostManager(client)
+        context_ids = [str(uuid.uuid4()) for _ in range(contexts)]
+        print(f'{"tasks":>10} {"us/update":>12}')
+        for start in range(0, updates, batch_size):
+            batch = [
+                make_update(str(uuid.uuid4()), context_ids[i % contexts])
+                for i in range(start, min(start + batch_size, updates))
+            ]
+            began = time.perf_counter()
+            for update in batch:
+                manager.task_callback(update, AGENT_CARD)
+            elapsed = time.perf_counter() - began
+            print(
+                f'{start + len(batch):>10} '
+                f'{elapsed / len(batch) * 1_000_000:>12.2f}'
+            )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--updates', type=int, default=100_000)
+    parser.add_argument('--batch-size', type=int, default=10_000)
+    parser.add_argument('--contexts', type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(run(args.updates, args.batch_size, args.contexts))
@@ -13,6 +13,7 @@ from styles.styles import (
 
 from .async_poller import AsyncAction, async_poller
 from .side_nav import sidenav
+from .update_stream import update_stream
 
 
 async def refresh_app_state(e: mel.WebEvent):  # pylint: disable=unused-argument
@@ -27,14 +28,17 @@ async def refresh_app_state(e: mel.WebEvent):  # pylint: disable=unused-argument
 def page_scaffold():
     """Page scaffold component"""
     app_state = me.state(AppState)
-    action = (
-        AsyncAction(
-            value=app_state, duration_seconds=app_state.polling_interval
+    if app_state.live_updates:
+        update_stream(trigger_event=refresh_app_state)
+    else:
+        action = (
+            AsyncAction(
+                value=app_state, duration_seconds=app_state.polling_interval
+            )
+            if app_state
+            else None
         )
-        if app_state
-        else None
-    )
-    async_poller(action=action, trigger_event=refresh_app_state)
+        async_poller(action=action, trigger_event=refresh_app_state)
 
     sidenav('')
 
@@ -15,8 +15,11 @@ def polling_buttons():
         )
     ):
         me.button_toggle(
-            value=[str(state.polling_interval)],
+            value=[
+                'live' if state.live_updates else str(state.polling_interval)
+            ],
             buttons=[
+                me.ButtonToggleButton(label='Live', value='live'),
                 me.ButtonToggleButton(label='1s', value='1'),
                 me.ButtonToggleButton(label='5s', value='5'),
                 me.ButtonToggleButton(label='30s', value='30'),
@@ -40,6 +43,10 @@ def polling_buttons():
 
 def on_change(e: me.ButtonToggleChangeEvent):
     state = me.state(AppState)
+    if e.value == 'live':
+        state.live_updates = True
+        return
+    state.live_updates = False
     state.polling_interval = int(e.value)
 
 
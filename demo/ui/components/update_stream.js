@@ -0,0 +1,48 @@
+import {
+  LitElement,
+  html,
+} from 'https://cdn.jsdelivr.net/gh/lit/dist@3/core/lit-core.min.js';
+
+class UpdateStream extends LitElement {
+  static properties = {
+    triggerEvent: {type: String},
+    url: {type: String},
+    debounce_ms: {type: Number},
+  };
+
+  render() {
+    return html`<div></div>`;
+  }
+
+  connectedCallback() {
+    super.connectedCallback();
+    this.pending = null;
+    this.source = new EventSource(this.url);
+    // Refresh once the stream is (re)opened, to catch anything missed
+    // while disconnected, then on every pushed change.
+    this.source.onopen = () => this.scheduleRefresh();
+    for (const kind of ['conversation', 'message', 'task', 'event', 'reset']) {
+      this.source.addEventListener(kind, () => this.scheduleRefresh());
+    }
+  }
+
+  disconnectedCallback() {
+    super.disconnectedCallback();
+    this.source.close();
+    clearTimeout(this.pending);
+  }
+
+  scheduleRefresh() {
+    // Coalesce bursts of updates, e.g. streamed artifact chunks, into one
+    // refresh.
+    if (this.pending) {
+      return;
+    }
+    this.pending = setTimeout(() => {
+      this.pending = null;
+      this.dispatchEvent(new MesopEvent(this.triggerEvent, {}));
+    }, this.debounce_ms);
+  }
+}
+
+customElements.define('update-stream-component', UpdateStream);
@@ -0,0 +1,35 @@
+from collections.abc import Callable
+from typing import Any
+
+import mesop.labs as mel
+
+
+@mel.web_component(path='./update_stream.js')
+def update_stream(
+    *,
+    trigger_event: Callable[[mel.WebEvent], Any],
+    url: str = '/events/stream',
+    debounce_ms: int = 50,
+    key: str | None = None,
+):
+    """Creates an invisible component that subscribes to server pushed updates.
+
+    The component keeps a server-sent events connection to the conversation
+    server open and fires `trigger_event` whenever the server reports a
+    change, instead of firing on a timer like the async poller. Bursts of
+    changes within `debounce_ms` are coalesced into a single event.
+
+    Returns:
+      The web component that was created.
+    """
+    return mel.insert_web_component(
+        name='update-stream-component',
+        key=key,
+        events={
+            'triggerEvent': trigger_event,
+        },
+        properties={
+            'url': url,
+            'debounce_ms': debounce_ms,
+        },
+    )
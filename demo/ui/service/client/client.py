@@ -1,5 +1,9 @@
+import asyncio
 import json
+import os
+import threading
 
+from dataclasses import dataclass
 from typing import Any
 
 import httpx
@@ -9,8 +13,14 @@ from service.types import (
     AgentClientJSONError,
     CreateConversationRequest,
     CreateConversationResponse,
+    GetAppStateRequest,
+    GetAppStateResponse,
     GetEventRequest,
     GetEventResponse,
+    GetQueueStatsRequest,
+    GetQueueStatsResponse,
+    GetRetentionStatsRequest,
+    GetRetentionStatsResponse,
     JSONRPCRequest,
     ListAgentRequest,
     ListAgentResponse,
@@ -24,14 +34,112 @@ from service.types import (
     PendingMessageResponse,
     RegisterAgentRequest,
     RegisterAgentResponse,
+    RegisterAgentsRequest,
+    RegisterAgentsResponse,
     SendMessageRequest,
     SendMessageResponse,
 )
 
 
+@dataclass
+class HTTPPoolConfig:
+    """Connection pool settings of the client used to reach the server."""
+
+    http2: bool = False
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30
+    timeout: float = 30
+
+    @classmethod
+    def from_env(cls) -> 'HTTPPoolConfig':
+        """Reads the config from A2A_UI_CLIENT_* environment variables."""
+        defaults = cls()
+        return cls(
+            http2=os.environ.get('A2A_UI_CLIENT_HTTP2', '').upper() == 'TRUE',
+            max_connections=int(
+                os.environ.get(
+                    'A2A_UI_CLIENT_MAX_CONNECTIONS', defaults.max_connections
+                )
+            ),
+            max_keepalive_connections=int(
+                os.environ.get(
+                    'A2A_UI_CLIENT_MAX_KEEPALIVE_CONNECTIONS',
+                    defaults.max_keepalive_connections,
+                )
+            ),
+            keepalive_expiry=float(
+                os.environ.get(
+                    'A2A_UI_CLIENT_KEEPALIVE_EXPIRY', defaults.keepalive_expiry
+                )
+            ),
+            timeout=float(
+                os.environ.get('A2A_UI_CLIENT_TIMEOUT', defaults.timeout)
+            ),
+        )
+
+
+class PooledHTTPClient:
+    """An httpx.AsyncClient whose connections are shared by every caller.
+
+    Mesop runs each async event handler on a new event loop, and httpx
+    connections belong to the loop that opened them, so a client created by
+    a handler could never be reused by the next one. This client instead
+    lives on a dedicated background loop and requests are handed over to
+    it, so consecutive UI refreshes reuse the same keep-alive connections.
+    """
+
+    def __init__(self, config: HTTPPoolConfig | None = None):
+        config = config or HTTPPoolConfig()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever,
+            name='conversation-client',
+            daemon=True,
+        )
+        self._thread.start()
+        # HTTP/2 needs the optional h2 package, `pip install httpx[http2]`.
+        self._client = httpx.AsyncClient(
+            http2=config.http2,
+            timeout=config.timeout,
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+        )
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        future = asyncio.run_coroutine_threadsafe(
+            self._client.post(url, **kwargs), self._loop
+        )
+        return await asyncio.wrap_future(future)
+
+    def close(self):
+        asyncio.run_coroutine_threadsafe(
+            self._client.aclose(), self._loop
+        ).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+
+_shared_http_client: PooledHTTPClient | None = None
+_shared_http_client_lock = threading.Lock()
+
+
+def get_shared_http_client() -> PooledHTTPClient:
+    """Returns the process wide pooled client, creating it on first use."""
+    global _shared_http_client
+    with _shared_http_client_lock:
+        if _shared_http_client is None:
+            _shared_http_client = PooledHTTPClient(HTTPPoolConfig.from_env())
+        return _shared_http_client
+
+
 class ConversationClient:
-    def __init__(self, base_url):
+    def __init__(self, base_url, http_client: PooledHTTPClient | None = None):
         self.base_url = base_url.rstrip('/')
+        self.http_client = http_client or get_shared_http_client()
 
     async def send_message(
         self, payload: SendMessageRequest
@@ -39,22 +147,24 @@ class ConversationClient:
         return SendMessageResponse(**await self._send_request(payload))
 
     async def _send_request(self, request: JSONRPCRequest) -> dict[str, Any]:
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    self.base_url + '/' + request.method,
-                    json=request.model_dump(mode='json', exclude_none=True),
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                print('http error', e)
-                raise AgentClientHTTPError(
-                    e.response.status_code, str(e)
-                ) from e
-            except json.JSONDecodeError as e:
-                print('decode error', e)
-                raise AgentClientJSONError(str(e)) from e
+        try:
+            response = await self.http_client.post(
+                self.base_url + '/' + request.method,
+                json=request.model_dump(mode='json', exclude_none=True),
+            )
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            print('http error', e)
+            raise AgentClientHTTPError(e.response.status_code, str(e)) from e
+        except json.JSONDecodeError as e:
+            print('decode error', e)
+            raise AgentClientJSONError(str(e)) from e
+
+    async def get_app_state(
+        self, payload: GetAppStateRequest
+    ) -> GetAppStateResponse:
+        return GetAppStateResponse(**await self._send_request(payload))
 
     async def create_conversation(
         self, payload: CreateConversationRequest
@@ -87,5 +197,20 @@ class ConversationClient:
     ) -> RegisterAgentResponse:
         return RegisterAgentResponse(**await self._send_request(payload))
 
+    async def register_agents(
+        self, payload: RegisterAgentsRequest
+    ) -> RegisterAgentsResponse:
+        return RegisterAgentsResponse(**await self._send_request(payload))
+
     async def list_agents(self, payload: ListAgentRequest) -> ListAgentResponse:
         return ListAgentResponse(**await self._send_request(payload))
+
+    async def get_retention_stats(
+        self, payload: GetRetentionStatsRequest
+    ) -> GetRetentionStatsResponse:
+        return GetRetentionStatsResponse(**await self._send_request(payload))
+
+    async def get_queue_stats(
+        self, payload: GetQueueStatsRequest
+    ) -> GetQueueStatsResponse:
+        return GetQueueStatsResponse(**await self._send_request(payload))
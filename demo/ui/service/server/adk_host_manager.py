@@ -2,14 +2,16 @@ import asyncio
 import base64
 import datetime
 import json
+import logging
 import os
 import uuid
 
+from collections.abc import Callable
+
 import httpx
 
 from a2a.types import (
     AgentCard,
-    Artifact,
     DataPart,
     FilePart,
     FileWithBytes,
@@ -33,10 +35,14 @@ from google.adk.sessions.in_memory_session_service import InMemorySessionService
 from google.genai import types
 from host_agent import HostAgent
 from remote_agent_connection import TaskCallbackArg
-from utils.agent_card import get_agent_card
 
 from service.server.application_manager import ApplicationManager
-from service.types import Conversation, Event
+from service.server.retention import RetentionPolicy
+from service.server.state_store import StateStore
+from service.types import Conversation, Event, RetentionStats, StateUpdate
+
+
+logger = logging.getLogger(__name__)
 
 
 class ADKHostManager(ApplicationManager):
@@ -52,19 +58,23 @@ class ADKHostManager(ApplicationManager):
         http_client: httpx.AsyncClient,
         api_key: str = '',
         uses_vertex_ai: bool = False,
+        retention_policy: RetentionPolicy | None = None,
+        on_change: Callable[[StateUpdate], None] | None = None,
     ):
-        self._conversations: list[Conversation] = []
-        self._messages: list[Message] = []
-        self._tasks: list[Task] = []
-        self._events: dict[str, Event] = {}
+        self._store = StateStore(
+            retention_policy,
+            on_evict=self._on_conversation_evicted,
+            on_change=on_change,
+        )
         self._pending_message_ids: list[str] = []
         self._agents: list[AgentCard] = []
-        self._artifact_chunks: dict[str, list[Artifact]] = {}
         self._session_service = InMemorySessionService()
         self._artifact_service = InMemoryArtifactService()
         self._memory_service = InMemoryMemoryService()
         self._host_agent = HostAgent([], http_client, self.task_callback)
         self._context_to_conversation: dict[str, str] = {}
+        # Session deletions still running, referenced until they are done.
+        self._session_deletions: set[asyncio.Task] = set()
         self.user_id = 'test_user'
         self.app_name = 'A2A'
         self.api_key = api_key or os.environ.get('GOOGLE_API_KEY', '')
@@ -84,8 +94,6 @@ class ADKHostManager(ApplicationManager):
 
         self._initialize_host()
 
-        # Map of message id to task id
-        self._task_map: dict[str, str] = {}
         # Map to manage 'lost' message ids until protocol level id is introduced
         self._next_id: dict[
             str, str
@@ -101,13 +109,37 @@ class ADKHostManager(ApplicationManager):
             memory_service=self._memory_service,
         )
 
+    def _on_conversation_evicted(self, conversation_id: str):
+        # Drop the ADK session too, otherwise it keeps the full history alive.
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(
+            self._session_service.delete_session(
+                app_name=self.app_name,
+                user_id=self.user_id,
+                session_id=conversation_id,
+            )
+        )
+        self._session_deletions.add(task)
+        task.add_done_callback(self._on_session_deleted)
+
+    def _on_session_deleted(self, task: asyncio.Task):
+        self._session_deletions.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.warning(
+                'Failed to delete the session of an evicted conversation',
+                exc_info=task.exception(),
+            )
+
     async def create_conversation(self) -> Conversation:
         session = await self._session_service.create_session(
             app_name=self.app_name, user_id=self.user_id
         )
         conversation_id = session.id
         c = Conversation(conversation_id=conversation_id, is_active=True)
-        self._conversations.append(c)
+        self._store.add_conversation(c)
         return c
 
     def update_api_key(self, api_key: str):
@@ -121,8 +153,7 @@ class ADKHostManager(ApplicationManager):
                 # Reinitialize host with new API key
                 self._initialize_host()
 
-                # Map of message id to task id
-                self._task_map = {}
+                self._store.clear_message_tasks()
 
     def sanitize_message(self, message: Message) -> Message:
         if message.context_id:
@@ -132,12 +163,7 @@ class ADKHostManager(ApplicationManager):
             # Check if the last event in the conversation was tied to a task.
             if conversation.messages:
                 task_id = conversation.messages[-1].task_id
-                if task_id and task_still_open(
-                    next(
-                        filter(lambda x: x and x.id == task_id, self._tasks),
-                        None,
-                    )
-                ):
+                if task_id and task_still_open(self._store.get_task(task_id)):
                     message.task_id = task_id
         return message
 
@@ -147,7 +173,7 @@ class ADKHostManager(ApplicationManager):
             self._pending_message_ids.append(message_id)
         context_id = message.context_id
         conversation = self.get_conversation(context_id)
-        self._messages.append(message)
+        self._store.add_message(message)
         if conversation:
             conversation.messages.append(message)
         self.add_event(
@@ -212,20 +238,17 @@ class ADKHostManager(ApplicationManager):
             response = await self.adk_content_to_message(
                 final_event.content, context_id, task_id
             )
-            self._messages.append(response)
+            self._store.add_message(response)
 
         if conversation and response:
             conversation.messages.append(response)
         self._pending_message_ids.remove(message_id)
 
     def add_task(self, task: Task):
-        self._tasks.append(task)
+        self._store.add_task(task)
 
     def update_task(self, task: Task):
-        for i, t in enumerate(self._tasks):
-            if t.id == task.id:
-                self._tasks[i] = task
-                return
+        self._store.update_task(task)
 
     def task_callback(self, task: TaskCallbackArg, agent_card: AgentCard):
         self.emit_event(task, agent_card)
@@ -242,7 +265,7 @@ class ADKHostManager(ApplicationManager):
             self.update_task(current_task)
             return current_task
         # Otherwise this is a Task, either new or updated
-        if not any(filter(lambda x: x and x.id == task.id, self._tasks)):
+        if not self._store.has_task(task.id):
             self.attach_message_to_task(task.status.message, task.id)
             self.add_task(task)
             return task
@@ -305,7 +328,7 @@ class ADKHostManager(ApplicationManager):
 
     def attach_message_to_task(self, message: Message | None, task_id: str):
         if message:
-            self._task_map[message.message_id] = task_id
+            self._store.attach_message_to_task(message.message_id, task_id)
 
     def insert_message_history(self, task: Task, message: Message | None):
         if not message:
@@ -340,9 +363,7 @@ class ADKHostManager(ApplicationManager):
             task_id = event.task_id
         if not task_id:
             task_id = str(uuid.uuid4())
-        current_task = next(
-            filter(lambda x: x.id == task_id, self._tasks), None
-        )
+        current_task = self._store.get_task(task_id)
         if not current_task:
             context_id = event.context_id
             current_task = Task(
@@ -360,61 +381,43 @@ class ADKHostManager(ApplicationManager):
     def process_artifact_event(
         self, current_task: Task, task_update_event: TaskArtifactUpdateEvent
     ):
-        artifact = task_update_event.artifact
-        if not task_update_event.append:
-            # received the first chunk or entire payload for an artifact
-            if (
-                task_update_event.last_chunk is None
-                or task_update_event.last_chunk
-            ):
-                # last_chunk bit is missing or is set to true, so this is the entire payload
-                # add this to artifacts
-                if not current_task.artifacts:
-                    current_task.artifacts = []
-                current_task.artifacts.append(artifact)
-            else:
-                # this is a chunk of an artifact, stash it in temp store for assembling
-                if artifact.artifact_id not in self._artifact_chunks:
-                    self._artifact_chunks[artifact.artifact_id] = []
-                self._artifact_chunks[artifact.artifact_id].append(artifact)
+        artifact_id = task_update_event.artifact.artifact_id
+        artifacts = current_task.artifacts or []
+        index = next(
+            (
+                i
+                for i, a in enumerate(artifacts)
+                if a.artifact_id == artifact_id
+            ),
+            None,
+        )
+        artifact = self._store.artifact_assembler(current_task.id).add(
+            task_update_event,
+            artifacts[index] if index is not None else None,
+        )
+        if artifact is None:
+            return
+        # Partial snapshots and the finished artifact replace each other.
+        if index is None:
+            current_task.artifacts = [*artifacts, artifact]
         else:
-            # we received an append chunk, add to the existing temp artifact
-            current_temp_artifact = self._artifact_chunks[artifact.artifact_id][
-                -1
-            ]
-            # TODO handle if current_temp_artifact is missing
-            current_temp_artifact.parts.extend(artifact.parts)
-            if task_update_event.last_chunk:
-                if current_task.artifacts:
-                    current_task.artifacts.append(current_temp_artifact)
-                else:
-                    current_task.artifacts = [current_temp_artifact]
-                del self._artifact_chunks[artifact.artifact_id][-1]
+            artifacts[index] = artifact
+            current_task.artifacts = artifacts
 
     def add_event(self, event: Event):
-        self._events[event.id] = event
+        self._store.add_event(event)
 
     def get_conversation(
         self, conversation_id: str | None
     ) -> Conversation | None:
-        if not conversation_id:
-            return None
-        return next(
-            filter(
-                lambda c: c and c.conversation_id == conversation_id,
-                self._conversations,
-            ),
-            None,
-        )
+        return self._store.get_conversation(conversation_id)
 
     def get_pending_messages(self) -> list[tuple[str, str]]:
         rval = []
         for message_id in self._pending_message_ids:
-            if message_id in self._task_map:
-                task_id = self._task_map[message_id]
-                task = next(
-                    filter(lambda x: x.id == task_id, self._tasks), None
-                )
+            task_id = self._store.get_task_id_for_message(message_id)
+            if task_id is not None:
+                task = self._store.get_task(task_id)
                 if not task:
                     rval.append((message_id, ''))
                 elif task.history and task.history[-1].parts:
@@ -434,14 +437,12 @@ class ADKHostManager(ApplicationManager):
                 rval.append((message_id, ''))
         return rval
 
-    def register_agent(self, url):
-        agent_data = get_agent_card(url)
-        if not agent_data.url:
-            agent_data.url = url
-        self._agents.append(agent_data)
-        self._host_agent.register_agent_card(agent_data)
-        # Now update the host agent definition
-        self._initialize_host()
+    def register_agent_card(self, card: AgentCard):
+        self._agents = [a for a in self._agents if a.url != card.url]
+        self._agents.append(card)
+        # The host agent reads its remote agents on every model call, so the
+        # runner does not need to be rebuilt.
+        self._host_agent.register_agent_card(card)
 
     @property
     def agents(self) -> list[AgentCard]:
@@ -449,15 +450,32 @@ class ADKHostManager(ApplicationManager):
 
     @property
     def conversations(self) -> list[Conversation]:
-        return self._conversations
+        return self._store.conversations
 
     @property
     def tasks(self) -> list[Task]:
-        return self._tasks
+        return self._store.tasks
 
     @property
     def events(self) -> list[Event]:
-        return sorted(self._events.values(), key=lambda x: x.timestamp)
+        return self._store.events
+
+    def tasks_since(
+        self, cursor: int | None, limit: int | None
+    ) -> tuple[list[Task], int]:
+        return self._store.tasks_since(cursor, limit)
+
+    def evicted_tasks_since(self, cursor: int | None) -> list[str] | None:
+        return self._store.evicted_tasks_since(cursor)
+
+    def events_since(
+        self, cursor: int | None, limit: int | None
+    ) -> tuple[list[Event], int]:
+        return self._store.events_since(cursor, limit)
+
+    @property
+    def retention_stats(self) -> RetentionStats:
+        return self._store.stats()
 
     def adk_content_from_message(self, message: Message) -> types.Content:
         parts: list[types.Part] = []
@@ -609,17 +627,6 @@ class ADKHostManager(ApplicationManager):
             )
         return parts
 
-    def process_message_threadsafe(
-        self, message: Message, loop: asyncio.AbstractEventLoop
-    ):
-        """Safely run process_message from a thread using the given event loop."""
-        future = asyncio.run_coroutine_threadsafe(
-            self.process_message(message), loop
-        )
-        return (
-            future  # You can call future.result() to get the result if needed
-        )
-
 
 def get_message_id(m: Message | None) -> str | None:
     if not m or not m.metadata or 'message_id' not in m.metadata:
@@ -2,7 +2,7 @@ from abc import ABC, abstractmethod
 
 from a2a.types import AgentCard, Message, Task
 
-from service.types import Conversation, Event
+from service.types import Conversation, Event, RetentionStats
 
 
 class ApplicationManager(ABC):
@@ -19,7 +19,8 @@ class ApplicationManager(ABC):
         pass
 
     @abstractmethod
-    def register_agent(self, url: str):
+    def register_agent_card(self, card: AgentCard):
+        """Adds the agent, or replaces the card of an agent with its url."""
         pass
 
     @abstractmethod
@@ -51,3 +52,24 @@ class ApplicationManager(ABC):
     @abstractmethod
     def events(self) -> list[Event]:
         pass
+
+    @abstractmethod
+    def tasks_since(
+        self, cursor: int | None, limit: int | None
+    ) -> tuple[list[Task], int]:
+        pass
+
+    @abstractmethod
+    def evicted_tasks_since(self, cursor: int | None) -> list[str] | None:
+        """Ids of the tasks evicted after `cursor`, None if not all known."""
+
+    @abstractmethod
+    def events_since(
+        self, cursor: int | None, limit: int | None
+    ) -> tuple[list[Event], int]:
+        pass
+
+    @property
+    @abstractmethod
+    def retention_stats(self) -> RetentionStats:
+        pass
@@ -0,0 +1,167 @@
+import json
+import time
+
+from dataclasses import dataclass, field
+
+from a2a.types import (
+    Artifact,
+    FilePart,
+    FileWithBytes,
+    Part,
+    TaskArtifactUpdateEvent,
+    TextPart,
+)
+
+
+@dataclass
+class _InFlightArtifact:
+    # The latest chunk without its parts, for the name, description and
+    # metadata of the assembled artifact.
+    header: Artifact
+    # Runs of adjacent text are kept as lists of strings and only joined
+    # when the artifact is read, other parts are kept as they are.
+    segments: list[list[str] | Part] = field(default_factory=list)
+    size_bytes: int = 0
+    truncated: bool = False
+    # False while only append chunks have arrived, before the first chunk.
+    started: bool = True
+    last_snapshot: float = 0
+
+
+class ArtifactAssembler:
+    """Assembles the chunked artifacts of one task.
+
+    Chunks of every artifact id are assembled independently. Appending a
+    chunk is O(size of the chunk): adjacent text parts are buffered and
+    joined into a single TextPart only when the artifact is read. Append
+    chunks that arrive before the first chunk of their artifact are kept
+    and placed after it once it arrives. Each in-flight artifact is capped
+    at `max_bytes`; parts past the cap are dropped and the artifact is
+    marked truncated in its metadata.
+
+    While an artifact streams, a snapshot of it, marked partial in its
+    metadata, is returned at most every `partial_interval` seconds so the
+    UI can show progress without copying the artifact on every chunk.
+    """
+
+    def __init__(self, max_bytes: int = 0, partial_interval: float = 0.25):
+        self._max_bytes = max_bytes
+        self._partial_interval = partial_interval
+        self._in_flight: dict[str, _InFlightArtifact] = {}
+
+    @property
+    def in_flight(self) -> list[str]:
+        return list(self._in_flight)
+
+    def add(
+        self,
+        event: TaskArtifactUpdateEvent,
+        previous: Artifact | None = None,
+    ) -> Artifact | None:
+        """Adds a chunk and returns the artifact the task should show.
+
+        `previous` is the artifact with the same id the task already has,
+        which an append chunk extends if nothing is in flight for it.
+
+        Returns:
+          The complete artifact on its last chunk, otherwise a partial
+          snapshot, or None if no new snapshot is due yet.
+        """
+        artifact = event.artifact
+        artifact_id = artifact.artifact_id
+        # A first chunk without the last_chunk bit is the entire payload.
+        done = bool(event.last_chunk) or (
+            not event.append and event.last_chunk is None
+        )
+        current = self._in_flight.get(artifact_id)
+        if not event.append:
+            if done and current is None:
+                # The entire payload in one event, nothing to assemble.
+                return artifact
+            replacement = self._start(artifact)
+            if current is not None and not current.started:
+                # The append chunks got here first, they follow this one.
+                self._extend(replacement, current.segments)
+                replacement.truncated |= current.truncated
+            current = replacement
+        elif current is None:
+            current = _InFlightArtifact(header=self._header(artifact))
+            if previous is not None:
+                self._extend(current, previous.parts)
+            else:
+                current.started = False
+            self._extend(current, artifact.parts)
+        else:
+            current.header = self._header(artifact)
+            self._extend(current, artifact.parts)
+        self._in_flight[artifact_id] = current
+
+        if done:
+            del self._in_flight[artifact_id]
+            return self._snapshot(current, partial=False)
+        now = time.monotonic()
+        if now - current.last_snapshot < self._partial_interval:
+            return None
+        current.last_snapshot = now
+        return self._snapshot(current, partial=True)
+
+    def _start(self, artifact: Artifact) -> _InFlightArtifact:
+        current = _InFlightArtifact(header=self._header(artifact))
+        self._extend(current, artifact.parts)
+        return current
+
+    def _header(self, artifact: Artifact) -> Artifact:
+        return artifact.model_copy(update={'parts': []})
+
+    def _extend(
+        self, current: _InFlightArtifact, parts: list[list[str] | Part]
+    ):
+        for part in parts:
+            if current.truncated:
+                # Nothing may follow a dropped part, the text would have
+                # a gap in it.
+                return
+            if isinstance(part, list):
+                part = Part(root=TextPart(text=''.join(part)))
+            size = _part_size(part)
+            if self._max_bytes and current.size_bytes + size > self._max_bytes:
+                current.truncated = True
+                return
+            current.size_bytes += size
+            root = part.root
+            if isinstance(root, TextPart) and not root.metadata:
+                if current.segments and isinstance(current.segments[-1], list):
+                    current.segments[-1].append(root.text)
+                else:
+                    current.segments.append([root.text])
+            else:
+                current.segments.append(part)
+
+    def _snapshot(self, current: _InFlightArtifact, partial: bool) -> Artifact:
+        parts = []
+        for segment in current.segments:
+            if isinstance(segment, list):
+                # Compact the run so the next snapshot joins less.
+                segment[:] = [''.join(segment)]
+                parts.append(Part(root=TextPart(text=segment[0])))
+            else:
+                parts.append(segment)
+        metadata = dict(current.header.metadata or {})
+        if partial:
+            metadata['partial'] = True
+        if current.truncated:
+            metadata['truncated'] = True
+        return current.header.model_copy(
+            update={'parts': parts, 'metadata': metadata or None}
+        )
+
+
+def _part_size(part: Part) -> int:
+    root = part.root
+    if isinstance(root, TextPart):
+        return len(root.text)
+    if isinstance(root, FilePart):
+        if isinstance(root.file, FileWithBytes):
+            return len(root.file.bytes)
+        return 0
+    return len(json.dumps(root.data))
@@ -0,0 +1,194 @@
+import base64
+import binascii
+import hashlib
+import mmap
+import os
+import shutil
+import tempfile
+
+from collections import OrderedDict
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+@dataclass
+class Blob:
+    """A decoded file payload, named by the sha256 of its content."""
+
+    digest: str
+    mime_type: str
+    size: int
+    # Small blobs are kept in memory, larger ones in a file on disk.
+    data: bytes | None = None
+    path: str | None = None
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.digest}"'
+
+    def iter_bytes(
+        self, start: int = 0, end: int | None = None
+    ) -> Iterator[bytes]:
+        """Yields the bytes in [start, end) in chunks, without a full copy."""
+        end = self.size if end is None else end
+        if self.data is not None:
+            view = memoryview(self.data)
+            for offset in range(start, end, STREAM_CHUNK_BYTES):
+                yield bytes(
+                    view[offset : min(offset + STREAM_CHUNK_BYTES, end)]
+                )
+            return
+        if start >= end:
+            return
+        with (
+            open(self.path, 'rb') as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+        ):
+            for offset in range(start, end, STREAM_CHUNK_BYTES):
+                yield mapped[offset : min(offset + STREAM_CHUNK_BYTES, end)]
+
+
+class BlobStore:
+    """Size bounded, content addressed LRU store of the files shown in the UI.
+
+    Inline file parts are base64 decoded once, when they are first put, and
+    stored under the sha256 of their content, so a file sent in several
+    messages is kept once. Blobs larger than `spill_bytes` are written to a
+    temporary directory and served from a memory map instead of being kept
+    in memory. The least recently used blobs are evicted to stay under
+    `max_bytes`. A limit of 0 disables it.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 0,
+        spill_bytes: int = 0,
+        spill_dir: str | None = None,
+    ):
+        self._max_bytes = max_bytes
+        self._spill_bytes = spill_bytes
+        self._spill_root = spill_dir
+        self._spill_dir: str | None = None
+        self._blobs: OrderedDict[str, Blob] = OrderedDict()
+        # message part id -> digest, so a part is only decoded once, and
+        # its reverse for eviction
+        self._message_parts: dict[str, str] = {}
+        self._digest_parts: dict[str, list[str]] = {}
+        self.size_bytes = 0
+        self.evictions = 0
+
+    def __contains__(self, digest: str) -> bool:
+        return digest in self._blobs
+
+    def digest_for(self, message_part_id: str) -> str | None:
+        """Returns the digest a message part was stored under, if known."""
+        digest = self._message_parts.get(message_part_id)
+        return digest if digest in self._blobs else None
+
+    def get(self, digest: str) -> Blob | None:
+        blob = self._blobs.get(digest)
+        if blob is not None:
+            self._blobs.move_to_end(digest)
+        return blob
+
+    def put(
+        self, message_part_id: str, encoded: str, mime_type: str | None
+    ) -> Blob:
+        """Decodes a base64 payload and stores it, unless already stored."""
+        digest = self.digest_for(message_part_id)
+        if digest is not None:
+            return self.get(digest)
+        data = _decode(encoded)
+        digest = hashlib.sha256(data).hexdigest()
+        self._message_parts[message_part_id] = digest
+        self._digest_parts.setdefault(digest, []).append(message_part_id)
+        blob = self.get(digest)
+        if blob is not None:
+            return blob
+        blob = Blob(
+            digest=digest,
+            mime_type=mime_type or 'application/octet-stream',
+            size=len(data),
+        )
+        if self._spill_bytes and blob.size > self._spill_bytes:
+            blob.path = os.path.join(self._ensure_spill_dir(), digest)
+            with open(blob.path, 'wb') as f:
+                f.write(data)
+        else:
+            blob.data = data
+        self._blobs[digest] = blob
+        self.size_bytes += blob.size
+        # The newest blob is always kept, even if it alone is over budget.
+        while (
+            self._max_bytes
+            and self.size_bytes > self._max_bytes
+            and len(self._blobs) > 1
+        ):
+            self._remove(next(iter(self._blobs)))
+            self.evictions += 1
+        return blob
+
+    def close(self):
+        """Drops every blob and deletes the spilled files."""
+        self._blobs.clear()
+        self._message_parts.clear()
+        self._digest_parts.clear()
+        self.size_bytes = 0
+        if self._spill_dir:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._spill_dir = None
+
+    def _ensure_spill_dir(self) -> str:
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(
+                prefix='a2a-ui-files-', dir=self._spill_root
+            )
+        return self._spill_dir
+
+    def _remove(self, digest: str):
+        blob = self._blobs.pop(digest)
+        self.size_bytes -= blob.size
+        for message_part_id in self._digest_parts.pop(digest, []):
+            self._message_parts.pop(message_part_id, None)
+        if blob.path:
+            try:
+                os.remove(blob.path)
+            except FileNotFoundError:
+                pass
+
+
+def _decode(encoded: str) -> bytes:
+    try:
+        return base64.b64decode(encoded, validate=True)
+    except (binascii.Error, ValueError):
+        # Not base64 after all, serve the payload as it was sent.
+        return encoded.encode()
+
+
+def parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """Parses a single `bytes=` Range header into a [start, end) pair.
+
+    Returns None if the header is missing or not a single byte range, which
+    is answered with the whole file.
+
+    Raises:
+      ValueError: if the range is outside of the file.
+    """
+    if not header or not header.startswith('bytes=') or ',' in header:
+        return None
+    first, _, last = header[len('bytes=') :].strip().partition('-')
+    try:
+        if not first:
+            # A suffix range, the last N bytes.
+            start, end = max(size - int(last), 0), size
+        else:
+            start = int(first)
+            end = min(int(last) + 1, size) if last else size
+    except ValueError:
+        return None
+    if start >= size or start >= end:
+        raise ValueError(f'range {header} not satisfiable for {size} bytes')
+    return start, end
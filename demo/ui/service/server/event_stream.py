@@ -0,0 +1,63 @@
+import asyncio
+import threading
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from service.types import StateUpdate
+
+
+class UpdateBroadcaster:
+    """Fans out state updates to the subscribers of /events/stream.
+
+    `publish` is a plain callback, StateStore's `on_change`, and may run off
+    the subscriber's loop: FastAPI serves the endpoints that are not async
+    from its thread pool. Updates are therefore handed to each subscriber
+    on the event loop it subscribed from. A subscriber that falls more than
+    `max_queue_size` updates behind gets a single `reset` update instead of
+    the backlog.
+    """
+
+    def __init__(self, max_queue_size: int = 1000):
+        self._max_queue_size = max_queue_size
+        self._subscribers: dict[
+            asyncio.Queue[StateUpdate], asyncio.AbstractEventLoop
+        ] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, update: StateUpdate):
+        with self._lock:
+            subscribers = list(self._subscribers.items())
+        for queue, loop in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, update)
+            except RuntimeError:
+                # The subscriber's loop is closed, it unsubscribes shortly.
+                pass
+
+    @contextmanager
+    def subscribe(self) -> Iterator[asyncio.Queue[StateUpdate]]:
+        """Yields a queue receiving every update published while open.
+
+        Must be entered from the event loop that consumes the queue.
+        """
+        queue: asyncio.Queue[StateUpdate] = asyncio.Queue(self._max_queue_size)
+        with self._lock:
+            self._subscribers[queue] = asyncio.get_running_loop()
+        try:
+            yield queue
+        finally:
+            with self._lock:
+                self._subscribers.pop(queue, None)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def _offer(self, queue: asyncio.Queue[StateUpdate], update: StateUpdate):
+        try:
+            queue.put_nowait(update)
+        except asyncio.QueueFull:
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(StateUpdate(kind='reset', cursor=update.cursor))
@@ -2,6 +2,8 @@ import asyncio
 import datetime
 import uuid
 
+from collections.abc import Callable
+
 from a2a.types import (
     AgentCard,
     Artifact,
@@ -14,11 +16,12 @@ from a2a.types import (
     TaskStatus,
     TextPart,
 )
-from utils.agent_card import get_agent_card
 
 from service.server import test_image
 from service.server.application_manager import ApplicationManager
-from service.types import Conversation, Event
+from service.server.retention import RetentionPolicy
+from service.server.state_store import StateStore
+from service.types import Conversation, Event, RetentionStats, StateUpdate
 
 
 class InMemoryFakeAgentManager(ApplicationManager):
@@ -29,28 +32,25 @@ class InMemoryFakeAgentManager(ApplicationManager):
     uses to send messages to the agent and provide information for the frontend.
     """
 
-    _conversations: list[Conversation]
-    _messages: list[Message]
-    _tasks: list[Task]
-    _events: list[Event]
+    _store: StateStore
     _pending_message_ids: list[str]
     _next_message_idx: int
     _agents: list[AgentCard]
 
-    def __init__(self):
-        self._conversations = []
-        self._messages = []
-        self._tasks = []
-        self._events = []
+    def __init__(
+        self,
+        retention_policy: RetentionPolicy | None = None,
+        on_change: Callable[[StateUpdate], None] | None = None,
+    ):
+        self._store = StateStore(retention_policy, on_change=on_change)
         self._pending_message_ids = []
         self._next_message_idx = 0
         self._agents = []
-        self._task_map = {}
 
     def create_conversation(self) -> Conversation:
         conversation_id = str(uuid.uuid4())
         c = Conversation(conversation_id=conversation_id, is_active=True)
-        self._conversations.append(c)
+        self._store.add_conversation(c)
         return c
 
     def sanitize_message(self, message: Message) -> Message:
@@ -59,21 +59,14 @@ class InMemoryFakeAgentManager(ApplicationManager):
             return message
         # Check if the last event in the conversation was tied to a task.
         if conversation.messages:
-            if conversation.messages[-1].task_id and task_still_open(
-                next(
-                    filter(
-                        lambda x: x.id == conversation.messages[-1].task_id,
-                        self._tasks,
-                    ),
-                    None,
-                )
-            ):
-                message.task_id = conversation.messages[-1].task_id
+            task_id = conversation.messages[-1].task_id
+            if task_id and task_still_open(self._store.get_task(task_id)):
+                message.task_id = task_id
 
         return message
 
     async def process_message(self, message: Message):
-        self._messages.append(message)
+        self._store.add_message(message)
         message_id = message.message_id
         context_id = message.context_id or ''
         task_id = message.task_id or ''
@@ -82,7 +75,7 @@ class InMemoryFakeAgentManager(ApplicationManager):
         conversation = self.get_conversation(context_id)
         if conversation:
             conversation.messages.append(message)
-        self._events.append(
+        self._store.add_event(
             Event(
                 id=str(uuid.uuid4()),
                 actor='host',
@@ -108,7 +101,7 @@ class InMemoryFakeAgentManager(ApplicationManager):
         response = self.next_message()
         if conversation:
             conversation.messages.append(response)
-        self._events.append(
+        self._store.add_event(
             Event(
                 id=str(uuid.uuid4()),
                 actor='host',
@@ -134,16 +127,13 @@ class InMemoryFakeAgentManager(ApplicationManager):
             self.update_task(task)
 
     def add_task(self, task: Task):
-        self._tasks.append(task)
+        self._store.add_task(task)
 
     def update_task(self, task: Task):
-        for i, t in enumerate(self._tasks):
-            if t.id == task.id:
-                self._tasks[i] = task
-                return
+        self._store.update_task(task)
 
     def add_event(self, event: Event):
-        self._events.append(event)
+        self._store.add_event(event)
 
     def next_message(self) -> Message:
         message = _message_queue[self._next_message_idx]
@@ -155,24 +145,14 @@ class InMemoryFakeAgentManager(ApplicationManager):
     def get_conversation(
         self, conversation_id: str | None
     ) -> Conversation | None:
-        if not conversation_id:
-            return None
-        return next(
-            filter(
-                lambda c: c and c.conversation_id == conversation_id,
-                self._conversations,
-            ),
-            None,
-        )
+        return self._store.get_conversation(conversation_id)
 
     def get_pending_messages(self) -> list[tuple[str, str]]:
         rval: list[tuple[str, str]] = []
         for message_id in self._pending_message_ids:
-            if message_id in self._task_map:
-                task_id = self._task_map[message_id]
-                task = next(
-                    filter(lambda x: x.id == task_id, self._tasks), None
-                )
+            task_id = self._store.get_task_id_for_message(message_id)
+            if task_id is not None:
+                task = self._store.get_task(task_id)
                 if not task:
                     rval.append((message_id, ''))
                 elif task.history and task.history[-1].parts:
@@ -193,11 +173,9 @@ class InMemoryFakeAgentManager(ApplicationManager):
             return rval
         return [(x, '') for x in self._pending_message_ids]
 
-    def register_agent(self, url):
-        agent_data = get_agent_card(url)
-        if not agent_data.url:
-            agent_data.url = url
-        self._agents.append(agent_data)
+    def register_agent_card(self, card: AgentCard):
+        self._agents = [a for a in self._agents if a.url != card.url]
+        self._agents.append(card)
 
     @property
     def agents(self) -> list[AgentCard]:
@@ -205,16 +183,33 @@ class InMemoryFakeAgentManager(ApplicationManager):
 
     @property
     def conversations(self) -> list[Conversation]:
-        return self._conversations
+        return self._store.conversations
 
     @property
     def tasks(self) -> list[Task]:
-        return self._tasks
+        return self._store.tasks
 
     @property
     def events(self) -> list[Event]:
         return []
 
+    def tasks_since(
+        self, cursor: int | None, limit: int | None
+    ) -> tuple[list[Task], int]:
+        return self._store.tasks_since(cursor, limit)
+
+    def evicted_tasks_since(self, cursor: int | None) -> list[str] | None:
+        return self._store.evicted_tasks_since(cursor)
+
+    def events_since(
+        self, cursor: int | None, limit: int | None
+    ) -> tuple[list[Event], int]:
+        return [], self._store.cursor
+
+    @property
+    def retention_stats(self) -> RetentionStats:
+        return self._store.stats()
+
 
 _contextId = str(uuid.uuid4())
 
@@ -0,0 +1,161 @@
+import asyncio
+import os
+import time
+import traceback
+
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+from service.types import QueueStats
+
+
+@dataclass
+class SchedulerConfig:
+    """Limits of the MessageScheduler. A limit of 0 disables it."""
+
+    max_concurrency: int = 8
+    max_concurrency_per_conversation: int = 1
+    max_queue_depth: int = 100
+
+    @classmethod
+    def from_env(cls) -> 'SchedulerConfig':
+        """Reads the config from A2A_UI_* environment variables."""
+        defaults = cls()
+        return cls(
+            max_concurrency=int(
+                os.environ.get(
+                    'A2A_UI_MAX_CONCURRENT_MESSAGES', defaults.max_concurrency
+                )
+            ),
+            max_concurrency_per_conversation=int(
+                os.environ.get(
+                    'A2A_UI_MAX_CONCURRENT_MESSAGES_PER_CONVERSATION',
+                    defaults.max_concurrency_per_conversation,
+                )
+            ),
+            max_queue_depth=int(
+                os.environ.get(
+                    'A2A_UI_MAX_QUEUED_MESSAGES', defaults.max_queue_depth
+                )
+            ),
+        )
+
+
+@dataclass
+class _ConversationQueue:
+    # (enqueue time, work) in arrival order
+    pending: deque[tuple[float, Callable[[], Awaitable[None]]]] = field(
+        default_factory=deque
+    )
+    running: int = 0
+
+
+class MessageScheduler:
+    """Runs message processing on the event loop with bounded concurrency.
+
+    Each conversation has a FIFO queue and messages are started in arrival
+    order, at most `max_concurrency_per_conversation` at a time; with the
+    default of 1 a message is only processed once the previous one of the
+    same conversation has finished. At most `max_concurrency` messages run
+    across all conversations. Once `max_queue_depth` messages are waiting,
+    `submit` rejects new ones so the caller can push back on the client.
+    """
+
+    def __init__(self, config: SchedulerConfig | None = None):
+        self._config = config or SchedulerConfig()
+        self._global_slots = (
+            asyncio.Semaphore(self._config.max_concurrency)
+            if self._config.max_concurrency
+            else None
+        )
+        self._conversations: dict[str, _ConversationQueue] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def submit(
+        self, conversation_id: str, work: Callable[[], Awaitable[None]]
+    ) -> bool:
+        """Queues `work` behind the conversation's earlier messages.
+
+        Returns False, without queueing, if the queue is full.
+        """
+        if (
+            self._config.max_queue_depth
+            and self._queued >= self._config.max_queue_depth
+        ):
+            self._rejected += 1
+            return False
+        queue = self._conversations.setdefault(
+            conversation_id, _ConversationQueue()
+        )
+        queue.pending.append((time.monotonic(), work))
+        self._queued += 1
+        self._start_ready(conversation_id)
+        return True
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queued
+
+    def stats(self) -> QueueStats:
+        started = self._completed + self._running
+        return QueueStats(
+            queued=self._queued,
+            running=self._running,
+            completed=self._completed,
+            failed=self._failed,
+            rejected=self._rejected,
+            average_wait_seconds=self._total_wait / started if started else 0,
+            max_wait_seconds=self._max_wait,
+        )
+
+    def _start_ready(self, conversation_id: str):
+        queue = self._conversations[conversation_id]
+        limit = self._config.max_concurrency_per_conversation
+        while queue.pending and (not limit or queue.running < limit):
+            enqueued, work = queue.pending.popleft()
+            queue.running += 1
+            task = asyncio.create_task(
+                self._run(conversation_id, enqueued, work)
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(
+        self,
+        conversation_id: str,
+        enqueued: float,
+        work: Callable[[], Awaitable[None]],
+    ):
+        try:
+            if self._global_slots:
+                await self._global_slots.acquire()
+            wait = time.monotonic() - enqueued
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+            self._queued -= 1
+            self._running += 1
+            try:
+                await work()
+            except Exception:
+                self._failed += 1
+                traceback.print_exc()
+            finally:
+                self._running -= 1
+                self._completed += 1
+                if self._global_slots:
+                    self._global_slots.release()
+        finally:
+            queue = self._conversations[conversation_id]
+            queue.running -= 1
+            if queue.pending:
+                self._start_ready(conversation_id)
+            elif not queue.running:
+                del self._conversations[conversation_id]
@@ -0,0 +1,63 @@
+import os
+
+from dataclasses import dataclass
+
+
+@dataclass
+class RetentionPolicy:
+    """Limits on how much history the conversation server keeps in memory.
+
+    Conversations are evicted least recently used first once there are more
+    than `max_conversations` of them, or once they have not been touched for
+    `ttl_seconds`. Evicting a conversation drops its messages, tasks and
+    events. Artifacts that are still streaming in are capped at
+    `max_artifact_bytes` each. Cached files larger than `file_spill_bytes`
+    are kept on disk rather than in memory. A limit of 0 disables that
+    limit.
+    """
+
+    max_conversations: int = 200
+    max_events_per_conversation: int = 1000
+    max_file_cache_bytes: int = 256 * 1024 * 1024
+    file_spill_bytes: int = 1024 * 1024
+    max_artifact_bytes: int = 64 * 1024 * 1024
+    ttl_seconds: float = 0
+
+    @classmethod
+    def from_env(cls) -> 'RetentionPolicy':
+        """Reads the policy from A2A_UI_* environment variables."""
+        defaults = cls()
+        return cls(
+            max_conversations=int(
+                os.environ.get(
+                    'A2A_UI_MAX_CONVERSATIONS', defaults.max_conversations
+                )
+            ),
+            max_events_per_conversation=int(
+                os.environ.get(
+                    'A2A_UI_MAX_EVENTS_PER_CONVERSATION',
+                    defaults.max_events_per_conversation,
+                )
+            ),
+            max_file_cache_bytes=int(
+                os.environ.get(
+                    'A2A_UI_MAX_FILE_CACHE_BYTES',
+                    defaults.max_file_cache_bytes,
+                )
+            ),
+            file_spill_bytes=int(
+                os.environ.get(
+                    'A2A_UI_FILE_SPILL_BYTES', defaults.file_spill_bytes
+                )
+            ),
+            max_artifact_bytes=int(
+                os.environ.get(
+                    'A2A_UI_MAX_ARTIFACT_BYTES', defaults.max_artifact_bytes
+                )
+            ),
+            ttl_seconds=float(
+                os.environ.get(
+                    'A2A_UI_HISTORY_TTL_SECONDS', defaults.ttl_seconds
+                )
+            ),
+        )
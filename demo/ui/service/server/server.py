@@ -1,32 +1,63 @@
 import asyncio
-import base64
+import atexit
+import json
 import os
-import threading
 import uuid
 
-from typing import cast
+from typing import TypeVar
 
 import httpx
 
-from a2a.types import FilePart, FileWithUri, Message, Part
+from a2a.types import (
+    AgentCard,
+    FilePart,
+    FileWithBytes,
+    FileWithUri,
+    Message,
+    Part,
+    Task,
+)
 from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+from utils.agent_card import AgentCardResolver, normalize_agent_address
 
 from service.types import (
+    AgentRegistration,
+    AppStateParams,
+    AppStateSnapshot,
     CreateConversationResponse,
+    GetAppStateResponse,
     GetEventResponse,
+    GetQueueStatsResponse,
+    GetRetentionStatsResponse,
+    JSONRPCError,
     ListAgentResponse,
     ListConversationResponse,
+    ListMessageParams,
     ListMessageResponse,
     ListTaskResponse,
     MessageInfo,
+    PageParams,
     PendingMessageResponse,
     RegisterAgentResponse,
+    RegisterAgentsResponse,
     SendMessageResponse,
 )
 
 from .adk_host_manager import ADKHostManager, get_message_id
 from .application_manager import ApplicationManager
+from .blob_store import BlobStore, parse_range
+from .event_stream import UpdateBroadcaster
 from .in_memory_manager import InMemoryFakeAgentManager
+from .message_scheduler import MessageScheduler, SchedulerConfig
+from .retention import RetentionPolicy
+
+
+ParamsT = TypeVar('ParamsT', bound=BaseModel)
+
+# Comment lines sent on an idle /events/stream so proxies keep it open.
+SSE_KEEPALIVE_SECONDS = 15
 
 
 class ConversationServer:
@@ -46,16 +77,33 @@ class ConversationServer:
             os.environ.get('GOOGLE_GENAI_USE_VERTEXAI', '').upper() == 'TRUE'
         )
 
+        retention_policy = RetentionPolicy.from_env()
+        # Tells clients holding cursors that the server was restarted
+        self._instance_id = uuid.uuid4().hex
+        self._updates = UpdateBroadcaster()
+        self._scheduler = MessageScheduler(SchedulerConfig.from_env())
+
         if agent_manager.upper() == 'ADK':
             self.manager = ADKHostManager(
                 http_client,
                 api_key=api_key,
                 uses_vertex_ai=uses_vertex_ai,
+                retention_policy=retention_policy,
+                on_change=self._updates.publish,
             )
         else:
-            self.manager = InMemoryFakeAgentManager()
-        self._file_cache = {}  # dict[str, FilePart] maps file id to message data
-        self._message_to_cache = {}  # dict[str, str] maps message id to cache id
+            self.manager = InMemoryFakeAgentManager(
+                retention_policy=retention_policy,
+                on_change=self._updates.publish,
+            )
+        self._blobs = BlobStore(
+            retention_policy.max_file_cache_bytes,
+            spill_bytes=retention_policy.file_spill_bytes,
+            spill_dir=os.environ.get('A2A_UI_FILE_SPILL_DIR'),
+        )
+        atexit.register(self._blobs.close)
+        self._agent_cards = AgentCardResolver(http_client)
+        self._agent_card_refresh: asyncio.Task | None = None
 
         app.add_api_route(
             '/conversation/create', self._create_conversation, methods=['POST']
@@ -65,6 +113,9 @@ class ConversationServer:
         )
         app.add_api_route('/message/send', self._send_message, methods=['POST'])
         app.add_api_route('/events/get', self._get_events, methods=['POST'])
+        app.add_api_route(
+            '/events/stream', self._stream_events, methods=['GET']
+        )
         app.add_api_route(
             '/message/list', self._list_messages, methods=['POST']
         )
@@ -72,9 +123,15 @@ class ConversationServer:
             '/message/pending', self._pending_messages, methods=['POST']
         )
         app.add_api_route('/task/list', self._list_tasks, methods=['POST'])
+        app.add_api_route(
+            '/app_state/get', self._get_app_state, methods=['POST']
+        )
         app.add_api_route(
             '/agent/register', self._register_agent, methods=['POST']
         )
+        app.add_api_route(
+            '/agent/register_many', self._register_agents, methods=['POST']
+        )
         app.add_api_route('/agent/list', self._list_agents, methods=['POST'])
         app.add_api_route(
             '/message/file/{file_id}', self._files, methods=['GET']
@@ -82,6 +139,10 @@ class ConversationServer:
         app.add_api_route(
             '/api_key/update', self._update_api_key, methods=['POST']
         )
+        app.add_api_route(
+            '/retention/stats', self._retention_stats, methods=['POST']
+        )
+        app.add_api_route('/queue/stats', self._queue_stats, methods=['POST'])
 
     # Update API key in manager
     def update_api_key(self, api_key: str):
@@ -96,20 +157,23 @@ class ConversationServer:
         message_data = await request.json()
         message = Message(**message_data['params'])
         message = self.manager.sanitize_message(message)
-        loop = asyncio.get_event_loop()
-        if isinstance(self.manager, ADKHostManager):
-            t = threading.Thread(
-                target=lambda: cast(
-                    'ADKHostManager', self.manager
-                ).process_message_threadsafe(message, loop)
-            )
-        else:
-            t = threading.Thread(
-                target=lambda: asyncio.run(
-                    self.manager.process_message(message)
-                )
+        if not self._scheduler.submit(
+            message.context_id or '',
+            lambda: self.manager.process_message(message),
+        ):
+            # Too much work queued up, tell the client to back off.
+            return JSONResponse(
+                status_code=429,
+                content=SendMessageResponse(
+                    id=message_data.get('id'),
+                    error=JSONRPCError(
+                        code=-32000,
+                        message='Message queue is full, try again later',
+                        data={'queue_depth': self._scheduler.queue_depth},
+                    ),
+                ).model_dump(mode='json', exclude_none=True),
+                headers={'Retry-After': '1'},
             )
-        t.start()
         return SendMessageResponse(
             result=MessageInfo(
                 message_id=message.message_id,
@@ -119,15 +183,32 @@ class ConversationServer:
 
     async def _list_messages(self, request: Request):
         message_data = await request.json()
-        conversation_id = message_data['params']
-        conversation = self.manager.get_conversation(conversation_id)
-        if conversation:
-            return ListMessageResponse(
-                result=self.cache_content(conversation.messages)
-            )
-        return ListMessageResponse(result=[])
+        params = message_data['params']
+        if isinstance(params, str):
+            params = ListMessageParams(conversation_id=params)
+        else:
+            params = ListMessageParams(**params)
+        messages, next_cursor = self._message_page(params)
+        return ListMessageResponse(result=messages, next_cursor=next_cursor)
+
+    def _message_page(
+        self, params: ListMessageParams
+    ) -> tuple[list[Message], int]:
+        conversation = self.manager.get_conversation(params.conversation_id)
+        if not conversation:
+            return [], 0
+        # Messages are only ever appended, the cursor is a list index.
+        start = params.since or 0
+        end = start + params.limit if params.limit else None
+        messages = conversation.messages[start:end]
+        return self.cache_content(messages), start + len(messages)
 
     def cache_content(self, messages: list[Message]):
+        """Returns copies of the messages with inline files replaced by urls.
+
+        The stored messages keep their bytes, so a file evicted from the
+        blob store is put back the next time its message is listed.
+        """
         rval = []
         for m in messages:
             message_id = get_message_id(m)
@@ -137,30 +218,29 @@ class ConversationServer:
             new_parts: list[Part] = []
             for i, p in enumerate(m.parts):
                 part = p.root
-                if part.kind != 'file':
+                # Only inline payloads are cached, uris are served as is.
+                if part.kind != 'file' or not isinstance(
+                    part.file, FileWithBytes
+                ):
                     new_parts.append(p)
                     continue
-                message_part_id = f'{message_id}:{i}'
-                if message_part_id in self._message_to_cache:
-                    cache_id = self._message_to_cache[message_part_id]
-                else:
-                    cache_id = str(uuid.uuid4())
-                    self._message_to_cache[message_part_id] = cache_id
-                # Replace the part data with a url reference
+                # Decoded once and stored by content, the message keeps a
+                # url reference.
+                blob = self._blobs.put(
+                    f'{message_id}:{i}', part.file.bytes, part.file.mime_type
+                )
                 new_parts.append(
                     Part(
                         root=FilePart(
                             file=FileWithUri(
                                 mime_type=part.file.mime_type,
-                                uri=f'/message/file/{cache_id}',
+                                name=part.file.name,
+                                uri=f'/message/file/{blob.digest}',
                             )
                         )
                     )
                 )
-                if cache_id not in self._file_cache:
-                    self._file_cache[cache_id] = part
-            m.parts = new_parts
-            rval.append(m)
+            rval.append(m.model_copy(update={'parts': new_parts}))
         return rval
 
     async def _pending_messages(self):
@@ -171,31 +251,159 @@ class ConversationServer:
     def _list_conversation(self):
         return ListConversationResponse(result=self.manager.conversations)
 
-    def _get_events(self):
-        return GetEventResponse(result=self.manager.events)
+    async def _get_events(self, request: Request):
+        params = await self._request_params(request, PageParams)
+        events, next_cursor = self.manager.events_since(
+            params.since, params.limit
+        )
+        return GetEventResponse(result=events, next_cursor=next_cursor)
+
+    async def _list_tasks(self, request: Request):
+        params = await self._request_params(request, PageParams)
+        tasks, next_cursor = self._task_page(params)
+        return ListTaskResponse(result=tasks, next_cursor=next_cursor)
+
+    def _task_page(self, params: PageParams) -> tuple[list[Task], int]:
+        if params.since is None and params.limit is None:
+            # A full listing keeps tasks in creation order.
+            _, next_cursor = self.manager.tasks_since(None, None)
+            return self.manager.tasks, next_cursor
+        return self.manager.tasks_since(params.since, params.limit)
+
+    async def _get_app_state(self, request: Request):
+        """Answers conversation, message, task and pending message listings
+        in one round trip.
+        """
+        params = await self._request_params(request, AppStateParams)
+        snapshot = AppStateSnapshot(
+            conversations=self.manager.conversations,
+            pending_messages=self.manager.get_pending_messages(),
+            instance_id=self._instance_id,
+        )
+        if params.conversation_id:
+            snapshot.messages, snapshot.messages_cursor = self._message_page(
+                ListMessageParams(
+                    conversation_id=params.conversation_id,
+                    since=params.messages_since,
+                )
+            )
+        snapshot.evicted_task_ids = self.manager.evicted_tasks_since(
+            params.tasks_since
+        )
+        snapshot.tasks, snapshot.tasks_cursor = self._task_page(
+            PageParams(since=params.tasks_since)
+        )
+        return GetAppStateResponse(result=snapshot)
+
+    async def _stream_events(self, request: Request):
+        """Pushes every state change as a server-sent event."""
+        return StreamingResponse(
+            self._state_updates(request),
+            media_type='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+        )
+
+    async def _state_updates(self, request: Request):
+        with self._updates.subscribe() as updates:
+            # Flush the headers so the client sees the stream open at once.
+            yield ': connected\n\n'
+            while not await request.is_disconnected():
+                try:
+                    update = await asyncio.wait_for(
+                        updates.get(), SSE_KEEPALIVE_SECONDS
+                    )
+                except TimeoutError:
+                    yield ': keepalive\n\n'
+                    continue
+                data = update.model_dump_json(exclude_none=True)
+                yield f'event: {update.kind}\ndata: {data}\n\n'
 
-    def _list_tasks(self):
-        return ListTaskResponse(result=self.manager.tasks)
+    async def _request_params(
+        self, request: Request, params_type: type[ParamsT]
+    ) -> ParamsT:
+        """Parses the optional params of a request, defaulting every field."""
+        body = await request.body()
+        params = json.loads(body).get('params') if body else None
+        return params_type(**params) if params else params_type()
 
     async def _register_agent(self, request: Request):
         message_data = await request.json()
         url = message_data['params']
-        self.manager.register_agent(url)
+        card = await self._agent_cards.resolve(url)
+        self._add_agent(url, card)
         return RegisterAgentResponse()
 
+    async def _register_agents(self, request: Request):
+        message_data = await request.json()
+        urls: list[str] = message_data.get('params') or []
+        cards = await self._agent_cards.resolve_many(urls)
+        result = []
+        for url, card in zip(urls, cards, strict=True):
+            if isinstance(card, Exception):
+                result.append(AgentRegistration(url=url, error=str(card)))
+            else:
+                self._add_agent(url, card)
+                result.append(AgentRegistration(url=url, agent_name=card.name))
+        return RegisterAgentsResponse(result=result)
+
+    def _add_agent(self, url: str, card: AgentCard):
+        if not card.url:
+            card = card.model_copy(update={'url': normalize_agent_address(url)})
+        self.manager.register_agent_card(card)
+        if self._agent_card_refresh is None and self._agent_cards.ttl_seconds:
+            self._agent_card_refresh = asyncio.create_task(
+                self._refresh_agent_cards()
+            )
+
+    async def _refresh_agent_cards(self):
+        """Re-registers the agents whose card changed since it was fetched."""
+        while True:
+            await asyncio.sleep(self._agent_cards.ttl_seconds)
+            try:
+                for url, card in await self._agent_cards.refresh():
+                    self._add_agent(url, card)
+            except Exception as e:
+                print('Failed to refresh agent cards', e)
+
     async def _list_agents(self):
         return ListAgentResponse(result=self.manager.agents)
 
-    def _files(self, file_id):
-        if file_id not in self._file_cache:
-            raise Exception('file not found')
-        part = self._file_cache[file_id]
-        if 'image' in part.file.mime_type:
-            return Response(
-                content=base64.b64decode(part.file.bytes),
-                media_type=part.file.mime_type,
-            )
-        return Response(content=part.file.bytes, media_type=part.file.mime_type)
+    def _retention_stats(self):
+        stats = self.manager.retention_stats
+        stats.file_cache_bytes = self._blobs.size_bytes
+        stats.evicted_files = self._blobs.evictions
+        return GetRetentionStatsResponse(result=stats)
+
+    def _queue_stats(self):
+        return GetQueueStatsResponse(result=self._scheduler.stats())
+
+    def _files(self, file_id: str, request: Request):
+        blob = self._blobs.get(file_id)
+        if blob is None:
+            return Response(status_code=404)
+        # Files are named by their content, so they never change.
+        headers = {
+            'ETag': blob.etag,
+            'Cache-Control': 'public, max-age=31536000, immutable',
+            'Accept-Ranges': 'bytes',
+        }
+        if blob.etag in request.headers.get('if-none-match', ''):
+            return Response(status_code=304, headers=headers)
+        try:
+            byte_range = parse_range(request.headers.get('range'), blob.size)
+        except ValueError:
+            headers['Content-Range'] = f'bytes */{blob.size}'
+            return Response(status_code=416, headers=headers)
+        start, end = byte_range or (0, blob.size)
+        headers['Content-Length'] = str(end - start)
+        if byte_range:
+            headers['Content-Range'] = f'bytes {start}-{end - 1}/{blob.size}'
+        return StreamingResponse(
+            blob.iter_bytes(start, end),
+            status_code=206 if byte_range else 200,
+            media_type=blob.mime_type,
+            headers=headers,
+        )
 
     async def _update_api_key(self, request: Request):
         """Update the API key"""
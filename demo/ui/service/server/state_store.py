@@ -0,0 +1,315 @@
+import time
+
+from collections import OrderedDict
+from collections.abc import Callable
+
+from a2a.types import Message, Task
+
+from service.server.artifact_assembler import ArtifactAssembler
+from service.server.retention import RetentionPolicy
+from service.types import Conversation, Event, RetentionStats, StateUpdate
+
+
+# Evicted task ids remembered for clients catching up from a cursor.
+MAX_TASK_EVICTION_LOG = 10_000
+
+
+class StateStore:
+    """In-memory store of conversations, messages, tasks and events.
+
+    Every entity is kept in an id-keyed dict so the lookups that sit on the
+    hot path of a streaming task update (task by id, conversation by id,
+    message to task) are O(1) instead of a scan over the whole history.
+    Insertion order is preserved, so the list views returned to the UI keep
+    the same ordering the managers used to produce with plain lists.
+
+    All history is grouped by context id, and contexts are retained
+    according to a RetentionPolicy: the least recently used context is
+    evicted together with everything recorded under it.
+
+    Every recorded event and task update is stamped with the next value of
+    a sequence number. Events are append only, so they are kept in arrival
+    order, and tasks are additionally kept in order of their last update.
+    Walking either log backwards until a client's cursor is reached returns
+    just the changes since that cursor, in O(changes). Evicted tasks are
+    stamped too, in a log of the last MAX_TASK_EVICTION_LOG evictions, so
+    a client can drop them from its own copy. Every change is also reported
+    to `on_change` as it happens.
+    """
+
+    def __init__(
+        self,
+        policy: RetentionPolicy | None = None,
+        on_evict: Callable[[str], None] | None = None,
+        on_change: Callable[[StateUpdate], None] | None = None,
+    ):
+        self._policy = policy or RetentionPolicy()
+        # Called with the context id of every evicted context
+        self._on_evict = on_evict
+        self._on_change = on_change
+        # context id -> last access time, least recently used first
+        self._contexts: OrderedDict[str, float] = OrderedDict()
+        self._conversations: dict[str, Conversation] = {}
+        # context id -> messages
+        self._messages: dict[str, list[Message]] = {}
+        self._tasks: dict[str, Task] = {}
+        # task id -> sequence number of its last update, in update order
+        self._task_seqs: dict[str, int] = {}
+        # context id -> ordered set of task ids
+        self._tasks_by_context: dict[str, dict[str, None]] = {}
+        # message id -> task id, and its reverse for eviction
+        self._message_tasks: dict[str, str] = {}
+        self._task_messages: dict[str, list[str]] = {}
+        # task id -> assembler of its streaming artifacts
+        self._artifact_assemblers: dict[str, ArtifactAssembler] = {}
+        # task id -> sequence number of its eviction, in eviction order
+        self._evicted_task_seqs: OrderedDict[str, int] = OrderedDict()
+        # Sequence number of the newest eviction dropped from that log
+        self._evicted_task_floor = 0
+        self._events: dict[str, Event] = {}
+        # event id -> sequence number, in arrival order
+        self._event_seqs: dict[str, int] = {}
+        self._seq = 0
+        # context id -> ordered set of event ids, oldest first
+        self._events_by_context: dict[str, dict[str, None]] = {}
+        self._evicted_conversations = 0
+        self._evicted_tasks = 0
+        self._evicted_events = 0
+
+    def add_conversation(self, conversation: Conversation):
+        self._touch(conversation.conversation_id)
+        self._conversations[conversation.conversation_id] = conversation
+        self._publish('conversation', conversation.conversation_id)
+
+    def get_conversation(
+        self, conversation_id: str | None
+    ) -> Conversation | None:
+        if not conversation_id:
+            return None
+        conversation = self._conversations.get(conversation_id)
+        if conversation:
+            self._touch(conversation_id)
+        return conversation
+
+    @property
+    def conversations(self) -> list[Conversation]:
+        self.evict_expired()
+        return list(self._conversations.values())
+
+    def add_message(self, message: Message):
+        context_id = message.context_id or ''
+        self._touch(context_id)
+        self._messages.setdefault(context_id, []).append(message)
+        self._publish('message', message.context_id, message=message)
+
+    @property
+    def messages(self) -> list[Message]:
+        return [m for messages in self._messages.values() for m in messages]
+
+    def add_task(self, task: Task):
+        context_id = task.context_id or ''
+        self._touch(context_id)
+        self._tasks[task.id] = task
+        self._task_seqs.pop(task.id, None)
+        self._task_seqs[task.id] = self._next_seq()
+        context_tasks = self._tasks_by_context.setdefault(context_id, {})
+        context_tasks[task.id] = None
+        self._publish('task', task.context_id, task=task)
+
+    def update_task(self, task: Task):
+        """Replaces a known task, unknown tasks are ignored."""
+        if task.id in self._tasks:
+            self.add_task(task)
+
+    def get_task(self, task_id: str | None) -> Task | None:
+        if not task_id:
+            return None
+        return self._tasks.get(task_id)
+
+    def has_task(self, task_id: str) -> bool:
+        return task_id in self._tasks
+
+    def tasks_for_context(self, context_id: str) -> list[Task]:
+        return [
+            self._tasks[task_id]
+            for task_id in self._tasks_by_context.get(context_id, {})
+        ]
+
+    @property
+    def tasks(self) -> list[Task]:
+        self.evict_expired()
+        return list(self._tasks.values())
+
+    def tasks_since(
+        self, cursor: int | None = None, limit: int | None = None
+    ) -> tuple[list[Task], int]:
+        """Returns the tasks updated after `cursor` and the next cursor."""
+        self.evict_expired()
+        task_ids, next_cursor = self._changed_since(
+            self._task_seqs, cursor, limit
+        )
+        return [self._tasks[task_id] for task_id in task_ids], next_cursor
+
+    def evicted_tasks_since(self, cursor: int | None) -> list[str] | None:
+        """Returns the ids of the tasks evicted after `cursor`.
+
+        Returns None if evictions after `cursor` are no longer all known,
+        the client has to list the tasks from the start.
+        """
+        self.evict_expired()
+        if not cursor:
+            # A listing from the start has nothing to drop.
+            return []
+        if cursor < self._evicted_task_floor:
+            return None
+        task_ids, _ = self._changed_since(self._evicted_task_seqs, cursor, None)
+        return task_ids
+
+    def attach_message_to_task(self, message_id: str, task_id: str):
+        self._message_tasks[message_id] = task_id
+        self._task_messages.setdefault(task_id, []).append(message_id)
+
+    def get_task_id_for_message(self, message_id: str) -> str | None:
+        return self._message_tasks.get(message_id)
+
+    def clear_message_tasks(self):
+        self._message_tasks = {}
+        self._task_messages = {}
+
+    def artifact_assembler(self, task_id: str) -> ArtifactAssembler:
+        """Returns the assembler of the task's streaming artifacts."""
+        assembler = self._artifact_assemblers.get(task_id)
+        if assembler is None:
+            assembler = ArtifactAssembler(self._policy.max_artifact_bytes)
+            self._artifact_assemblers[task_id] = assembler
+        return assembler
+
+    def add_event(self, event: Event):
+        context_id = event.content.context_id or ''
+        self._touch(context_id)
+        self._events[event.id] = event
+        self._event_seqs.pop(event.id, None)
+        self._event_seqs[event.id] = self._next_seq()
+        context_events = self._events_by_context.setdefault(context_id, {})
+        context_events[event.id] = None
+        limit = self._policy.max_events_per_conversation
+        while limit and len(context_events) > limit:
+            oldest = next(iter(context_events))
+            del context_events[oldest]
+            self._remove_event(oldest)
+        self._publish('event', event.content.context_id, event=event)
+
+    @property
+    def events(self) -> list[Event]:
+        self.evict_expired()
+        return list(self._events.values())
+
+    def events_since(
+        self, cursor: int | None = None, limit: int | None = None
+    ) -> tuple[list[Event], int]:
+        """Returns the events recorded after `cursor` and the next cursor."""
+        self.evict_expired()
+        event_ids, next_cursor = self._changed_since(
+            self._event_seqs, cursor, limit
+        )
+        return [self._events[event_id] for event_id in event_ids], next_cursor
+
+    @property
+    def cursor(self) -> int:
+        """The sequence number of the most recent change."""
+        return self._seq
+
+    def stats(self) -> RetentionStats:
+        return RetentionStats(
+            conversations=len(self._conversations),
+            tasks=len(self._tasks),
+            events=len(self._events),
+            evicted_conversations=self._evicted_conversations,
+            evicted_tasks=self._evicted_tasks,
+            evicted_events=self._evicted_events,
+        )
+
+    def evict_expired(self):
+        """Evicts every context that has outlived the policy's TTL."""
+        ttl = self._policy.ttl_seconds
+        if not ttl:
+            return
+        deadline = time.monotonic() - ttl
+        while self._contexts:
+            context_id, last_access = next(iter(self._contexts.items()))
+            if last_access > deadline:
+                return
+            self.evict_context(context_id)
+
+    def evict_context(self, context_id: str):
+        """Drops a context and everything recorded under it."""
+        self._contexts.pop(context_id, None)
+        if self._conversations.pop(context_id, None):
+            self._evicted_conversations += 1
+        self._messages.pop(context_id, None)
+        for task_id in self._tasks_by_context.pop(context_id, {}):
+            self._remove_task(task_id)
+        for event_id in self._events_by_context.pop(context_id, {}):
+            self._remove_event(event_id)
+        if self._on_evict:
+            self._on_evict(context_id)
+
+    def _remove_event(self, event_id: str):
+        del self._events[event_id]
+        del self._event_seqs[event_id]
+        self._evicted_events += 1
+
+    def _remove_task(self, task_id: str):
+        if self._tasks.pop(task_id, None):
+            self._evicted_tasks += 1
+            self._evicted_task_seqs.pop(task_id, None)
+            self._evicted_task_seqs[task_id] = self._next_seq()
+            if len(self._evicted_task_seqs) > MAX_TASK_EVICTION_LOG:
+                _, self._evicted_task_floor = self._evicted_task_seqs.popitem(
+                    last=False
+                )
+        self._task_seqs.pop(task_id, None)
+        for message_id in self._task_messages.pop(task_id, []):
+            if self._message_tasks.get(message_id) == task_id:
+                del self._message_tasks[message_id]
+        self._artifact_assemblers.pop(task_id, None)
+
+    def _publish(self, kind: str, context_id: str | None, **payload):
+        if self._on_change:
+            self._on_change(
+                StateUpdate(
+                    kind=kind,
+                    cursor=self._seq,
+                    context_id=context_id,
+                    **payload,
+                )
+            )
+
+    def _next_seq(self) -> int:
+        self._seq += 1
+        return self._seq
+
+    def _changed_since(
+        self, seqs: dict[str, int], cursor: int | None, limit: int | None
+    ) -> tuple[list[str], int]:
+        """Collects the ids in `seqs` stamped after `cursor`, oldest first."""
+        cursor = cursor or 0
+        changed = []
+        for item_id in reversed(seqs):
+            if seqs[item_id] <= cursor:
+                break
+            changed.append(item_id)
+        changed.reverse()
+        if limit and len(changed) > limit:
+            changed = changed[:limit]
+            return changed, seqs[changed[-1]]
+        return changed, self._seq
+
+    def _touch(self, context_id: str):
+        """Marks a context as most recently used and applies the policy."""
+        self._contexts[context_id] = time.monotonic()
+        self._contexts.move_to_end(context_id)
+        self.evict_expired()
+        limit = self._policy.max_conversations
+        while limit and len(self._contexts) > limit:
+            self.evict_context(next(iter(self._contexts)))
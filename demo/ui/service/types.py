@@ -46,6 +46,33 @@ class Event(BaseModel):
     timestamp: float
 
 
+class PageParams(BaseModel):
+    # Cursor returned by a previous call, only items added or updated since
+    # then are returned. When unset everything is returned.
+    since: int | None = None
+    limit: int | None = None
+
+
+class ListMessageParams(PageParams):
+    conversation_id: str
+
+
+class StateUpdate(BaseModel):
+    """A change pushed to the subscribers of /events/stream.
+
+    A `reset` update means updates were dropped and the subscriber should
+    refresh everything it shows.
+    """
+
+    kind: Literal['conversation', 'message', 'task', 'event', 'reset']
+    # The store cursor after the change, see PageParams.since
+    cursor: int = 0
+    context_id: str | None = None
+    message: Message | None = None
+    task: Task | None = None
+    event: Event | None = None
+
+
 class SendMessageRequest(JSONRPCRequest):
     method: Literal['message/send'] = 'message/send'
     params: Message
@@ -53,12 +80,14 @@ class SendMessageRequest(JSONRPCRequest):
 
 class ListMessageRequest(JSONRPCRequest):
     method: Literal['message/list'] = 'message/list'
-    # This is the conversation id
-    params: str
+    # This is the conversation id, optionally with a page
+    params: str | ListMessageParams
 
 
 class ListMessageResponse(JSONRPCResponse):
     result: list[Message] | None = None
+    # Pass as `since` to get only the messages added after this call
+    next_cursor: int | None = None
 
 
 class MessageInfo(BaseModel):
@@ -72,10 +101,13 @@ class SendMessageResponse(JSONRPCResponse):
 
 class GetEventRequest(JSONRPCRequest):
     method: Literal['events/get'] = 'events/get'
+    params: PageParams | None = None
 
 
 class GetEventResponse(JSONRPCResponse):
     result: list[Event] | None = None
+    # Pass as `since` to get only the events recorded after this call
+    next_cursor: int | None = None
 
 
 class ListConversationRequest(JSONRPCRequest):
@@ -104,10 +136,13 @@ class CreateConversationResponse(JSONRPCResponse):
 
 class ListTaskRequest(JSONRPCRequest):
     method: Literal['task/list'] = 'task/list'
+    params: PageParams | None = None
 
 
 class ListTaskResponse(JSONRPCResponse):
     result: list[Task] | None = None
+    # Pass as `since` to get only the tasks updated after this call
+    next_cursor: int | None = None
 
 
 class RegisterAgentRequest(JSONRPCRequest):
@@ -120,6 +155,56 @@ class RegisterAgentResponse(JSONRPCResponse):
     result: str | None = None
 
 
+class RegisterAgentsRequest(JSONRPCRequest):
+    method: Literal['agent/register_many'] = 'agent/register_many'
+    # These are the base urls of the agent cards
+    params: list[str] = Field(default_factory=list)
+
+
+class AgentRegistration(BaseModel):
+    url: str
+    agent_name: str | None = None
+    error: str | None = None
+
+
+class RegisterAgentsResponse(JSONRPCResponse):
+    result: list[AgentRegistration] | None = None
+
+
+class AppStateParams(BaseModel):
+    conversation_id: str | None = None
+    # Cursors from a previous call, see PageParams.since
+    messages_since: int | None = None
+    tasks_since: int | None = None
+
+
+class AppStateSnapshot(BaseModel):
+    """Everything the UI refreshes, gathered in a single round trip."""
+
+    conversations: list[Conversation] = Field(default_factory=list)
+    # Messages of the requested conversation
+    messages: list[Message] = Field(default_factory=list)
+    messages_cursor: int = 0
+    tasks: list[Task] = Field(default_factory=list)
+    tasks_cursor: int = 0
+    # Tasks evicted after tasks_since, None if the tasks have to be listed
+    # again from the start
+    evicted_task_ids: list[str] | None = Field(default_factory=list)
+    pending_messages: list[tuple[str, str]] = Field(default_factory=list)
+    # Changes on every server start, the cursors of another instance are
+    # meaningless
+    instance_id: str = ''
+
+
+class GetAppStateRequest(JSONRPCRequest):
+    method: Literal['app_state/get'] = 'app_state/get'
+    params: AppStateParams | None = None
+
+
+class GetAppStateResponse(JSONRPCResponse):
+    result: AppStateSnapshot | None = None
+
+
 class ListAgentRequest(JSONRPCRequest):
     method: Literal['agent/list'] = 'agent/list'
 
@@ -128,6 +213,43 @@ class ListAgentResponse(JSONRPCResponse):
     result: list[AgentCard] | None = None
 
 
+class RetentionStats(BaseModel):
+    conversations: int = 0
+    tasks: int = 0
+    events: int = 0
+    file_cache_bytes: int = 0
+    evicted_conversations: int = 0
+    evicted_tasks: int = 0
+    evicted_events: int = 0
+    evicted_files: int = 0
+
+
+class GetRetentionStatsRequest(JSONRPCRequest):
+    method: Literal['retention/stats'] = 'retention/stats'
+
+
+class GetRetentionStatsResponse(JSONRPCResponse):
+    result: RetentionStats | None = None
+
+
+class QueueStats(BaseModel):
+    queued: int = 0
+    running: int = 0
+    completed: int = 0
+    failed: int = 0
+    rejected: int = 0
+    average_wait_seconds: float = 0
+    max_wait_seconds: float = 0
+
+
+class GetQueueStatsRequest(JSONRPCRequest):
+    method: Literal['queue/stats'] = 'queue/stats'
+
+
+class GetQueueStatsResponse(JSONRPCResponse):
+    result: QueueStats | None = None
+
+
 AgentRequest = TypeAdapter(
     Annotated[
         SendMessageRequest | ListConversationRequest,
@@ -7,11 +7,14 @@ import uuid
 from typing import Any
 
 from a2a.types import FileWithBytes, Message, Part, Role, Task, TaskState
-from service.client.client import ConversationClient
+from service.client.client import ConversationClient, get_shared_http_client
 from service.types import (
+    AppStateParams,
+    AppStateSnapshot,
     Conversation,
     CreateConversationRequest,
     Event,
+    GetAppStateRequest,
     GetEventRequest,
     ListAgentRequest,
     ListConversationRequest,
@@ -133,53 +136,127 @@ async def ListMessages(conversation_id: str) -> list[Message]:
     return []
 
 
+async def GetAppState(
+    conversation_id: str, messages_since: int, tasks_since: int
+) -> AppStateSnapshot | None:
+    """Fetches everything UpdateAppState needs in one round trip."""
+    client = ConversationClient(server_url)
+    try:
+        response = await client.get_app_state(
+            GetAppStateRequest(
+                params=AppStateParams(
+                    conversation_id=conversation_id or None,
+                    messages_since=messages_since,
+                    tasks_since=tasks_since,
+                )
+            )
+        )
+        return response.result
+    except Exception as e:
+        print('Failed to get app state ', e)
+    return None
+
+
 async def UpdateAppState(state: AppState, conversation_id: str):
-    """Update the app state."""
+    """Update the app state.
+
+    Everything is fetched in a single app_state/get call. Messages and tasks
+    are fetched incrementally from the cursors kept in the state and merged
+    by id, so a refresh only transfers what changed.
+    """
     try:
         if conversation_id:
             state.current_conversation_id = conversation_id
-            messages = await ListMessages(conversation_id)
-            if not messages:
+            if state.messages_cursor_conversation_id != conversation_id:
                 state.messages = []
-            else:
-                state.messages = [convert_message_to_state(x) for x in messages]
-        conversations = await ListConversations()
-        if not conversations:
-            state.conversations = []
-        else:
-            state.conversations = [
-                convert_conversation_to_state(x) for x in conversations
-            ]
-
-        state.task_list = []
-        for task in await GetTasks():
-            state.task_list.append(
-                SessionTask(
-                    context_id=extract_conversation_id(task),
-                    task=convert_task_to_state(task),
-                )
+                state.messages_cursor = 0
+                state.messages_cursor_conversation_id = conversation_id
+        snapshot = await GetAppState(
+            conversation_id, state.messages_cursor, state.tasks_cursor
+        )
+        if snapshot and snapshot.instance_id != state.server_instance_id:
+            # The server restarted, start over.
+            state.messages = []
+            state.messages_cursor = 0
+            state.task_list = []
+            state.tasks_cursor = 0
+            state.server_instance_id = snapshot.instance_id
+            snapshot = await GetAppState(conversation_id, 0, 0)
+        elif snapshot and snapshot.evicted_task_ids is None:
+            # Too many tasks were evicted to tell which, list them again.
+            state.task_list = []
+            state.tasks_cursor = 0
+            snapshot = await GetAppState(
+                conversation_id, state.messages_cursor, 0
             )
-        state.background_tasks = await GetProcessingMessages()
+        if not snapshot:
+            return
+        if conversation_id:
+            state.messages_cursor = snapshot.messages_cursor
+            merge_messages(state, snapshot.messages)
+        state.conversations = [
+            convert_conversation_to_state(x) for x in snapshot.conversations
+        ]
+        state.tasks_cursor = snapshot.tasks_cursor
+        remove_tasks(state, snapshot.evicted_task_ids or [])
+        merge_tasks(state, snapshot.tasks)
+        state.background_tasks = dict(snapshot.pending_messages)
         state.message_aliases = GetMessageAliases()
     except Exception as e:
         print('Failed to update state: ', e)
         traceback.print_exc(file=sys.stdout)
 
 
+def merge_messages(state: AppState, messages: list[Message]):
+    """Merges messages into the state, replacing the ones already shown."""
+    if not state.messages:
+        state.messages = []
+    index = {m.message_id: i for i, m in enumerate(state.messages)}
+    for message in messages:
+        state_message = convert_message_to_state(message)
+        if message.message_id in index:
+            state.messages[index[message.message_id]] = state_message
+        else:
+            index[message.message_id] = len(state.messages)
+            state.messages.append(state_message)
+
+
+def remove_tasks(state: AppState, task_ids: list[str]):
+    """Removes the tasks the server evicted from the state."""
+    if not task_ids:
+        return
+    evicted = set(task_ids)
+    state.task_list = [
+        t for t in state.task_list if t.task.task_id not in evicted
+    ]
+
+
+def merge_tasks(state: AppState, tasks: list[Task]):
+    """Merges tasks into the state, replacing the ones already shown."""
+    index = {t.task.task_id: i for i, t in enumerate(state.task_list)}
+    for task in tasks:
+        session_task = SessionTask(
+            context_id=extract_conversation_id(task),
+            task=convert_task_to_state(task),
+        )
+        if task.id in index:
+            state.task_list[index[task.id]] = session_task
+        else:
+            index[task.id] = len(state.task_list)
+            state.task_list.append(session_task)
+
+
 async def UpdateApiKey(api_key: str):
     """Update the API key"""
-    import httpx
-
     try:
         # Set the environment variable
         os.environ['GOOGLE_API_KEY'] = api_key
 
         # Call the update API endpoint
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f'{server_url}/api_key/update', json={'api_key': api_key}
-            )
-            response.raise_for_status()
+        response = await get_shared_http_client().post(
+            f'{server_url}/api_key/update', json={'api_key': api_key}
+        )
+        response.raise_for_status()
         return True
     except Exception as e:
         print('Failed to update API key: ', e)
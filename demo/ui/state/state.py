@@ -89,6 +89,13 @@ class AppState:
     # This is used to track the message sent to agent with form data
     form_responses: dict[str, str] = dataclasses.field(default_factory=dict)
     polling_interval: int = 1
+    # Refresh when the server pushes a change instead of polling
+    live_updates: bool = True
+    # Cursors of the last incremental refresh, see UpdateAppState
+    messages_cursor: int = 0
+    messages_cursor_conversation_id: str = ''
+    tasks_cursor: int = 0
+    server_instance_id: str = ''
 
     # Added for API key management
     api_key: str = ''
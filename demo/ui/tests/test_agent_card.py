@@ -0,0 +1,110 @@
+import asyncio
+import unittest
+
+import httpx
+
+from a2a.types import AgentCapabilities, AgentCard
+from utils.agent_card import AgentCardResolver
+
+
+def make_card(name: str) -> AgentCard:
+    return AgentCard(
+        name=name,
+        description='test agent',
+        url='http://agent',
+        version='1.0',
+        capabilities=AgentCapabilities(),
+        default_input_modes=['text'],
+        default_output_modes=['text'],
+        skills=[],
+    )
+
+
+class FakeAgent:
+    """Serves an agent card with an ETag and counts the requests."""
+
+    def __init__(self, card: AgentCard, cache_control: str = ''):
+        self.card = card
+        self.cache_control = cache_control
+        self.requests: list[httpx.Request] = []
+        self.not_modified = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        await asyncio.sleep(0.01)
+        etag = f'"{self.card.name}"'
+        headers = {'etag': etag}
+        if self.cache_control:
+            headers['cache-control'] = self.cache_control
+        if request.headers.get('if-none-match') == etag:
+            self.not_modified += 1
+            return httpx.Response(304, headers=headers)
+        return httpx.Response(
+            200, json=self.card.model_dump(mode='json'), headers=headers
+        )
+
+
+class AgentCardResolverTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the AgentCardResolver used by /agent/register."""
+
+    async def asyncSetUp(self) -> None:
+        self.agent = FakeAgent(make_card('one'))
+        self.http_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(self.agent)
+        )
+
+    async def asyncTearDown(self) -> None:
+        await self.http_client.aclose()
+
+    async def test_cards_are_cached(self) -> None:
+        """A fresh card is served from the cache."""
+        resolver = AgentCardResolver(self.http_client, ttl_seconds=60)
+        card = await resolver.resolve('localhost:1234')
+        self.assertEqual(card.name, 'one')
+        await resolver.resolve('http://localhost:1234/')
+        self.assertEqual(len(self.agent.requests), 1)
+        self.assertEqual(
+            str(self.agent.requests[0].url),
+            'http://localhost:1234/.well-known/agent-card.json',
+        )
+
+    async def test_concurrent_lookups_share_a_request(self) -> None:
+        """Resolving one address many times at once fetches it once."""
+        resolver = AgentCardResolver(self.http_client, ttl_seconds=60)
+        cards = await resolver.resolve_many(['localhost:1234'] * 5)
+        self.assertEqual([c.name for c in cards], ['one'] * 5)
+        self.assertEqual(len(self.agent.requests), 1)
+
+    async def test_expired_cards_are_revalidated(self) -> None:
+        """Expired cards are revalidated and only changes are reported."""
+        resolver = AgentCardResolver(self.http_client, ttl_seconds=0)
+        await resolver.resolve('localhost:1234')
+        self.assertEqual(await resolver.refresh(), [])
+        self.assertEqual(self.agent.not_modified, 1)
+        self.agent.card = make_card('two')
+        changed = await resolver.refresh()
+        self.assertEqual(
+            [(a, c.name) for a, c in changed],
+            [('http://localhost:1234', 'two')],
+        )
+
+    async def test_max_age_overrides_ttl(self) -> None:
+        """The agent's Cache-Control max-age decides how long a card is fresh."""
+        self.agent.cache_control = 'max-age=60'
+        resolver = AgentCardResolver(self.http_client, ttl_seconds=0)
+        await resolver.resolve('localhost:1234')
+        await resolver.resolve('localhost:1234')
+        self.assertEqual(len(self.agent.requests), 1)
+
+    async def test_failures_are_returned(self) -> None:
+        """resolve_many returns failures in place of the card."""
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda r: httpx.Response(404))
+        ) as http_client:
+            resolver = AgentCardResolver(http_client)
+            results = await resolver.resolve_many(['localhost:1234'])
+        self.assertIsInstance(results[0], httpx.HTTPStatusError)
+
+
+if __name__ == '__main__':
+    unittest.main()
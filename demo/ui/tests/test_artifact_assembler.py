@@ -0,0 +1,120 @@
+import unittest
+
+from a2a.types import (
+    Artifact,
+    DataPart,
+    Part,
+    TaskArtifactUpdateEvent,
+    TextPart,
+)
+from service.server.artifact_assembler import ArtifactAssembler
+
+
+def chunk(
+    artifact_id: str,
+    *parts: Part,
+    append: bool = False,
+    last_chunk: bool | None = False,
+) -> TaskArtifactUpdateEvent:
+    return TaskArtifactUpdateEvent(
+        task_id='t1',
+        context_id='c1',
+        artifact=Artifact(artifact_id=artifact_id, parts=list(parts)),
+        append=append,
+        last_chunk=last_chunk,
+    )
+
+
+def text(value: str) -> Part:
+    return Part(root=TextPart(text=value))
+
+
+class ArtifactAssemblerTest(unittest.TestCase):
+    """Tests for the ArtifactAssembler behind process_artifact_event."""
+
+    def test_entire_payload_is_returned_as_is(self) -> None:
+        """A single chunk without last_chunk is the whole artifact."""
+        assembler = ArtifactAssembler()
+        event = chunk('a1', text('hello'), last_chunk=None)
+        self.assertIs(assembler.add(event), event.artifact)
+        self.assertEqual(assembler.in_flight, [])
+
+    def test_text_chunks_are_coalesced(self) -> None:
+        """Adjacent text chunks are joined into one TextPart."""
+        assembler = ArtifactAssembler(partial_interval=0)
+        partial = assembler.add(chunk('a1', text('a')))
+        self.assertTrue(partial.metadata['partial'])
+        for value in 'bcd':
+            assembler.add(chunk('a1', text(value), append=True))
+        data = Part(root=DataPart(data={'k': 1}))
+        assembler.add(chunk('a1', data, text('e'), append=True))
+        artifact = assembler.add(
+            chunk('a1', text('f'), append=True, last_chunk=True)
+        )
+        self.assertEqual(
+            [
+                p.root.text if p.root.kind == 'text' else p
+                for p in artifact.parts
+            ],
+            ['abcd', data, 'ef'],
+        )
+        self.assertIsNone(artifact.metadata)
+        self.assertEqual(assembler.in_flight, [])
+
+    def test_interleaved_artifacts(self) -> None:
+        """Chunks of different artifacts do not mix."""
+        assembler = ArtifactAssembler(partial_interval=0)
+        assembler.add(chunk('a1', text('1')))
+        assembler.add(chunk('a2', text('x')))
+        assembler.add(chunk('a1', text('2'), append=True))
+        assembler.add(chunk('a2', text('y'), append=True))
+        a1 = assembler.add(chunk('a1', append=True, last_chunk=True))
+        a2 = assembler.add(chunk('a2', append=True, last_chunk=True))
+        self.assertEqual(a1.parts[0].root.text, '12')
+        self.assertEqual(a2.parts[0].root.text, 'xy')
+
+    def test_append_before_first_chunk(self) -> None:
+        """Append chunks that arrive early follow the first chunk."""
+        assembler = ArtifactAssembler(partial_interval=0)
+        assembler.add(chunk('a1', text(' world'), append=True))
+        artifact = assembler.add(chunk('a1', text('hello'), last_chunk=True))
+        self.assertEqual(artifact.parts[0].root.text, 'hello world')
+
+    def test_append_to_finished_artifact(self) -> None:
+        """An append chunk extends the artifact the task already has."""
+        assembler = ArtifactAssembler()
+        previous = Artifact(artifact_id='a1', parts=[text('hello')])
+        artifact = assembler.add(
+            chunk('a1', text('!'), append=True, last_chunk=True), previous
+        )
+        self.assertEqual(artifact.parts[0].root.text, 'hello!')
+
+    def test_in_flight_artifact_is_bounded(self) -> None:
+        """Parts beyond max_bytes are dropped and the artifact is marked."""
+        assembler = ArtifactAssembler(max_bytes=4)
+        assembler.add(chunk('a1', text('abc')))
+        assembler.add(chunk('a1', text('def'), append=True))
+        artifact = assembler.add(chunk('a1', append=True, last_chunk=True))
+        self.assertEqual(artifact.parts[0].root.text, 'abc')
+        self.assertTrue(artifact.metadata['truncated'])
+
+    def test_nothing_is_appended_after_truncation(self) -> None:
+        """A small chunk after a dropped one does not leave a gap."""
+        assembler = ArtifactAssembler(max_bytes=4)
+        assembler.add(chunk('a1', text('ab')))
+        assembler.add(chunk('a1', text('cdefgh'), append=True))
+        artifact = assembler.add(
+            chunk('a1', text('i'), append=True, last_chunk=True)
+        )
+        self.assertEqual(artifact.parts[0].root.text, 'ab')
+        self.assertTrue(artifact.metadata['truncated'])
+
+    def test_partial_snapshots_are_throttled(self) -> None:
+        """No snapshot is returned until partial_interval has passed."""
+        assembler = ArtifactAssembler(partial_interval=60)
+        self.assertIsNotNone(assembler.add(chunk('a1', text('a'))))
+        self.assertIsNone(assembler.add(chunk('a1', text('b'), append=True)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import base64
+import os
+import unittest
+
+from service.server.blob_store import BlobStore, parse_range
+
+
+def encode(payload: bytes) -> str:
+    return base64.b64encode(payload).decode()
+
+
+class BlobStoreTest(unittest.TestCase):
+    """Tests for the content addressed BlobStore behind /message/file."""
+
+    def setUp(self) -> None:
+        """Set up test fixtures."""
+        self.store = BlobStore(max_bytes=10, spill_bytes=5)
+        self.addCleanup(self.store.close)
+
+    def test_same_content_is_stored_once(self) -> None:
+        """Parts with the same content share one blob."""
+        first = self.store.put('m:0', encode(b'abc'), 'text/plain')
+        second = self.store.put('m:1', encode(b'abc'), 'text/plain')
+        self.assertEqual(first.digest, second.digest)
+        self.assertEqual(self.store.size_bytes, 3)
+        self.assertEqual(b''.join(first.iter_bytes()), b'abc')
+
+    def test_evicts_least_recently_used_blob(self) -> None:
+        """Blobs are evicted least recently used first to fit the budget."""
+        first = self.store.put('m:0', encode(b'aaaa'), None)
+        second = self.store.put('m:1', encode(b'bbbb'), None)
+        self.store.get(first.digest)
+        third = self.store.put('m:2', encode(b'cccc'), None)
+        self.assertIn(first.digest, self.store)
+        self.assertNotIn(second.digest, self.store)
+        self.assertIn(third.digest, self.store)
+        self.assertEqual(self.store.size_bytes, 8)
+        self.assertEqual(self.store.evictions, 1)
+        self.assertEqual(self.store.digest_for('m:0'), first.digest)
+        self.assertIsNone(self.store.digest_for('m:1'))
+
+    def test_large_blobs_spill_to_disk(self) -> None:
+        """Blobs over spill_bytes are served from a file."""
+        blob = self.store.put('m:0', encode(b'0123456789'), 'video/mp4')
+        self.assertIsNone(blob.data)
+        self.assertTrue(os.path.exists(blob.path))
+        self.assertEqual(b''.join(blob.iter_bytes(2, 5)), b'234')
+        self.store.put('m:1', encode(b'abcdefghij'), 'video/mp4')
+        self.assertFalse(os.path.exists(blob.path))
+
+    def test_parse_range(self) -> None:
+        """Single byte ranges are parsed, anything else is ignored."""
+        self.assertEqual(parse_range('bytes=0-3', 10), (0, 4))
+        self.assertEqual(parse_range('bytes=5-', 10), (5, 10))
+        self.assertEqual(parse_range('bytes=-3', 10), (7, 10))
+        self.assertEqual(parse_range('bytes=8-20', 10), (8, 10))
+        self.assertIsNone(parse_range(None, 10))
+        self.assertIsNone(parse_range('bytes=0-1,4-5', 10))
+        with self.assertRaises(ValueError):
+            parse_range('bytes=10-', 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import base64
+import unittest
+
+from unittest import mock
+
+import httpx
+
+from a2a.types import FilePart, FileWithBytes, Message, Part, Role
+from fastapi import FastAPI
+from service.server.server import ConversationServer
+
+
+def make_file_message(message_id: str, data: bytes) -> Message:
+    return Message(
+        role=Role.user,
+        message_id=message_id,
+        metadata={'message_id': message_id},
+        parts=[
+            Part(
+                root=FilePart(
+                    file=FileWithBytes(
+                        bytes=base64.b64encode(data).decode(),
+                        mime_type='text/plain',
+                    )
+                )
+            )
+        ],
+    )
+
+
+class CacheContentTest(unittest.TestCase):
+    """Tests for the file urls of listed messages."""
+
+    def setUp(self) -> None:
+        """Set up test fixtures."""
+        env = {'A2A_HOST': 'fake', 'A2A_UI_MAX_FILE_CACHE_BYTES': '10'}
+        with mock.patch.dict('os.environ', env):
+            self.server = ConversationServer(FastAPI(), httpx.AsyncClient())
+        self.addCleanup(self.server._blobs.close)
+
+    def test_stored_message_keeps_its_bytes(self) -> None:
+        message = make_file_message('m1', b'hello world!')
+        [listed] = self.server.cache_content([message])
+        self.assertTrue(listed.parts[0].root.file.uri.startswith('/message/'))
+        self.assertIsInstance(message.parts[0].root.file, FileWithBytes)
+
+    def test_evicted_file_is_cached_again(self) -> None:
+        first = make_file_message('m1', b'hello world!')
+        second = make_file_message('m2', b'other file!!')
+        [listed] = self.server.cache_content([first])
+        digest = listed.parts[0].root.file.uri.rsplit('/', 1)[-1]
+        # The 10 byte budget only fits one file, the first one is evicted.
+        self.server.cache_content([second])
+        self.assertNotIn(digest, self.server._blobs)
+        self.server.cache_content([first])
+        self.assertEqual(
+            b''.join(self.server._blobs.get(digest).iter_bytes()),
+            b'hello world!',
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
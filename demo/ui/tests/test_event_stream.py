@@ -0,0 +1,57 @@
+import asyncio
+import threading
+import unittest
+
+from service.server.event_stream import UpdateBroadcaster
+from service.server.state_store import StateStore
+from service.types import Conversation, StateUpdate
+
+
+class UpdateBroadcasterTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the UpdateBroadcaster behind /events/stream."""
+
+    async def test_updates_from_other_threads_are_delivered(self) -> None:
+        """Updates published off the loop reach the subscriber in order."""
+        broadcaster = UpdateBroadcaster()
+        with broadcaster.subscribe() as updates:
+            thread = threading.Thread(
+                target=lambda: [
+                    broadcaster.publish(StateUpdate(kind='task', cursor=i))
+                    for i in range(3)
+                ]
+            )
+            thread.start()
+            thread.join()
+            received = [
+                await asyncio.wait_for(updates.get(), 1) for _ in range(3)
+            ]
+        self.assertEqual([u.cursor for u in received], [0, 1, 2])
+        self.assertEqual(broadcaster.subscriber_count, 0)
+
+    async def test_slow_subscriber_gets_reset(self) -> None:
+        """A subscriber that falls behind gets a reset instead of a backlog."""
+        broadcaster = UpdateBroadcaster(max_queue_size=2)
+        with broadcaster.subscribe() as updates:
+            for i in range(3):
+                broadcaster.publish(StateUpdate(kind='event', cursor=i))
+            await asyncio.sleep(0)
+            update = updates.get_nowait()
+            self.assertEqual(update.kind, 'reset')
+            self.assertEqual(update.cursor, 2)
+            self.assertTrue(updates.empty())
+
+    async def test_store_changes_are_published(self) -> None:
+        """StateStore reports its changes to the broadcaster."""
+        broadcaster = UpdateBroadcaster()
+        store = StateStore(on_change=broadcaster.publish)
+        with broadcaster.subscribe() as updates:
+            store.add_conversation(
+                Conversation(conversation_id='c1', is_active=True)
+            )
+            update = await asyncio.wait_for(updates.get(), 1)
+        self.assertEqual(update.kind, 'conversation')
+        self.assertEqual(update.context_id, 'c1')
+
+
+if __name__ == '__main__':
+    unittest.main()
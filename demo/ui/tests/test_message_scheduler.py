@@ -0,0 +1,81 @@
+import asyncio
+import unittest
+
+from service.server.message_scheduler import MessageScheduler, SchedulerConfig
+
+
+class MessageSchedulerTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the MessageScheduler behind /message/send."""
+
+    async def test_conversation_messages_run_in_order(self) -> None:
+        """Messages of one conversation run one after another."""
+        scheduler = MessageScheduler()
+        order = []
+
+        def work(i: int, delay: float):
+            async def run():
+                order.append(('start', i))
+                await asyncio.sleep(delay)
+                order.append(('end', i))
+
+            return run
+
+        self.assertTrue(scheduler.submit('c1', work(0, 0.02)))
+        self.assertTrue(scheduler.submit('c1', work(1, 0)))
+        await asyncio.sleep(0.05)
+        self.assertEqual(
+            order, [('start', 0), ('end', 0), ('start', 1), ('end', 1)]
+        )
+        stats = scheduler.stats()
+        self.assertEqual(stats.completed, 2)
+        self.assertEqual(stats.queued, 0)
+        self.assertGreater(stats.max_wait_seconds, 0)
+
+    async def test_global_limit(self) -> None:
+        """At most max_concurrency messages run across conversations."""
+        scheduler = MessageScheduler(SchedulerConfig(max_concurrency=2))
+        release = asyncio.Event()
+        for i in range(4):
+            scheduler.submit(f'c{i}', release.wait)
+        await asyncio.sleep(0)
+        stats = scheduler.stats()
+        self.assertEqual((stats.running, stats.queued), (2, 2))
+        release.set()
+        await asyncio.sleep(0.01)
+        self.assertEqual(scheduler.stats().completed, 4)
+
+    async def test_full_queue_rejects(self) -> None:
+        """Submissions beyond max_queue_depth are rejected."""
+        scheduler = MessageScheduler(
+            SchedulerConfig(max_concurrency=1, max_queue_depth=2)
+        )
+        release = asyncio.Event()
+        self.assertTrue(scheduler.submit('c1', release.wait))
+        await asyncio.sleep(0)
+        self.assertTrue(scheduler.submit('c2', release.wait))
+        self.assertTrue(scheduler.submit('c3', release.wait))
+        self.assertFalse(scheduler.submit('c4', release.wait))
+        self.assertEqual(scheduler.queue_depth, 2)
+        self.assertEqual(scheduler.stats().rejected, 1)
+        release.set()
+        await asyncio.sleep(0.01)
+
+    async def test_failure_does_not_block_conversation(self) -> None:
+        """A failing message is counted and the next one still runs."""
+        scheduler = MessageScheduler()
+        ran = asyncio.Event()
+
+        async def fail():
+            raise ValueError('boom')
+
+        async def succeed():
+            ran.set()
+
+        scheduler.submit('c1', fail)
+        scheduler.submit('c1', succeed)
+        await asyncio.wait_for(ran.wait(), 1)
+        self.assertEqual(scheduler.stats().failed, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,233 @@
+import unittest
+import uuid
+
+from unittest import mock
+
+from a2a.types import (
+    Message,
+    Part,
+    Role,
+    Task,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+from service.server import state_store
+from service.server.retention import RetentionPolicy
+from service.server.state_store import StateStore
+from service.types import Conversation, Event
+
+
+def make_task(task_id: str, context_id: str = 'ctx') -> Task:
+    return Task(
+        id=task_id,
+        context_id=context_id,
+        status=TaskStatus(state=TaskState.submitted),
+    )
+
+
+def make_event(context_id: str) -> Event:
+    return Event(
+        id=str(uuid.uuid4()),
+        content=Message(
+            role=Role.agent,
+            parts=[Part(root=TextPart(text='event'))],
+            message_id=str(uuid.uuid4()),
+            context_id=context_id,
+        ),
+        timestamp=0,
+    )
+
+
+class StateStoreTest(unittest.TestCase):
+    """Tests for the id-indexed StateStore."""
+
+    def setUp(self) -> None:
+        """Set up test fixtures."""
+        self.store = StateStore()
+
+    def test_get_conversation(self) -> None:
+        """Conversations are resolved by id and keep insertion order."""
+        first = Conversation(conversation_id='a', is_active=True)
+        second = Conversation(conversation_id='b', is_active=True)
+        self.store.add_conversation(first)
+        self.store.add_conversation(second)
+        self.assertIs(self.store.get_conversation('b'), second)
+        self.assertIsNone(self.store.get_conversation('missing'))
+        self.assertIsNone(self.store.get_conversation(None))
+        self.assertEqual(self.store.conversations, [first, second])
+
+    def test_update_task_replaces_in_place(self) -> None:
+        """Updating a task keeps its position in the task list."""
+        self.store.add_task(make_task('t1'))
+        self.store.add_task(make_task('t2'))
+        updated = make_task('t1')
+        updated.status.state = TaskState.completed
+        self.store.update_task(updated)
+        self.assertEqual([t.id for t in self.store.tasks], ['t1', 't2'])
+        self.assertIs(self.store.get_task('t1'), updated)
+
+    def test_update_unknown_task_is_ignored(self) -> None:
+        """Updating a task that was never added does not insert it."""
+        self.store.update_task(make_task('t1'))
+        self.assertFalse(self.store.has_task('t1'))
+        self.assertEqual(self.store.tasks, [])
+
+    def test_tasks_for_context(self) -> None:
+        """Tasks are indexed by their context id."""
+        self.store.add_task(make_task('t1', 'ctx1'))
+        self.store.add_task(make_task('t2', 'ctx2'))
+        self.store.add_task(make_task('t3', 'ctx1'))
+        self.assertEqual(
+            [t.id for t in self.store.tasks_for_context('ctx1')], ['t1', 't3']
+        )
+        self.assertEqual(self.store.tasks_for_context('unknown'), [])
+
+    def test_message_task_index(self) -> None:
+        """Messages map to the task they were attached to."""
+        self.store.attach_message_to_task('m1', 't1')
+        self.assertEqual(self.store.get_task_id_for_message('m1'), 't1')
+        self.store.clear_message_tasks()
+        self.assertIsNone(self.store.get_task_id_for_message('m1'))
+
+
+class StateStoreCursorTest(unittest.TestCase):
+    """Tests for incremental reads from StateStore."""
+
+    def setUp(self) -> None:
+        """Set up test fixtures."""
+        self.store = StateStore()
+
+    def test_events_since(self) -> None:
+        """Only events recorded after the cursor are returned."""
+        first = make_event('a')
+        self.store.add_event(first)
+        events, cursor = self.store.events_since()
+        self.assertEqual(events, [first])
+        second, third = make_event('a'), make_event('b')
+        self.store.add_event(second)
+        self.store.add_event(third)
+        self.assertEqual(self.store.events_since(cursor), ([second, third], 3))
+        self.assertEqual(self.store.events_since(3), ([], 3))
+
+    def test_events_since_with_limit(self) -> None:
+        """A limited page returns a cursor to continue from."""
+        events = [make_event('a') for _ in range(5)]
+        for event in events:
+            self.store.add_event(event)
+        page, cursor = self.store.events_since(1, limit=2)
+        self.assertEqual(page, events[1:3])
+        self.assertEqual(cursor, 3)
+        self.assertEqual(self.store.events_since(cursor), (events[3:], 5))
+
+    def test_tasks_since_returns_updated_tasks(self) -> None:
+        """Updated tasks are returned again, in update order."""
+        self.store.add_task(make_task('t1'))
+        self.store.add_task(make_task('t2'))
+        _, cursor = self.store.tasks_since()
+        self.store.update_task(make_task('t1'))
+        tasks, next_cursor = self.store.tasks_since(cursor)
+        self.assertEqual([t.id for t in tasks], ['t1'])
+        self.assertEqual(
+            [t.id for t in self.store.tasks_since()[0]], ['t2', 't1']
+        )
+        self.assertEqual(self.store.tasks_since(next_cursor), ([], 3))
+        self.assertEqual([t.id for t in self.store.tasks], ['t1', 't2'])
+
+
+class StateStoreRetentionTest(unittest.TestCase):
+    """Tests for the retention policy applied by StateStore."""
+
+    def test_least_recently_used_conversation_is_evicted(self) -> None:
+        """Touching a conversation protects it from eviction."""
+        evicted = []
+        store = StateStore(
+            RetentionPolicy(max_conversations=2), on_evict=evicted.append
+        )
+        store.add_conversation(
+            Conversation(conversation_id='a', is_active=True)
+        )
+        store.add_conversation(
+            Conversation(conversation_id='b', is_active=True)
+        )
+        store.add_task(make_task('t1', 'a'))
+        store.attach_message_to_task('m1', 't1')
+        store.add_event(make_event('a'))
+        store.get_conversation('b')
+        store.get_conversation('a')
+        store.add_conversation(
+            Conversation(conversation_id='c', is_active=True)
+        )
+        self.assertEqual(
+            [c.conversation_id for c in store.conversations], ['a', 'c']
+        )
+        self.assertEqual(evicted, ['b'])
+        store.add_conversation(
+            Conversation(conversation_id='d', is_active=True)
+        )
+        self.assertEqual(evicted, ['b', 'a'])
+        self.assertFalse(store.has_task('t1'))
+        self.assertIsNone(store.get_task_id_for_message('m1'))
+        self.assertEqual(store.events, [])
+        stats = store.stats()
+        self.assertEqual(stats.evicted_conversations, 2)
+        self.assertEqual(stats.evicted_tasks, 1)
+        self.assertEqual(stats.evicted_events, 1)
+
+    def test_evicted_tasks_since(self) -> None:
+        """Tasks evicted after a cursor are reported to catch up from it."""
+        store = StateStore(RetentionPolicy(max_conversations=1))
+        store.add_conversation(
+            Conversation(conversation_id='a', is_active=True)
+        )
+        store.add_task(make_task('t1', 'a'))
+        _, cursor = store.tasks_since()
+        store.add_conversation(
+            Conversation(conversation_id='b', is_active=True)
+        )
+        self.assertEqual(store.evicted_tasks_since(cursor), ['t1'])
+        _, next_cursor = store.tasks_since(cursor)
+        self.assertEqual(store.evicted_tasks_since(next_cursor), [])
+        self.assertEqual(store.evicted_tasks_since(None), [])
+
+    def test_evicted_tasks_since_forgotten_cursor(self) -> None:
+        """A cursor older than the eviction log has to list again."""
+        store = StateStore(RetentionPolicy(max_conversations=1))
+        with mock.patch.object(state_store, 'MAX_TASK_EVICTION_LOG', 1):
+            for context_id in ('a', 'b', 'c'):
+                store.add_conversation(
+                    Conversation(conversation_id=context_id, is_active=True)
+                )
+                store.add_task(make_task(f't-{context_id}', context_id))
+        self.assertIsNone(store.evicted_tasks_since(1))
+        _, cursor = store.tasks_since()
+        self.assertEqual(store.evicted_tasks_since(cursor), [])
+
+    def test_events_per_conversation_are_capped(self) -> None:
+        """Only the most recent events of a conversation are kept."""
+        store = StateStore(RetentionPolicy(max_events_per_conversation=3))
+        events = [make_event('a') for _ in range(5)]
+        for event in events:
+            store.add_event(event)
+        self.assertEqual(store.events, events[2:])
+        self.assertEqual(store.stats().evicted_events, 2)
+
+    def test_ttl_expires_idle_conversations(self) -> None:
+        """Conversations idle for longer than the TTL are evicted."""
+        store = StateStore(RetentionPolicy(ttl_seconds=60))
+        with mock.patch('time.monotonic', return_value=0):
+            store.add_conversation(
+                Conversation(conversation_id='a', is_active=True)
+            )
+        with mock.patch('time.monotonic', return_value=30):
+            store.add_conversation(
+                Conversation(conversation_id='b', is_active=True)
+            )
+        with mock.patch('time.monotonic', return_value=61):
+            self.assertEqual(
+                [c.conversation_id for c in store.conversations], ['b']
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
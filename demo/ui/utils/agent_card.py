@@ -1,14 +1,167 @@
+import asyncio
+import os
+import re
+import time
+
+from dataclasses import dataclass
+
+import httpx
 import requests
 
 from a2a.types import AgentCard
 from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
 
 
-def get_agent_card(remote_agent_address: str) -> AgentCard:
-    """Get the agent card."""
+AGENT_CARD_TIMEOUT_SECONDS = 10
+
+
+def normalize_agent_address(remote_agent_address: str) -> str:
+    """Adds the default scheme and drops the trailing slash of an address."""
     if not remote_agent_address.startswith(('http://', 'https://')):
         remote_agent_address = 'http://' + remote_agent_address
+    return remote_agent_address.rstrip('/')
+
+
+def agent_card_url(remote_agent_address: str) -> str:
+    """Returns the well known agent card url of an agent address."""
+    return (
+        normalize_agent_address(remote_agent_address)
+        + AGENT_CARD_WELL_KNOWN_PATH
+    )
+
+
+def get_agent_card(remote_agent_address: str) -> AgentCard:
+    """Get the agent card."""
     agent_card = requests.get(
-        f'{remote_agent_address}{AGENT_CARD_WELL_KNOWN_PATH}'
+        agent_card_url(remote_agent_address),
+        timeout=AGENT_CARD_TIMEOUT_SECONDS,
     )
+    agent_card.raise_for_status()
     return AgentCard(**agent_card.json())
+
+
+@dataclass
+class _CachedCard:
+    card: AgentCard
+    etag: str | None
+    expires_at: float
+
+
+class AgentCardResolver:
+    """Resolves agent cards asynchronously and caches them.
+
+    Cards are cached for `ttl_seconds`, or for the `max-age` the agent sends
+    in its Cache-Control header. Once expired, a card is revalidated with
+    the ETag it was served with, so an unchanged card costs a 304. Concurrent
+    lookups of the same address share a single request.
+    """
+
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient,
+        ttl_seconds: float | None = None,
+        timeout: float = AGENT_CARD_TIMEOUT_SECONDS,
+    ):
+        self._http_client = http_client
+        self._ttl = (
+            ttl_seconds
+            if ttl_seconds is not None
+            else float(os.environ.get('A2A_UI_AGENT_CARD_TTL_SECONDS', 300))
+        )
+        self._timeout = timeout
+        self._cache: dict[str, _CachedCard] = {}
+        self._inflight: dict[str, asyncio.Future[AgentCard]] = {}
+
+    @property
+    def ttl_seconds(self) -> float:
+        return self._ttl
+
+    @property
+    def addresses(self) -> list[str]:
+        return list(self._cache)
+
+    async def resolve(
+        self, remote_agent_address: str, force: bool = False
+    ) -> AgentCard:
+        """Returns the agent card, fetching it only if the cache is stale."""
+        address = normalize_agent_address(remote_agent_address)
+        cached = self._cache.get(address)
+        if cached and not force and time.monotonic() < cached.expires_at:
+            return cached.card
+        if address in self._inflight:
+            return await asyncio.shield(self._inflight[address])
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[address] = future
+        try:
+            card = await self._fetch(address, cached)
+            future.set_result(card)
+            return card
+        except Exception as e:
+            future.set_exception(e)
+            # Mark it retrieved, this caller gets the error raised below.
+            future.exception()
+            raise
+        finally:
+            del self._inflight[address]
+
+    async def resolve_many(
+        self, remote_agent_addresses: list[str]
+    ) -> list[AgentCard | Exception]:
+        """Resolves many agent cards concurrently.
+
+        Failures are returned in place of the card rather than raised.
+        """
+        return await asyncio.gather(
+            *(self.resolve(address) for address in remote_agent_addresses),
+            return_exceptions=True,
+        )
+
+    async def refresh(self) -> list[tuple[str, AgentCard]]:
+        """Revalidates the expired cards.
+
+        Returns:
+          The (address, card) pairs of the cards that changed.
+        """
+        now = time.monotonic()
+        stale = [
+            address
+            for address, cached in self._cache.items()
+            if now >= cached.expires_at
+        ]
+        previous = [self._cache[address].card for address in stale]
+        results = await self.resolve_many(stale)
+        return [
+            (address, card)
+            for address, card, old in zip(stale, results, previous, strict=True)
+            if isinstance(card, AgentCard) and card != old
+        ]
+
+    async def _fetch(
+        self, address: str, cached: _CachedCard | None
+    ) -> AgentCard:
+        headers = {}
+        if cached and cached.etag:
+            headers['If-None-Match'] = cached.etag
+        response = await self._http_client.get(
+            agent_card_url(address), headers=headers, timeout=self._timeout
+        )
+        etag = response.headers.get('etag')
+        if response.status_code == 304 and cached:
+            card = cached.card
+            etag = etag or cached.etag
+        else:
+            response.raise_for_status()
+            card = AgentCard.model_validate(response.json())
+        self._cache[address] = _CachedCard(
+            card=card,
+            etag=etag,
+            expires_at=time.monotonic() + self._max_age(response),
+        )
+        return card
+
+    def _max_age(self, response: httpx.Response) -> float:
+        cache_control = response.headers.get('cache-control', '')
+        if 'no-cache' in cache_control or 'no-store' in cache_control:
+            return 0
+        match = re.search(r'max-age=(\d+)', cache_control)
+        return float(match.group(1)) if match else self._ttl
@@ -0,0 +1,173 @@
+"""Benchmarks concurrent A2A requests to the server agent with a fake LLM.
+
+Serves the agent (without MCP tools) on a local port and sends --requests
+concurrent `message/stream` requests, with the agent reading FakeBackend
+three ways:
+
+  blocking:  the fake model read synchronously on the event loop, as the
+             agent did with the synchronous genai stream.
+  threaded:  the same blocking stream read through ThreadedBackend.
+  async:     the async FakeBackend stream.
+
+Time to first token is measured up to the first LLM chunk of a request.
+
+run (from samples/python/agents/a2a-mcp-without-framework):
+  uv run python benchmarks/llm_streaming_benchmark.py --requests 100
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import statistics
+import time
+
+from collections.abc import AsyncIterator
+from uuid import uuid4
+
+import httpx
+import uvicorn
+
+from a2a.server.apps import A2AStarletteApplication
+from a2a.server.request_handlers import DefaultRequestHandler
+from a2a.server.tasks import InMemoryTaskStore
+from a2a.types import AgentCapabilities, AgentCard
+from no_llm_framework.llm import FakeBackend, LLMClient, ThreadedBackend
+from no_llm_framework.server.agent_executor import HelloWorldAgentExecutor
+
+
+class BlockingBackend:
+    """Iterates the blocking fake stream inside the event loop."""
+
+    def __init__(self, fake: FakeBackend):
+        self.fake = fake
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        for token in self.fake.generate(prompt):
+            yield token
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+async def serve(executor: HelloWorldAgentExecutor, port: int) -> uvicorn.Server:
+    agent_card = AgentCard(
+        name='A2A Protocol Agent',
+        description='Benchmarked agent',
+        url=f'http://127.0.0.1:{port}/',
+        version='1.0.0',
+        default_input_modes=['text'],
+        default_output_modes=['text'],
+        capabilities=AgentCapabilities(streaming=True),
+        skills=[],
+    )
+    request_handler = DefaultRequestHandler(
+        agent_executor=executor,
+        task_store=InMemoryTaskStore(),
+    )
+    app = A2AStarletteApplication(
+        agent_card=agent_card, http_handler=request_handler
+    ).build()
+    server = uvicorn.Server(
+        uvicorn.Config(app, port=port, log_level='critical', lifespan='off')
+    )
+    asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    return server
+
+
+async def send(
+    client: httpx.AsyncClient, url: str
+) -> tuple[float | None, float]:
+    """Stream one request, returning its time to first token and total time."""
+    request = {
+        'jsonrpc': '2.0',
+        'id': uuid4().hex,
+        'method': 'message/stream',
+        'params': {
+            'message': {
+                'role': 'user',
+                'message_id': uuid4().hex,
+                'parts': [{'kind': 'text', 'text': 'What is A2A protocol?'}],
+            }
+        },
+    }
+    began = time.perf_counter()
+    first_token = None
+    async with client.stream('POST', url, json=request) as response:
+        async for line in response.aiter_lines():
+            if first_token is not None or not line.startswith('data:'):
+                continue
+            event = json.loads(line[5:])['result']
+            message = event.get('status', {}).get('message')
+            text = message['parts'][0]['text'] if message else ''
+            if event.get('kind') == 'status-update' and text[:5] != 'Step ':
+                first_token = time.perf_counter() - began
+    return first_token, time.perf_counter() - began
+
+
+async def measure(name: str, port: int, requests: int) -> None:
+    limits = httpx.Limits(max_connections=requests)
+    async with httpx.AsyncClient(timeout=None, limits=limits) as client:
+        began = time.perf_counter()
+        results = await asyncio.gather(
+            *(
+                send(client, f'http://127.0.0.1:{port}/')
+                for _ in range(requests)
+            )
+        )
+        elapsed = time.perf_counter() - began
+
+    first_tokens = sorted(r[0] for r in results if r[0] is not None)
+    totals = sorted(r[1] for r in results)
+    p95 = max(int(len(totals) * 0.95) - 1, 0)
+    print(
+        f'{name:>9} {elapsed:>9.2f} {requests / elapsed:>8.1f}'
+        f' {statistics.median(first_tokens):>9.2f}'
+        f' {first_tokens[p95]:>9.2f}'
+        f' {statistics.median(totals):>9.2f} {totals[p95]:>9.2f}'
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    fake = FakeBackend(
+        first_token_delay=args.first_token_ms / 1000,
+        token_delay=args.token_ms / 1000,
+    )
+    print(
+        f'{"mode":>9} {"time (s)":>9} {"req/s":>8} {"ttft p50":>9}'
+        f' {"ttft p95":>9} {"total p50":>9} {"total p95":>9}'
+    )
+    backends = {
+        'blocking': BlockingBackend(fake),
+        'threaded': ThreadedBackend(fake.generate),
+        'async': fake,
+    }
+    executor = HelloWorldAgentExecutor(llm=LLMClient(fake), mcp_url=None)
+    port = free_port()
+    # One server for every mode: sse-starlette ends the streams of a process
+    # once a uvicorn server in it has been asked to exit.
+    server = await serve(executor, port)
+    for name in args.modes:
+        executor.agent.llm = LLMClient(backends[name])
+        await measure(name, port, args.requests)
+    server.should_exit = True
+    await asyncio.sleep(0.1)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--first-token-ms', type=float, default=200)
+    parser.add_argument('--token-ms', type=float, default=10)
+    parser.add_argument(
+        '--modes',
+        nargs='+',
+        choices=['blocking', 'threaded', 'async'],
+        default=['blocking', 'threaded', 'async'],
+    )
+    asyncio.run(main(parser.parse_args()))
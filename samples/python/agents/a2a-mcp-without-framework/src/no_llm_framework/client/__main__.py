@@ -5,6 +5,7 @@ from typing import Literal
 import asyncclick as click
 import colorama
 from no_llm_framework.client.agent import Agent
+from no_llm_framework.llm import create_llm_client
 
 
 @click.command()
@@ -12,11 +13,19 @@ from no_llm_framework.client.agent import Agent
 @click.option('--port', 'port', default=9999)
 @click.option('--mode', 'mode', default='streaming')
 @click.option('--question', 'question', required=True)
+@click.option(
+    '--llm',
+    'llm',
+    type=click.Choice(['gemini', 'fake']),
+    default='gemini',
+    envvar='LLM_BACKEND',
+)
 async def a_main(
     host: str,
     port: int,
     mode: Literal['completion', 'streaming'],
     question: str,
+    llm: str,
 ):
     """Main function to run the A2A Repo Agent client.
 
@@ -25,11 +34,13 @@ async def a_main(
         port (int): The port number to run the server on.
         mode (Literal['completion', 'streaming']): The mode to run the server on.
         question (str): The question to ask the Agent.
+        llm (str): The LLM backend, 'gemini' or 'fake'.
     """  # noqa: E501
     agent = Agent(
         mode='stream',
         token_stream_callback=None,
         agent_urls=[f'http://{host}:{port}/'],
+        llm=create_llm_client(llm),
     )
     async for chunk in agent.stream(question):
         if chunk.startswith('<Agent name="'):
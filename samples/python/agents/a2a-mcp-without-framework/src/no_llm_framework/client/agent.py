@@ -2,7 +2,7 @@ import asyncio
 import json
 import re
 
-from collections.abc import Callable, Generator
+from collections.abc import AsyncIterator, Callable
 from pathlib import Path
 from typing import Literal
 from uuid import uuid4
@@ -21,10 +21,9 @@ from a2a.types import (
     TaskStatusUpdateEvent,
     TextPart,
 )
-from google import genai
 from jinja2 import Template
 
-from no_llm_framework.client.constant import GOOGLE_API_KEY
+from no_llm_framework.llm import LLMClient, get_llm_client
 
 
 dir_path = Path(__file__).parent
@@ -39,21 +38,16 @@ with Path(dir_path / 'agent_answer.jinja').open('r') as f:
     agent_answer_template = Template(f.read())
 
 
-def stream_llm(prompt: str) -> Generator[str]:
+def stream_llm(prompt: str) -> AsyncIterator[str]:
     """Stream LLM response.
 
     Args:
         prompt (str): The prompt to send to the LLM.
 
     Returns:
-        Generator[str, None, None]: A generator of the LLM response.
+        AsyncIterator[str]: An async iterator of the LLM response.
     """
-    client = genai.Client(vertexai=False, api_key=GOOGLE_API_KEY)
-    for chunk in client.models.generate_content_stream(
-        model='gemini-2.5-flash-lite',
-        contents=prompt,
-    ):
-        yield chunk.text
+    return get_llm_client().stream(prompt)
 
 
 class Agent:
@@ -65,11 +59,13 @@ class Agent:
         token_stream_callback: Callable[[str], None] | None = None,
         agent_urls: list[str] | None = None,
         agent_prompt: str | None = None,
+        llm: LLMClient | None = None,
     ):
         self.mode = mode
         self.token_stream_callback = token_stream_callback
         self.agent_urls = agent_urls
         self.agents_registry: dict[str, AgentCard] = {}
+        self.llm = llm or get_llm_client()
 
     async def get_agents(self) -> tuple[dict[str, AgentCard], str]:
         """Retrieve agent cards from all agent URLs and render the agent prompt.
@@ -93,29 +89,29 @@ class Agent:
             agent_prompt = agents_template.render(agent_cards=agent_cards)
             return agents_registry, agent_prompt
 
-    def call_llm(self, prompt: str) -> str:
-        """Call the LLM with the given prompt and return the response as a string or generator.
+    async def call_llm(self, prompt: str) -> AsyncIterator[str]:
+        """Call the LLM with the given prompt and yield the response.
 
         Args:
             prompt (str): The prompt to send to the LLM.
 
-        Returns:
-            str or Generator[str]: The LLM response as a string or generator, depending on mode.
+        Yields:
+            str: The response chunk by chunk in 'stream' mode, or the whole
+            response at once in 'complete' mode.
         """
         if self.mode == 'complete':
-            return stream_llm(prompt)
+            yield await self.llm.complete(prompt)
+            return
 
-        result = ''
-        for chunk in stream_llm(prompt):
-            result += chunk
-        return result
+        async for chunk in self.llm.stream(prompt):
+            yield chunk
 
     async def decide(
         self,
         question: str,
         agents_prompt: str,
         called_agents: list[dict] | None = None,
-    ) -> Generator[str, None]:
+    ) -> AsyncIterator[str]:
         """Decide which agent(s) to use to answer the question.
 
         Args:
@@ -124,7 +120,7 @@ class Agent:
             called_agents (list[dict] | None): Previously called agents and their answers.
 
         Returns:
-            Generator[str, None]: The LLM's response as a generator of strings.
+            AsyncIterator[str]: The LLM's response, chunk by chunk.
         """
         if called_agents:
             call_agent_prompt = agent_answer_template.render(
@@ -198,7 +194,7 @@ class Agent:
         for _ in range(3):
             agents_registry, agent_prompt = await self.get_agents()
             response = ''
-            for chunk in await self.decide(
+            async for chunk in await self.decide(
                 question, agent_prompt, agent_answers
             ):
                 response += chunk
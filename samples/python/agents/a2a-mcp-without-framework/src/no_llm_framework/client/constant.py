@@ -1,3 +0,0 @@
-import os
-
-GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
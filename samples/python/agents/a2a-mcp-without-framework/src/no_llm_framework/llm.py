@@ -0,0 +1,184 @@
+import asyncio
+import os
+import re
+import time
+
+from collections.abc import AsyncIterator, Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from typing import Protocol
+
+from google import genai
+
+
+DEFAULT_MODEL = 'gemini-2.5-flash-lite'
+
+FAKE_REPLY = (
+    '<Answer>A2A (Agent2Agent) is an open protocol that lets AI agents '
+    'built with different frameworks discover each other through agent '
+    'cards and exchange messages, tasks and artifacts over HTTP.</Answer>'
+)
+
+
+class LLMBackend(Protocol):
+    """Streams the response of a model to a prompt, chunk by chunk."""
+
+    def stream(self, prompt: str) -> AsyncIterator[str]: ...
+
+
+class GeminiBackend:
+    """Streams Gemini responses with the async API of google-genai.
+
+    The `genai.Client` is created on first use and shared by every request,
+    so its HTTP connections are reused.
+    """
+
+    def __init__(self, model: str = DEFAULT_MODEL, api_key: str | None = None):
+        self.model = model
+        self.api_key = api_key or os.getenv('GOOGLE_API_KEY')
+        self._client: genai.Client | None = None
+
+    @property
+    def client(self) -> genai.Client:
+        if self._client is None:
+            self._client = genai.Client(vertexai=False, api_key=self.api_key)
+        return self._client
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        async for chunk in await self.client.aio.models.generate_content_stream(
+            model=self.model, contents=prompt
+        ):
+            if chunk.text:
+                yield chunk.text
+
+
+class ThreadedBackend:
+    """Streams a blocking generator without blocking the event loop.
+
+    For SDKs without an async API: each chunk is read from `generate` in a
+    thread of a pool of `max_workers`, one per stream being read.
+    """
+
+    def __init__(
+        self,
+        generate: Callable[[str], Iterator[str]],
+        max_workers: int = 100,
+    ):
+        self.generate = generate
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='llm-stream'
+        )
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        loop = asyncio.get_running_loop()
+        chunks = self.generate(prompt)
+        done = object()
+        while True:
+            chunk = await loop.run_in_executor(
+                self._executor, next, chunks, done
+            )
+            if chunk is done:
+                return
+            yield chunk
+
+
+class FakeBackend:
+    """Answers every prompt with `reply`, one word at a time, offline.
+
+    The first word comes after `first_token_delay` seconds and the next ones
+    every `token_delay` seconds, like a hosted model, so the agents can be
+    run and benchmarked without an API key.
+    """
+
+    def __init__(
+        self,
+        reply: str = FAKE_REPLY,
+        first_token_delay: float = 0.3,
+        token_delay: float = 0.02,
+    ):
+        self.tokens = re.findall(r'\S+\s*', reply)
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        await asyncio.sleep(self.first_token_delay)
+        for index, token in enumerate(self.tokens):
+            if index:
+                await asyncio.sleep(self.token_delay)
+            yield token
+
+    def generate(self, prompt: str) -> Iterator[str]:
+        """The same stream, blocking, like a synchronous SDK."""
+        time.sleep(self.first_token_delay)
+        for index, token in enumerate(self.tokens):
+            if index:
+                time.sleep(self.token_delay)
+            yield token
+
+
+class _Failure:
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+_END = object()
+
+
+class LLMClient:
+    """Streams LLM responses to the agents without blocking the event loop.
+
+    Each stream reads the backend in its own task and hands the chunks over
+    through a queue of at most `queue_size` chunks: the model keeps being
+    read while the agent sends the previous chunks on, and a slow reader
+    pauses the backend instead of buffering the whole response.
+    """
+
+    def __init__(self, backend: LLMBackend, queue_size: int = 32):
+        self.backend = backend
+        self.queue_size = queue_size
+        self.stats = {'streams': 0, 'in_flight': 0, 'chunks': 0, 'errors': 0}
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        """Yield the chunks of the response to the prompt."""
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        producer = asyncio.create_task(self._produce(prompt, queue))
+        self.stats['streams'] += 1
+        self.stats['in_flight'] += 1
+        try:
+            while (chunk := await queue.get()) is not _END:
+                if isinstance(chunk, _Failure):
+                    self.stats['errors'] += 1
+                    raise chunk.error
+                self.stats['chunks'] += 1
+                yield chunk
+        finally:
+            self.stats['in_flight'] -= 1
+            producer.cancel()
+
+    async def complete(self, prompt: str) -> str:
+        """Return the whole response to the prompt."""
+        return ''.join([chunk async for chunk in self.stream(prompt)])
+
+    async def _produce(self, prompt: str, queue: asyncio.Queue) -> None:
+        try:
+            async for chunk in self.backend.stream(prompt):
+                await queue.put(chunk)
+        except Exception as e:
+            await queue.put(_Failure(e))
+        else:
+            await queue.put(_END)
+
+
+def create_llm_client(backend: str = 'gemini') -> LLMClient:
+    """Create a client for the 'gemini' or the 'fake' backend."""
+    if backend == 'gemini':
+        return LLMClient(GeminiBackend())
+    if backend == 'fake':
+        return LLMClient(FakeBackend())
+    raise ValueError(f'Unknown LLM backend: {backend}')
+
+
+@cache
+def get_llm_client() -> LLMClient:
+    """The client shared by the agents, for the backend set in LLM_BACKEND."""
+    return create_llm_client(os.getenv('LLM_BACKEND', 'gemini'))
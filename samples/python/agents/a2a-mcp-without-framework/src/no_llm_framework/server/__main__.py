@@ -17,6 +17,7 @@ from a2a.types import (
     SendMessageResponse,
 )
 
+from no_llm_framework.llm import create_llm_client
 from no_llm_framework.server.agent_executor import HelloWorldAgentExecutor
 
 
@@ -40,7 +41,15 @@ class A2ARequestHandler(DefaultRequestHandler):
 @click.command()
 @click.option('--host', 'host', default='localhost')
 @click.option('--port', 'port', default=9999)
-def main(host: str, port: int):
+@click.option(
+    '--llm',
+    'llm',
+    type=click.Choice(['gemini', 'fake']),
+    default='gemini',
+    envvar='LLM_BACKEND',
+    help="LLM backend, 'fake' answers offline without an API key.",
+)
+def main(host: str, port: int, llm: str):
     """Start the A2A Repo Agent server.
 
     This function initializes the A2A Repo Agent server with the specified host and port.
@@ -49,6 +58,7 @@ def main(host: str, port: int):
     Args:
         host (str): The host address to run the server on.
         port (int): The port number to run the server on.
+        llm (str): The LLM backend, 'gemini' or 'fake'.
     """
     skill = AgentSkill(
         id='answer_detail_about_A2A_repo',
@@ -77,7 +87,7 @@ def main(host: str, port: int):
 
     task_store = InMemoryTaskStore()
     request_handler = A2ARequestHandler(
-        agent_executor=HelloWorldAgentExecutor(),
+        agent_executor=HelloWorldAgentExecutor(llm=create_llm_client(llm)),
         task_store=task_store,
     )
 
@@ -2,15 +2,14 @@ import asyncio
 import json
 import re
 
-from collections.abc import AsyncGenerator, Callable, Generator
+from collections.abc import AsyncGenerator, AsyncIterator, Callable
 from pathlib import Path
 from typing import Literal
 
-from google import genai
 from jinja2 import Template
 from mcp.types import CallToolResult
 
-from no_llm_framework.server.constant import GOOGLE_API_KEY
+from no_llm_framework.llm import LLMClient, get_llm_client
 from no_llm_framework.server.mcp import call_mcp_tool, get_mcp_tool_prompt
 
 
@@ -26,21 +25,16 @@ with Path(dir_path / 'called_tools_history.jinja').open('r') as f:
     called_tools_history_template = Template(f.read())
 
 
-def stream_llm(prompt: str) -> Generator[str, None]:
+def stream_llm(prompt: str) -> AsyncIterator[str]:
     """Stream LLM response.
 
     Args:
         prompt (str): The prompt to send to the LLM.
 
     Returns:
-        Generator[str, None, None]: A generator of the LLM response.
+        AsyncIterator[str]: An async iterator of the LLM response.
     """
-    client = genai.Client(vertexai=False, api_key=GOOGLE_API_KEY)
-    for chunk in client.models.generate_content_stream(
-        model='gemini-2.5-flash-lite',
-        contents=prompt,
-    ):
-        yield chunk.text
+    return get_llm_client().stream(prompt)
 
 
 class Agent:
@@ -51,25 +45,27 @@ class Agent:
         mode: Literal['complete', 'stream'] = 'stream',
         token_stream_callback: Callable[[str], None] | None = None,
         mcp_url: str | None = None,
+        llm: LLMClient | None = None,
     ):
         self.mode = mode
         self.token_stream_callback = token_stream_callback
         self.mcp_url = mcp_url
+        self.llm = llm or get_llm_client()
 
-    def call_llm(self, prompt: str) -> Generator[str, None]:
-        """Call the LLM with the given prompt and return a generator of responses.
+    def call_llm(self, prompt: str) -> AsyncIterator[str]:
+        """Call the LLM with the given prompt and stream its response.
 
         Args:
             prompt (str): The prompt to send to the LLM.
 
         Returns:
-            Generator[str, None]: A generator yielding the LLM's response.
+            AsyncIterator[str]: An async iterator yielding the LLM's response.
         """
-        return stream_llm(prompt)
+        return self.llm.stream(prompt)
 
     async def decide(
         self, question: str, called_tools: list[dict] | None = None
-    ) -> Generator[str, None]:
+    ) -> AsyncIterator[str]:
         """Decide which tool to use to answer the question.
 
         Args:
@@ -136,7 +132,7 @@ class Agent:
             }
 
             response = ''
-            for chunk in await self.decide(question, called_tools):
+            async for chunk in await self.decide(question, called_tools):
                 response += chunk
                 yield {
                     'is_task_complete': False,
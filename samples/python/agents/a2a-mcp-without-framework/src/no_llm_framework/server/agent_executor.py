@@ -9,17 +9,24 @@ from a2a.types import (
     TaskStatusUpdateEvent,
 )
 from a2a.utils import new_agent_text_message, new_task, new_text_artifact
-from src.no_llm_framework.server.agent import Agent
+
+from no_llm_framework.llm import LLMClient
+from no_llm_framework.server.agent import Agent
 
 
 class HelloWorldAgentExecutor(AgentExecutor):
     """Test AgentProxy Implementation."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        llm: LLMClient | None = None,
+        mcp_url: str | None = 'https://gitmcp.io/google/A2A',
+    ):
         self.agent = Agent(
             mode='stream',
             token_stream_callback=print,
-            mcp_url='https://gitmcp.io/google/A2A',
+            mcp_url=mcp_url,
+            llm=llm,
         )
 
     @override
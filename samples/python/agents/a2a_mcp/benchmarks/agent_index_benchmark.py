@@ -0,0 +1,111 @@
+"""Benchmarks find_agent lookups against thousands of synthetic agent cards.
+
+Embeddings are computed locally by hashing, so no API key is needed. The
+old lookup, which stacked the per-card embeddings of a DataFrame on every
+query, is compared to AgentCardIndex, which searches one precomputed,
+normalized matrix.
+
+run (from samples/python/agents/a2a_mcp):
+  uv run python benchmarks/agent_index_benchmark.py --cards 5000
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import time
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from a2a_mcp.mcp.agent_index import AgentCardIndex, hashing_embeddings
+
+
+WORDS = (
+    'flight hotel car rental booking travel airline seat room suite '
+    'weather currency exchange itinerary planner restaurant museum tour '
+    'train bus ferry visa insurance luggage lounge upgrade refund'
+).split()
+
+
+def synthetic_cards(count: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            'name': f'Agent {i}',
+            'description': ' '.join(rng.choices(WORDS, k=12)),
+            'url': f'http://localhost:{10000 + i}/',
+            'skills': [
+                {
+                    'id': f'skill_{i}',
+                    'name': ' '.join(rng.choices(WORDS, k=3)),
+                    'tags': rng.choices(WORDS, k=4),
+                }
+            ],
+        }
+        for i in range(count)
+    ]
+
+
+def dataframe_lookup(df: pd.DataFrame, query: str) -> dict:
+    query_embedding = hashing_embeddings([query], 'retrieval_query')[0]
+    dot_products = np.dot(np.stack(df['card_embeddings']), query_embedding)
+    return df.iloc[np.argmax(dot_products)]['agent_card']
+
+
+def timed(fn, repeat: int) -> float:
+    began = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - began) / repeat
+
+
+def main(cards: int, queries: int):
+    agent_cards = synthetic_cards(cards)
+    card_uris = [f'resource://agent_cards/agent_{i}' for i in range(cards)]
+    query = 'book a hotel room and a rental car'
+
+    began = time.perf_counter()
+    df = pd.DataFrame({'card_uri': card_uris, 'agent_card': agent_cards})
+    df['card_embeddings'] = df.apply(
+        lambda row: hashing_embeddings(
+            [json.dumps(row['agent_card'])], 'retrieval_document'
+        )[0],
+        axis=1,
+    )
+    dataframe_build = time.perf_counter() - began
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache_path = Path(cache_dir) / 'embeddings.npz'
+        began = time.perf_counter()
+        AgentCardIndex(
+            card_uris, agent_cards, hashing_embeddings, cache_path=cache_path
+        )
+        index_build = time.perf_counter() - began
+        began = time.perf_counter()
+        index = AgentCardIndex(
+            card_uris, agent_cards, hashing_embeddings, cache_path=cache_path
+        )
+        cached_build = time.perf_counter() - began
+
+    dataframe_query = timed(lambda: dataframe_lookup(df, query), queries)
+    index_query = timed(lambda: index.search(query, top_k=5), queries)
+
+    print(f'{cards} cards, {queries} queries')
+    print(f'{"":>22} {"build (s)":>10} {"query (ms)":>11}')
+    print(
+        f'{"dataframe":>22} {dataframe_build:>10.3f} '
+        f'{dataframe_query * 1000:>11.3f}'
+    )
+    print(f'{"index":>22} {index_build:>10.3f} {index_query * 1000:>11.3f}')
+    print(f'{"index, cached":>22} {cached_build:>10.3f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--cards', type=int, default=5000)
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+    main(args.cards, args.queries)
@@ -0,0 +1,141 @@
+"""Benchmarks the query_travel_data query engine on a large travel database.
+
+A synthetic database with the schema of travel_agency.db and `--rows`
+flights is built in a temporary directory. The queries the travel agents
+generate are then run:
+
+  per-call:  a new connection per query, every row fetched and JSON
+             encoded, the way query_travel_data used to run them.
+  engine:    QueryEngine with its cache disabled, concurrent calls.
+  cold:      QueryEngine starting with an empty cache.
+  warm:      the same calls again, served from the LRU cache.
+
+run (from samples/python/agents/a2a_mcp):
+  uv run python benchmarks/query_engine_benchmark.py --rows 1000000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from a2a_mcp.mcp.query_engine import QueryEngine
+
+
+AIRPORTS = ['SFO', 'LAX', 'JFK', 'LHR', 'CDG', 'NRT', 'FCO', 'BER', 'LIS']
+CARRIERS = ['UA', 'AA', 'DL', 'BA', 'AF', 'LH', 'JL']
+CLASSES = ['ECONOMY', 'BUSINESS', 'FIRST']
+
+
+def build_database(path: str, rows: int, seed: int = 0):
+    rng = random.Random(seed)
+    with sqlite3.connect(path) as connection:
+        connection.execute(
+            'CREATE TABLE flights ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+            'carrier TEXT NOT NULL, '
+            'flight_number INTEGER NOT NULL, '
+            'from_airport TEXT NOT NULL, '
+            'to_airport TEXT NOT NULL, '
+            'ticket_class TEXT NOT NULL, '
+            'price REAL NOT NULL)'
+        )
+        connection.executemany(
+            'INSERT INTO flights (carrier, flight_number, from_airport, '
+            'to_airport, ticket_class, price) VALUES (?, ?, ?, ?, ?, ?)',
+            (
+                (
+                    rng.choice(CARRIERS),
+                    rng.randint(1, 9999),
+                    *rng.sample(AIRPORTS, 2),
+                    rng.choice(CLASSES),
+                    round(rng.uniform(80, 4000), 2),
+                )
+                for _ in range(rows)
+            ),
+        )
+
+
+def agent_queries(count: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        origin, destination = rng.sample(AIRPORTS, 2)
+        if rng.random() < 0.8:
+            queries.append(
+                'SELECT carrier, flight_number, from_airport, to_airport, '
+                'ticket_class, price FROM flights '
+                f"WHERE from_airport = '{origin}' "
+                f"AND to_airport = '{destination}' "
+                f"AND ticket_class = '{rng.choice(CLASSES)}'"
+            )
+        else:
+            # A broad query, with a result far larger than a page.
+            queries.append(
+                f"SELECT * FROM flights WHERE from_airport = '{origin}'"
+            )
+    return queries
+
+
+def per_call(path: str, query: str) -> int:
+    with sqlite3.connect(path) as connection:
+        connection.row_factory = sqlite3.Row
+        rows = connection.execute(query).fetchall()
+        return len(json.dumps({'results': [dict(row) for row in rows]}))
+
+
+def report(name: str, queries: int, elapsed: float):
+    print(
+        f'{name:>9} {queries:>7} {elapsed:>9.2f} '
+        f'{elapsed / queries * 1000:>13.2f}'
+    )
+
+
+async def main(rows: int, queries: int, concurrency: int):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'travel.db')
+        began = time.perf_counter()
+        build_database(path, rows)
+        print(f'built {rows} flights in {time.perf_counter() - began:.1f}s')
+        sql = agent_queries(queries)
+        print(
+            f'{"mode":>9} {"queries":>7} {"total (s)":>9} {"per query (ms)":>13}'
+        )
+
+        began = time.perf_counter()
+        for query in sql:
+            per_call(path, query)
+        report('per-call', len(sql), time.perf_counter() - began)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(engine, query):
+            async with semaphore:
+                return await engine.query(query)
+
+        uncached = QueryEngine(path, pool_size=concurrency, cache_size=0)
+        engine = QueryEngine(path, pool_size=concurrency)
+        for name, runner in (
+            ('engine', uncached),
+            ('cold', engine),
+            ('warm', engine),
+        ):
+            began = time.perf_counter()
+            await asyncio.gather(*(run(runner, query) for query in sql))
+            report(name, len(sql), time.perf_counter() - began)
+        print(f'{"":>9} cache hits {engine.hits}, misses {engine.misses}')
+        uncached.close()
+        engine.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.queries, args.concurrency))
@@ -0,0 +1,142 @@
+"""Benchmarks routing planner tasks to agents through the MCP registry.
+
+The agent cards MCP server is started in process over SSE, with local
+hashing embeddings and a simulated embedding API latency. Synthetic
+planner tasks are then routed three ways:
+
+  per-call:  a new MCP session and a find_agent call per task, the way
+             WorkflowNode used to do it (on a sample of the tasks).
+  router:    AgentRouter, one session and an LRU of resolved tasks.
+  fallback:  AgentRouter with a timeout below the embedding latency, so
+             every task is routed by the BM25 keyword index.
+
+run (from samples/python/agents/a2a_mcp):
+  uv run python benchmarks/router_benchmark.py --tasks 10000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+
+
+os.environ.setdefault('GOOGLE_API_KEY', 'unused')
+os.environ['AGENT_CARD_EMBEDDINGS'] = 'hashing'
+os.environ['AGENT_CARD_EMBEDDINGS_CACHE'] = ''
+
+from a2a_mcp.common.agent_router import AgentRouter  # noqa: E402
+from a2a_mcp.common.types import ServerConfig  # noqa: E402
+from a2a_mcp.mcp import client, server  # noqa: E402
+
+
+CITIES = ['Paris', 'London', 'Tokyo', 'New York', 'Rome', 'Berlin', 'Lisbon']
+TEMPLATES = [
+    'Book a flight from {a} to {b} on {day} June.',
+    'Book return tickets from {a} to {b}, leaving {day} June.',
+    'Reserve a hotel room in {b} from {day} June for 3 nights.',
+    'Find a hotel in {b} near the center, check in {day} June.',
+    'Rent a car in {b} from {day} June.',
+    'Book a rental car at the {b} airport for {day} June.',
+]
+
+
+def planner_tasks(count: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    return [
+        rng.choice(TEMPLATES).format(
+            a=rng.choice(CITIES), b=rng.choice(CITIES), day=rng.randint(1, 10)
+        )
+        for _ in range(count)
+    ]
+
+
+def start_server(port: int, latency: float):
+    embed = server.hashing_embeddings
+
+    def slow_embeddings(texts, task_type):
+        if task_type == 'retrieval_query':
+            time.sleep(latency)
+        return embed(texts, task_type)
+
+    server.hashing_embeddings = slow_embeddings
+    threading.Thread(
+        target=server.serve, args=('localhost', port, 'sse'), daemon=True
+    ).start()
+
+
+async def wait_for_server(config: ServerConfig):
+    for _ in range(100):
+        try:
+            async with client.init_session(
+                config.host, config.port, config.transport
+            ):
+                return
+        except Exception:
+            await asyncio.sleep(0.1)
+    raise RuntimeError('MCP server did not start')
+
+
+async def per_call(config: ServerConfig, tasks: list[str]):
+    for task in tasks:
+        async with client.init_session(
+            config.host, config.port, config.transport
+        ) as session:
+            result = await client.find_agent(session, task)
+            json.loads(result.content[0].text)
+
+
+async def routed(router: AgentRouter, tasks: list[str]):
+    for task in tasks:
+        await router.find_agent(task)
+
+
+async def measure(name: str, tasks: list[str], run) -> float:
+    began = time.perf_counter()
+    await run(tasks)
+    elapsed = time.perf_counter() - began
+    print(
+        f'{name:>10} {len(tasks):>7} {elapsed:>9.2f} '
+        f'{elapsed / len(tasks) * 1000:>12.3f}'
+    )
+    return elapsed
+
+
+async def main(task_count: int, sample: int, port: int, latency: float):
+    config = ServerConfig(
+        host='localhost',
+        port=port,
+        transport='sse',
+        url=f'http://localhost:{port}/sse',
+    )
+    start_server(port, latency)
+    await wait_for_server(config)
+    tasks = planner_tasks(task_count)
+    print(f'embedding latency {latency * 1000:.0f} ms')
+    print(f'{"mode":>10} {"tasks":>7} {"total (s)":>9} {"per task (ms)":>12}')
+    await measure('per-call', tasks[:sample], lambda t: per_call(config, t))
+
+    router = AgentRouter(config, timeout=10)
+    await measure('router', tasks, lambda t: routed(router, t))
+    print(
+        f'{"":>10} hits {router.hits}, misses {router.misses}, '
+        f'hit rate {router.hits / len(tasks):.1%}'
+    )
+    await router.close()
+
+    router = AgentRouter(config, cache_size=0, timeout=latency / 10)
+    await measure('fallback', tasks[:sample], lambda t: routed(router, t))
+    print(f'{"":>10} fallbacks {router.fallbacks}')
+    await router.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tasks', type=int, default=10000)
+    parser.add_argument('--sample', type=int, default=200)
+    parser.add_argument('--port', type=int, default=10199)
+    parser.add_argument('--latency', type=float, default=0.1)
+    args = parser.parse_args()
+    asyncio.run(main(args.tasks, args.sample, args.port, args.latency))
@@ -0,0 +1,125 @@
+"""Benchmarks task writes to the in-memory and SQLite task stores.
+
+Runs --tasks concurrent tasks that each save --updates status updates, the
+way a streaming agent saves its task after every event, against:
+
+  in-memory:      InMemoryTaskStore, the default store of the servers.
+  sqlite (sync):  SqliteTaskStore flushed after every save, one commit per
+                  update, as a write-through store would do.
+  sqlite:         SqliteTaskStore with its write-behind batches, which
+                  coalesce the updates of a task saved again before its
+                  batch is written.
+
+Writes per second count the saves, up to the moment they are all committed.
+
+run (from samples/python/agents/a2a_mcp):
+  uv run python benchmarks/task_store_benchmark.py --tasks 200 --updates 20
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+
+from pathlib import Path
+from uuid import uuid4
+
+from a2a.server.tasks import InMemoryTaskStore, TaskStore
+from a2a.types import (
+    Artifact,
+    Message,
+    Part,
+    Role,
+    Task,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+from a2a_mcp.common.task_store import SqliteTaskStore
+
+
+def status(state: TaskState, text: str) -> TaskStatus:
+    return TaskStatus(
+        state=state,
+        message=Message(
+            role=Role.agent,
+            message_id=str(uuid4()),
+            parts=[Part(root=TextPart(text=text))],
+        ),
+    )
+
+
+async def run_task(
+    store: TaskStore, updates: int, interval: float, sync: bool
+) -> None:
+    task = Task(
+        id=str(uuid4()),
+        context_id=str(uuid4()),
+        status=status(TaskState.submitted, 'Submitted'),
+    )
+    for update in range(updates):
+        state = TaskState.working if update < updates - 1 else None
+        if state is None:
+            task.artifacts = [
+                Artifact(
+                    artifact_id=str(uuid4()),
+                    parts=[Part(root=TextPart(text='Booked. ' * 20))],
+                )
+            ]
+            state = TaskState.completed
+        task.status = status(state, f'Step {update + 1} of {updates}')
+        await store.save(task)
+        if sync:
+            await store.flush()
+        await asyncio.sleep(interval)
+
+
+async def measure(
+    name: str, store: TaskStore, args: argparse.Namespace, sync: bool = False
+) -> None:
+    began = time.perf_counter()
+    await asyncio.gather(
+        *(
+            run_task(store, args.updates, args.interval_ms / 1000, sync)
+            for _ in range(args.tasks)
+        )
+    )
+    if isinstance(store, SqliteTaskStore):
+        await store.close()
+    elapsed = time.perf_counter() - began
+    saves = args.tasks * args.updates
+    line = f'{name:>13} {saves:>7} {elapsed:>9.2f} {saves / elapsed:>11,.0f}'
+    if isinstance(store, SqliteTaskStore):
+        line += f' {store.stats["rows_written"]:>8} {store.stats["commits"]:>8}'
+    print(line)
+
+
+async def main(args: argparse.Namespace) -> None:
+    print(
+        f'{"store":>13} {"saves":>7} {"time (s)":>9} {"writes/s":>11}'
+        f' {"rows":>8} {"commits":>8}'
+    )
+    await measure('in-memory', InMemoryTaskStore(), args)
+    with tempfile.TemporaryDirectory() as directory:
+        store = SqliteTaskStore(str(Path(directory) / 'sync.db'))
+        await measure('sqlite (sync)', store, args, sync=True)
+        store = SqliteTaskStore(
+            str(Path(directory) / 'tasks.db'),
+            flush_interval=args.flush_ms / 1000,
+        )
+        await measure('sqlite', store, args)
+        print(f'\nsqlite stats: {store.stats}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tasks', type=int, default=200)
+    parser.add_argument('--updates', type=int, default=20)
+    parser.add_argument(
+        '--interval-ms',
+        type=float,
+        default=0,
+        help='Time between the status updates of a task.',
+    )
+    parser.add_argument('--flush-ms', type=float, default=50)
+    asyncio.run(main(parser.parse_args()))
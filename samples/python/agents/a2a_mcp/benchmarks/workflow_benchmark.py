@@ -0,0 +1,126 @@
+"""Benchmarks running a planned workflow graph one node at a time and as a DAG.
+
+The graph mirrors the travel example: a planner followed by independent
+booking tasks, plus tasks that depend on some of them. Nodes are simulated
+agents that stream a few status updates over a random run time, so no
+agent or MCP server is needed.
+
+run (from samples/python/agents/a2a_mcp):
+  uv run python benchmarks/workflow_benchmark.py --tasks 6
+"""
+
+import argparse
+import asyncio
+import random
+
+from uuid import uuid4
+
+from a2a.types import (
+    Message,
+    Part,
+    Role,
+    SendStreamingMessageResponse,
+    SendStreamingMessageSuccessResponse,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+from a2a_mcp.common.agent_router import AgentRouter
+from a2a_mcp.common.types import ServerConfig
+from a2a_mcp.common.workflow import WorkflowGraph, WorkflowNode
+
+
+class SimulatedNode(WorkflowNode):
+    """A workflow node whose agent streams status updates for a while."""
+
+    def __init__(self, task: str, run_time: float, updates: int = 5):
+        # The router is never used, the agent is simulated.
+        config = ServerConfig(host='localhost', port=0, transport='sse', url='')
+        super().__init__(task=task, router=AgentRouter(config))
+        self.run_time = run_time
+        self.updates = updates
+
+    async def run_node(self, query: str, task_id: str, context_id: str):
+        for i in range(self.updates):
+            await asyncio.sleep(self.run_time / self.updates)
+            state = (
+                TaskState.completed
+                if i == self.updates - 1
+                else TaskState.working
+            )
+            yield status_update(f'{self.task} {i}', state, task_id, context_id)
+
+
+def status_update(
+    text: str, state: TaskState, task_id: str, context_id: str
+) -> SendStreamingMessageResponse:
+    message = Message(
+        role=Role.agent,
+        parts=[Part(root=TextPart(text=text))],
+        message_id=uuid4().hex,
+    )
+    return SendStreamingMessageResponse(
+        root=SendStreamingMessageSuccessResponse(
+            id=uuid4().hex,
+            result=TaskStatusUpdateEvent(
+                task_id=task_id,
+                context_id=context_id,
+                status=TaskStatus(state=state, message=message),
+                final=state == TaskState.completed,
+            ),
+        )
+    )
+
+
+def build_graph(
+    tasks: int, dependent: int, max_concurrency: int, seed: int
+) -> WorkflowGraph:
+    rng = random.Random(seed)
+    graph = WorkflowGraph(max_concurrency=max_concurrency)
+    planner = SimulatedNode('plan', run_time=0.2)
+    graph.add_node(planner)
+    independent = []
+    for i in range(tasks):
+        node = SimulatedNode(f'book {i}', run_time=rng.uniform(0.2, 0.6))
+        graph.add_node(node)
+        graph.add_edge(planner.id, node.id)
+        independent.append(node)
+    for i in range(dependent):
+        node = SimulatedNode(f'confirm {i}', run_time=rng.uniform(0.1, 0.3))
+        graph.add_node(node)
+        for parent in rng.sample(independent, 2):
+            graph.add_edge(parent.id, node.id)
+    for node_id in graph.nodes:
+        graph.set_node_attributes(
+            node_id, {'query': 'query', 'task_id': 't', 'context_id': 'c'}
+        )
+    return graph
+
+
+async def main(tasks: int, dependent: int, max_concurrency: int, seed: int):
+    print(f'{tasks} independent tasks, {dependent} dependent tasks')
+    print(
+        f'{"concurrency":>11} {"chunks":>6} {"wall (s)":>8} '
+        f'{"serial (s)":>10} {"critical path (s)":>17}'
+    )
+    for concurrency in (1, max_concurrency):
+        graph = build_graph(tasks, dependent, concurrency, seed)
+        chunks = [chunk async for chunk in graph.run_workflow()]
+        stats = graph.last_run
+        print(
+            f'{concurrency:>11} {len(chunks):>6} {stats.wall_time:>8.2f} '
+            f'{stats.serial_time:>10.2f} {stats.critical_path_time:>17.2f}'
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tasks', type=int, default=6)
+    parser.add_argument('--dependent', type=int, default=2)
+    parser.add_argument('--max-concurrency', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    asyncio.run(
+        main(args.tasks, args.dependent, args.max_concurrency, args.seed)
+    )
@@ -12,14 +12,11 @@ import uvicorn
 
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import (
-    BasePushNotificationSender,
-    InMemoryPushNotificationConfigStore,
-    InMemoryTaskStore,
-)
+from a2a.server.tasks import BasePushNotificationSender
 from a2a.types import AgentCard
 from a2a_mcp.common import prompts
 from a2a_mcp.common.agent_executor import GenericAgentExecutor
+from a2a_mcp.common.task_store import SqliteTaskStore, create_task_stores
 from adk_travel_agent import TravelAgent
 from langgraph_planner_agent import LangGraphPlannerAgent
 from orchestrator_agent import OrchestratorAgent
@@ -62,7 +59,13 @@ def get_agent(agent_card: AgentCard):
 @click.option('--host', 'host', default='localhost')
 @click.option('--port', 'port', default=10101)
 @click.option('--agent-card', 'agent_card')
-def main(host, port, agent_card):
+@click.option(
+    '--task-db',
+    'task_db',
+    envvar='A2A_TASK_DB',
+    help='SQLite database keeping the tasks across restarts.',
+)
+def main(host, port, agent_card, task_db):
     """Starts an Agent server."""
     try:
         if not agent_card:
@@ -72,14 +75,14 @@ def main(host, port, agent_card):
         agent_card = AgentCard(**data)
 
         client = httpx.AsyncClient()
-        push_notification_config_store = InMemoryPushNotificationConfigStore()
+        task_store, push_notification_config_store = create_task_stores(task_db)
         push_notification_sender = BasePushNotificationSender(
             client, config_store=push_notification_config_store
         )
 
         request_handler = DefaultRequestHandler(
             agent_executor=GenericAgentExecutor(agent=get_agent(agent_card)),
-            task_store=InMemoryTaskStore(),
+            task_store=task_store,
             push_config_store=push_notification_config_store,
             push_sender=push_notification_sender,
         )
@@ -90,7 +93,10 @@ def main(host, port, agent_card):
 
         logger.info(f'Starting server on {host}:{port}')
 
-        uvicorn.run(server.build(), host=host, port=port)
+        app = server.build()
+        if isinstance(task_store, SqliteTaskStore):
+            app.add_event_handler('shutdown', task_store.close)
+        uvicorn.run(app, host=host, port=port)
     except FileNotFoundError:
         logger.error(f"Error: File '{agent_card}' not found.")
         sys.exit(1)
@@ -1,60 +1,98 @@
+import asyncio
 import json
 import logging
 
-from collections.abc import AsyncIterable
+from collections.abc import AsyncIterable, AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 
 from a2a.types import (
+    Artifact,
     SendStreamingMessageSuccessResponse,
     TaskArtifactUpdateEvent,
     TaskState,
     TaskStatusUpdateEvent,
 )
 from a2a_mcp.common import prompts
+from a2a_mcp.common.agent_router import AgentRouter
 from a2a_mcp.common.base_agent import BaseAgent
+from a2a_mcp.common.client_registry import AgentClientRegistry
 from a2a_mcp.common.utils import init_api_key
 from a2a_mcp.common.workflow import Status, WorkflowGraph, WorkflowNode
+from a2a_mcp.common.workflow_store import WorkflowStore, get_workflow_store
 from google import genai
 
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class WorkflowSession:
+    """The workflow state of one conversation."""
+
+    context_id: str
+    graph: WorkflowGraph | None = None
+    results: list[Artifact] = field(default_factory=list)
+    travel_context: dict = field(default_factory=dict)
+    query_history: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, any]:
+        return {
+            'graph': self.graph.to_dict() if self.graph else None,
+            'results': [
+                result.model_dump(mode='json', exclude_none=True)
+                for result in self.results
+            ],
+            'travel_context': self.travel_context,
+            'query_history': self.query_history,
+        }
+
+
 class OrchestratorAgent(BaseAgent):
-    """Orchestrator Agent."""
+    """Orchestrator Agent.
+
+    Serves many conversations at once: the workflow of each context is
+    kept in a WorkflowStore and checkpointed after every node, while the
+    requests of one context are handled one at a time.
+    """
 
-    def __init__(self):
+    def __init__(self, store: WorkflowStore | None = None):
         init_api_key()
         super().__init__(
             agent_name='Orchestrator Agent',
             description='Facilitate inter agent communication',
             content_types=['text', 'text/plain'],
         )
-        self.graph = None
-        self.results = []
-        self.travel_context = {}
-        self.query_history = []
-        self.context_id = None
+        self.store = store or get_workflow_store()
+        # context id -> (lock, number of requests holding or waiting for it)
+        self._context_locks: dict[str, tuple[asyncio.Lock, int]] = {}
+        # Shared by every workflow node, keeps one MCP session open.
+        self.router = AgentRouter()
+        # Shared by every workflow node, reuses connections to each agent.
+        self.clients = AgentClientRegistry()
 
-    async def generate_summary(self) -> str:
+    async def generate_summary(self, results: list[Artifact]) -> str:
         client = genai.Client()
         response = client.models.generate_content(
             model='gemini-2.0-flash',
             contents=prompts.SUMMARY_COT_INSTRUCTIONS.replace(
-                '{travel_data}', str(self.results)
+                '{travel_data}', str(results)
             ),
             config={'temperature': 0.0},
         )
         return response.text
 
-    def answer_user_question(self, question) -> str:
+    def answer_user_question(
+        self, question: str, session: WorkflowSession
+    ) -> str:
         try:
             client = genai.Client()
             response = client.models.generate_content(
                 model='gemini-2.0-flash',
                 contents=prompts.QA_COT_PROMPT.replace(
-                    '{TRIP_CONTEXT}', str(self.travel_context)
+                    '{TRIP_CONTEXT}', str(session.travel_context)
                 )
-                .replace('{CONVERSATION_HISTORY}', str(self.query_history))
+                .replace('{CONVERSATION_HISTORY}', str(session.query_history))
                 .replace('{TRIP_QUESTION}', question),
                 config={
                     'temperature': 0.0,
@@ -67,7 +105,12 @@ class OrchestratorAgent(BaseAgent):
         return '{"can_answer": "no", "answer": "Cannot answer based on provided context"}'
 
     def set_node_attributes(
-        self, node_id, task_id=None, context_id=None, query=None
+        self,
+        graph: WorkflowGraph,
+        node_id,
+        task_id=None,
+        context_id=None,
+        query=None,
     ):
         attr_val = {}
         if task_id:
@@ -77,10 +120,11 @@ class OrchestratorAgent(BaseAgent):
         if query:
             attr_val['query'] = query
 
-        self.graph.set_node_attributes(node_id, attr_val)
+        graph.set_node_attributes(node_id, attr_val)
 
     def add_graph_node(
         self,
+        graph: WorkflowGraph,
         task_id,
         context_id,
         query: str,
@@ -90,19 +134,59 @@ class OrchestratorAgent(BaseAgent):
     ) -> WorkflowNode:
         """Add a node to the graph."""
         node = WorkflowNode(
-            task=query, node_key=node_key, node_label=node_label
+            task=query,
+            node_key=node_key,
+            node_label=node_label,
+            router=self.router,
+            clients=self.clients,
         )
-        self.graph.add_node(node)
+        graph.add_node(node)
         if node_id:
-            self.graph.add_edge(node_id, node.id)
-        self.set_node_attributes(node.id, task_id, context_id, query)
+            graph.add_edge(node_id, node.id)
+        self.set_node_attributes(graph, node.id, task_id, context_id, query)
         return node
 
-    def clear_state(self):
-        self.graph = None
-        self.results.clear()
-        self.travel_context.clear()
-        self.query_history.clear()
+    async def load_session(self, context_id: str) -> WorkflowSession:
+        """Returns the saved workflow of a context, or a new one."""
+        data = await self.store.get(context_id)
+        if not data:
+            return WorkflowSession(context_id=context_id)
+        logger.info(f'Resuming workflow of context {context_id}')
+        session = WorkflowSession(
+            context_id=context_id,
+            results=[Artifact.model_validate(r) for r in data['results']],
+            travel_context=data['travel_context'],
+            query_history=data['query_history'],
+        )
+        if data['graph']:
+            self.set_graph(
+                session,
+                WorkflowGraph.from_dict(
+                    data['graph'], router=self.router, clients=self.clients
+                ),
+            )
+        return session
+
+    def set_graph(self, session: WorkflowSession, graph: WorkflowGraph):
+        session.graph = graph
+        graph.on_node_done = lambda node: self.checkpoint(session)
+
+    async def checkpoint(self, session: WorkflowSession):
+        await self.store.save(session.context_id, session.to_dict())
+
+    @asynccontextmanager
+    async def _lock_context(self, context_id: str) -> AsyncIterator[None]:
+        lock, users = self._context_locks.get(context_id, (asyncio.Lock(), 0))
+        self._context_locks[context_id] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._context_locks[context_id]
+            if users == 1:
+                del self._context_locks[context_id]
+            else:
+                self._context_locks[context_id] = (lock, users - 1)
 
     async def stream(
         self, query, context_id, task_id
@@ -113,44 +197,59 @@ class OrchestratorAgent(BaseAgent):
         )
         if not query:
             raise ValueError('Query cannot be empty')
-        if self.context_id != context_id:
-            # Clear state when the context changes
-            self.clear_state()
-            self.context_id = context_id
+        async with self._lock_context(context_id):
+            session = await self.load_session(context_id)
+            async for item in self._stream(session, query, task_id):
+                yield item
 
-        self.query_history.append(query)
-        start_node_id = None
+    async def _stream(
+        self, session: WorkflowSession, query, task_id
+    ) -> AsyncIterable[dict[str, any]]:
+        context_id = session.context_id
+        session.query_history.append(query)
+        start_node_ids: list[str] = []
         # Graph does not exist, start a new graph with planner node.
-        if not self.graph:
-            self.graph = WorkflowGraph()
+        if not session.graph:
+            self.set_graph(session, WorkflowGraph())
             planner_node = self.add_graph_node(
+                session.graph,
                 task_id=task_id,
                 context_id=context_id,
                 query=query,
                 node_key='planner',
                 node_label='Planner',
             )
-            start_node_id = planner_node.id
+            start_node_ids = [planner_node.id]
         # Paused state is when the agent might need more information.
-        elif self.graph.state == Status.PAUSED:
-            start_node_id = self.graph.paused_node_id
-            self.set_node_attributes(node_id=start_node_id, query=query)
+        # The user was shown the question of every paused node, the reply
+        # goes to all of them.
+        elif session.graph.state == Status.PAUSED:
+            start_node_ids = list(session.graph.paused_node_ids)
+            for node_id in start_node_ids:
+                self.set_node_attributes(
+                    session.graph, node_id=node_id, query=query
+                )
+
+        await self.checkpoint(session)
 
         # This loop can be avoided if the workflow graph is dynamic or
         # is built from the results of the planner when the planner
         # iself is not a part of the graph.
         # TODO: Make the graph dynamically iterable over edges
         while True:
-            # Set attributes on the node so we propagate task and context
-            self.set_node_attributes(
-                node_id=start_node_id,
-                task_id=task_id,
-                context_id=context_id,
-            )
-            # Resume workflow, used when the workflow nodes are updated.
-            should_resume_workflow = False
-            async for chunk in self.graph.run_workflow(
-                start_node_id=start_node_id
+            # Set attributes on the nodes so we propagate task and context
+            for node_id in start_node_ids:
+                self.set_node_attributes(
+                    session.graph,
+                    node_id=node_id,
+                    task_id=task_id,
+                    context_id=context_id,
+                )
+            # Nodes to run again once this run is over: paused nodes the
+            # orchestrator answered, or the planner when it added nodes.
+            resume_node_ids: list[str] = []
+            async for chunk in session.graph.run_workflow(
+                start_node_ids=start_node_ids
             ):
                 if isinstance(chunk.root, SendStreamingMessageSuccessResponse):
                     # The graph node retured TaskStatusUpdateEvent
@@ -165,61 +264,87 @@ class OrchestratorAgent(BaseAgent):
                         ):
                             ## yeild??
                             continue
+                        # Only a question with a context pauses its node.
                         if (
                             task_status_event.status.state
                             == TaskState.input_required
+                            and context_id
                         ):
                             question = task_status_event.status.message.parts[
                                 0
                             ].root.text
+                            # The node that asked paused last.
+                            paused_node_id = list(
+                                session.graph.paused_node_ids
+                            )[-1]
 
                             try:
                                 answer = json.loads(
-                                    self.answer_user_question(question)
+                                    self.answer_user_question(question, session)
                                 )
                                 logger.info(f'Agent Answer {answer}')
                                 if answer['can_answer'] == 'yes':
                                     # Orchestrator can answer on behalf of the user set the query
-                                    # Resume workflow from paused state.
-                                    query = answer['answer']
-                                    start_node_id = self.graph.paused_node_id
+                                    # Resume the node from paused state.
                                     self.set_node_attributes(
-                                        node_id=start_node_id, query=query
+                                        session.graph,
+                                        node_id=paused_node_id,
+                                        query=answer['answer'],
                                     )
-                                    should_resume_workflow = True
+                                    resume_node_ids.append(paused_node_id)
+                                    continue
                             except Exception:
                                 logger.info('Cannot convert answer data')
+                            # The user has to answer, always show the
+                            # question.
+                            yield chunk
+                            continue
 
                     # The graph node retured TaskArtifactUpdateEvent
                     # Store the node and continue.
                     if isinstance(chunk.root.result, TaskArtifactUpdateEvent):
                         artifact = chunk.root.result.artifact
-                        self.results.append(artifact)
+                        session.results.append(artifact)
                         if artifact.name == 'PlannerAgent-result':
                             # Planning agent returned data, update graph.
                             artifact_data = artifact.parts[0].root.data
                             if 'trip_info' in artifact_data:
-                                self.travel_context = artifact_data['trip_info']
+                                session.travel_context = artifact_data[
+                                    'trip_info'
+                                ]
                             logger.info(
                                 f'Updating workflow with {len(artifact_data["tasks"])} task nodes'
                             )
-                            # Define the edges
-                            current_node_id = start_node_id
-                            for idx, task_data in enumerate(
-                                artifact_data['tasks']
-                            ):
+                            # Define the edges, tasks without dependencies
+                            # follow the planner and run concurrently.
+                            planner_node_id = next(
+                                node.id
+                                for node in session.graph.nodes.values()
+                                if node.node_key == 'planner'
+                            )
+                            task_nodes = {}
+                            added_nodes = []
+                            for task_data in artifact_data['tasks']:
                                 node = self.add_graph_node(
+                                    session.graph,
                                     task_id=task_id,
                                     context_id=context_id,
                                     query=task_data['description'],
-                                    node_id=current_node_id,
                                 )
-                                current_node_id = node.id
-                                # Restart graph from the newly inserted subgraph state
-                                # Start from the new node just created.
-                                if idx == 0:
-                                    should_resume_workflow = True
-                                    start_node_id = node.id
+                                task_nodes[task_data.get('id')] = node.id
+                                added_nodes.append((task_data, node.id))
+                            for task_data, node_id in added_nodes:
+                                dependencies = task_data.get('depends_on') or []
+                                parents = [
+                                    task_nodes[d]
+                                    for d in dependencies
+                                    if d in task_nodes
+                                ] or [planner_node_id]
+                                for parent in parents:
+                                    session.graph.add_edge(parent, node_id)
+                            # Restart graph from the planner, which is
+                            # complete by then, so its new subgraph runs.
+                            resume_node_ids.append(planner_node_id)
                         else:
                             # Not planner but artifacts from other tasks,
                             # continue to the next node in the workflow.
@@ -227,12 +352,12 @@ class OrchestratorAgent(BaseAgent):
                             # a summary is shown at the end of the workflow.
                             continue
                 # When the workflow needs to be resumed, do not yield partial.
-                if not should_resume_workflow:
+                if not resume_node_ids:
                     logger.info('No workflow resume detected, yielding chunk')
                     # Yield partial execution
                     yield chunk
             # The graph is complete and no updates, so okay to break from the loop.
-            if not should_resume_workflow:
+            if not resume_node_ids:
                 logger.info(
                     'Workflow iteration complete and no restart requested. Exiting main loop.'
                 )
@@ -240,11 +365,14 @@ class OrchestratorAgent(BaseAgent):
             else:
                 # Readable logs
                 logger.info('Restarting workflow loop.')
-        if self.graph.state == Status.COMPLETED:
+                start_node_ids = resume_node_ids
+        if session.graph.state == Status.COMPLETED:
             # All individual actions complete, now generate the summary
-            logger.info(f'Generating summary for {len(self.results)} results')
-            summary = await self.generate_summary()
-            self.clear_state()
+            logger.info(
+                f'Generating summary for {len(session.results)} results'
+            )
+            summary = await self.generate_summary(session.results)
+            await self.store.delete(session.context_id)
             logger.info(f'Summary: {summary}')
             yield {
                 'response_type': 'text',
@@ -252,3 +380,5 @@ class OrchestratorAgent(BaseAgent):
                 'require_user_input': False,
                 'content': summary,
             }
+        else:
+            await self.checkpoint(session)
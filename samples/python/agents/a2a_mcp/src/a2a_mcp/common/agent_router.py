@@ -0,0 +1,251 @@
+import asyncio
+import json
+import logging
+import math
+import os
+import re
+
+from collections import Counter, OrderedDict
+
+from a2a.types import AgentCard
+from a2a_mcp.common.types import ServerConfig
+from a2a_mcp.common.utils import get_mcp_server_config
+from a2a_mcp.mcp import client
+from mcp import ClientSession
+
+
+logger = logging.getLogger(__name__)
+
+PLANNER_CARD_URI = 'resource://agent_cards/planner_agent'
+
+
+def tokenize(text: str) -> list[str]:
+    return re.findall(r'\w+', text.lower())
+
+
+def normalize_task(task: str) -> str:
+    """Normalizes task text so trivially different phrasings share a key."""
+    return ' '.join(tokenize(task))
+
+
+def card_text(card: AgentCard) -> str:
+    """Returns the text of a card that describes what the agent does."""
+    texts = [card.name, card.description]
+    for skill in card.skills:
+        texts.extend([skill.name, skill.description, *(skill.tags or [])])
+        texts.extend(skill.examples or [])
+    return ' '.join(texts)
+
+
+class BM25Index:
+    """Okapi BM25 keyword index over agent cards.
+
+    Used to route a task when the embedding search of the MCP server is
+    slow or unavailable.
+    """
+
+    def __init__(
+        self, cards: list[AgentCard], k1: float = 1.5, b: float = 0.75
+    ):
+        self.cards = cards
+        self._k1 = k1
+        self._b = b
+        self._term_counts = [Counter(tokenize(card_text(c))) for c in cards]
+        self._lengths = [sum(tc.values()) for tc in self._term_counts]
+        self._average_length = (
+            sum(self._lengths) / len(self._lengths) if cards else 0
+        )
+        document_frequency = Counter(
+            term for tc in self._term_counts for term in tc
+        )
+        self._idf = {
+            term: math.log(1 + (len(cards) - df + 0.5) / (df + 0.5))
+            for term, df in document_frequency.items()
+        }
+
+    def search(self, query: str) -> AgentCard | None:
+        """Returns the best matching card, or None if no term matches."""
+        terms = [t for t in set(tokenize(query)) if t in self._idf]
+        best, best_score = None, 0.0
+        for card, term_counts, length in zip(
+            self.cards, self._term_counts, self._lengths, strict=True
+        ):
+            norm = self._k1 * (
+                1 - self._b + self._b * length / self._average_length
+            )
+            score = sum(
+                self._idf[term] * tf * (self._k1 + 1) / (tf + norm)
+                for term in terms
+                if (tf := term_counts.get(term, 0))
+            )
+            if score > best_score:
+                best, best_score = card, score
+        return best
+
+
+class AgentRouter:
+    """Resolves the agent card of workflow tasks through the MCP registry.
+
+    One MCP session is opened on first use and kept for the lifetime of the
+    router, instead of one session per lookup. Resolved cards are memoized
+    in an LRU keyed by the normalized task text. If the server's
+    `find_agent` fails or does not answer within `timeout` seconds, the
+    task is routed with a BM25 index over the skills and tags of the
+    registered cards instead; those answers are not memoized. The index is
+    built in the background once the first session is open, so it is
+    ready before the server has a chance to hang.
+    """
+
+    def __init__(
+        self,
+        config: ServerConfig | None = None,
+        cache_size: int | None = None,
+        timeout: float | None = None,
+    ):
+        self._config = config or get_mcp_server_config()
+        self._cache_size = (
+            cache_size
+            if cache_size is not None
+            else int(os.getenv('A2A_MCP_ROUTER_CACHE_SIZE', '1024'))
+        )
+        self._timeout = (
+            timeout
+            if timeout is not None
+            else float(os.getenv('A2A_MCP_ROUTER_TIMEOUT', '5'))
+        )
+        self._cache: OrderedDict[str, AgentCard] = OrderedDict()
+        self._planner_card: AgentCard | None = None
+        self._lexical_index: BM25Index | None = None
+        self._lexical_index_task: asyncio.Task | None = None
+        self._session: asyncio.Future[ClientSession] | None = None
+        self._session_task: asyncio.Task | None = None
+        self._closed = asyncio.Event()
+        self.hits = 0
+        self.misses = 0
+        self.fallbacks = 0
+
+    async def get_planner_card(self) -> AgentCard:
+        if self._planner_card is None:
+            self._planner_card = await self._read_card(PLANNER_CARD_URI)
+        return self._planner_card
+
+    async def find_agent(self, task: str) -> AgentCard:
+        """Returns the card of the agent best suited to the task."""
+        key = normalize_task(task)
+        card = self._cache.get(key)
+        if card is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return card
+        self.misses += 1
+        try:
+            card = await asyncio.wait_for(
+                self._find_agent_remote(task), self._timeout
+            )
+        except Exception as e:
+            logger.warning(
+                f'find_agent failed ({e!r}), routing {task} by keyword'
+            )
+            card = await self._find_agent_lexical(task)
+            if card is None:
+                raise
+            self.fallbacks += 1
+            return card
+        self._cache[key] = card
+        if self._cache_size and len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return card
+
+    async def close(self):
+        """Closes the MCP session."""
+        if self._lexical_index_task and not self._lexical_index_task.done():
+            # It would open the session again.
+            self._lexical_index_task.cancel()
+        self._closed.set()
+        if self._session_task:
+            await self._session_task
+            self._session_task = None
+
+    async def _find_agent_remote(self, task: str) -> AgentCard:
+        session = await self._get_session()
+        result = await client.find_agent(session, task)
+        return AgentCard(**json.loads(result.content[0].text))
+
+    async def _find_agent_lexical(self, task: str) -> AgentCard | None:
+        if self._lexical_index is None:
+            # Built over the same session, which may be what is hung.
+            try:
+                await asyncio.wait_for(
+                    asyncio.shield(self._build_lexical_index()), self._timeout
+                )
+            except TimeoutError:
+                logger.warning('Timed out indexing the agent cards')
+        if self._lexical_index is None:
+            return None
+        return self._lexical_index.search(task)
+
+    def _build_lexical_index(self) -> asyncio.Task:
+        """Starts indexing the agent cards, unless already started."""
+        if self._lexical_index_task is None or (
+            self._lexical_index_task.done() and self._lexical_index is None
+        ):
+            self._lexical_index_task = asyncio.create_task(
+                self._index_agent_cards()
+            )
+        return self._lexical_index_task
+
+    async def _index_agent_cards(self):
+        try:
+            session = await self._get_session()
+            response = await session.read_resource(
+                'resource://agent_cards/list'
+            )
+            uris = json.loads(response.contents[0].text)['agent_cards']
+            cards = await asyncio.gather(
+                *(
+                    self._read_card(uri)
+                    for uri in uris
+                    if uri != PLANNER_CARD_URI
+                )
+            )
+            self._lexical_index = BM25Index(cards)
+        except Exception as e:
+            logger.warning(f'Could not index the agent cards: {e}')
+
+    async def _read_card(self, uri: str) -> AgentCard:
+        session = await self._get_session()
+        response = await client.find_resource(session, uri)
+        data = json.loads(response.contents[0].text)
+        return AgentCard(**data['agent_card'][0])
+
+    async def _get_session(self) -> ClientSession:
+        if self._session is None or (
+            self._session.done() and self._session.exception()
+        ):
+            self._closed.clear()
+            self._session = asyncio.get_running_loop().create_future()
+            self._session_task = asyncio.create_task(
+                self._run_session(self._session)
+            )
+        return await asyncio.shield(self._session)
+
+    async def _run_session(self, session: asyncio.Future[ClientSession]):
+        # The session is entered and exited in this one task, as the
+        # transport's task group requires.
+        try:
+            async with client.init_session(
+                self._config.host, self._config.port, self._config.transport
+            ) as opened:
+                session.set_result(opened)
+                if self._lexical_index is None:
+                    self._build_lexical_index()
+                await self._closed.wait()
+        except Exception as e:
+            logger.error(f'MCP session closed: {e}')
+            if not session.done():
+                session.set_exception(e)
+        finally:
+            if self._session is session and not session.done():
+                session.cancel()
+            if self._session is session:
+                self._session = None
@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import os
+import time
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+import httpx
+
+from a2a.client import A2AClient
+from a2a.types import AgentCard
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _AgentConnection:
+    http_client: httpx.AsyncClient
+    client: A2AClient
+    card: AgentCard
+    slots: asyncio.Semaphore
+    # Callers holding or waiting for a slot, the connection is not evicted
+    # while any is left.
+    in_use: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class AgentClientRegistry:
+    """A2A clients of the task agents, keyed by agent URL.
+
+    Each agent gets one httpx client whose keep-alive connections are reused
+    by every workflow node that calls the agent, across resumed workflows,
+    instead of a client and a new connection per node. At most
+    `max_concurrency` requests are sent to an agent at a time, the others
+    wait for a slot. Agents not called for `idle_timeout` seconds have
+    their client closed.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int | None = None,
+        idle_timeout: float | None = None,
+    ):
+        self._max_concurrency = max_concurrency or int(
+            os.getenv('A2A_MCP_AGENT_MAX_CONCURRENCY', '4')
+        )
+        self._idle_timeout = (
+            idle_timeout
+            if idle_timeout is not None
+            else float(os.getenv('A2A_MCP_AGENT_IDLE_TIMEOUT', '300'))
+        )
+        self._connections: dict[str, _AgentConnection] = {}
+        self.opened = 0
+        self.reused = 0
+        self.evicted = 0
+
+    @asynccontextmanager
+    async def client(self, agent_card: AgentCard) -> AsyncIterator[A2AClient]:
+        """Yields the agent's A2A client once one of its slots is free."""
+        await self._evict_idle()
+        url = agent_card.url.rstrip('/')
+        connection = self._connections.get(url)
+        if connection is None:
+            connection = self._open(agent_card)
+            self._connections[url] = connection
+            self.opened += 1
+        else:
+            self.reused += 1
+            if connection.card != agent_card:
+                # Same endpoint, updated card.
+                connection.client = A2AClient(
+                    connection.http_client, agent_card
+                )
+                connection.card = agent_card
+        connection.in_use += 1
+        try:
+            async with connection.slots:
+                yield connection.client
+        finally:
+            connection.in_use -= 1
+            connection.last_used = time.monotonic()
+
+    async def close(self):
+        """Closes the clients of every agent."""
+        connections = list(self._connections.values())
+        self._connections.clear()
+        for connection in connections:
+            await connection.http_client.aclose()
+
+    def _open(self, agent_card: AgentCard) -> _AgentConnection:
+        logger.info(f'Opening A2A client for {agent_card.url}')
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self._max_concurrency,
+                max_keepalive_connections=self._max_concurrency,
+                keepalive_expiry=self._idle_timeout or None,
+            )
+        )
+        return _AgentConnection(
+            http_client=http_client,
+            client=A2AClient(http_client, agent_card),
+            card=agent_card,
+            slots=asyncio.Semaphore(self._max_concurrency),
+        )
+
+    async def _evict_idle(self):
+        if not self._idle_timeout:
+            return
+        now = time.monotonic()
+        idle = [
+            url
+            for url, connection in self._connections.items()
+            if not connection.in_use
+            and now - connection.last_used > self._idle_timeout
+        ]
+        for url in idle:
+            logger.info(f'Closing idle A2A client for {url}')
+            connection = self._connections.pop(url)
+            self.evicted += 1
+            await connection.http_client.aclose()
@@ -0,0 +1,301 @@
+import asyncio
+import logging
+import sqlite3
+import time
+
+from contextlib import closing
+
+from a2a.server.context import ServerCallContext
+from a2a.server.tasks import (
+    InMemoryPushNotificationConfigStore,
+    InMemoryTaskStore,
+    PushNotificationConfigStore,
+    TaskStore,
+)
+from a2a.types import PushNotificationConfig, Task, TaskState
+
+
+logger = logging.getLogger(__name__)
+
+# Tasks in these states are not updated any more and can be compacted.
+TERMINAL_STATES = (
+    TaskState.completed.value,
+    TaskState.canceled.value,
+    TaskState.failed.value,
+    TaskState.rejected.value,
+)
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    connection = sqlite3.connect(path, timeout=30)
+    # Safe with WAL: a crash may lose the last commits, never corrupts.
+    connection.execute('PRAGMA synchronous=NORMAL')
+    return connection
+
+
+def _create_schema(path: str) -> None:
+    with closing(_connect(path)) as connection, connection:
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS a2a_task ('
+            'id TEXT PRIMARY KEY, '
+            'context_id TEXT, '
+            'state TEXT NOT NULL, '
+            'data TEXT NOT NULL, '
+            'updated_at REAL NOT NULL)'
+        )
+        connection.execute(
+            'CREATE INDEX IF NOT EXISTS a2a_task_state '
+            'ON a2a_task (state, updated_at)'
+        )
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS a2a_push_config ('
+            'task_id TEXT NOT NULL, '
+            'config_id TEXT NOT NULL, '
+            'data TEXT NOT NULL, '
+            'PRIMARY KEY (task_id, config_id))'
+        )
+
+
+# A task waiting to be written: its JSON, state, context id and update
+# time, or None for a deletion.
+_Pending = tuple[str, str, str | None, float] | None
+
+
+class SqliteTaskStore(TaskStore):
+    """Keeps A2A tasks in a SQLite database, in WAL mode.
+
+    Saves are written behind: `save` records the task and a background
+    task commits the recorded tasks in batches, `flush_interval` seconds
+    after the first of them. A task saved again before its batch is written
+    is written once, in its last state, so the status updates of a busy
+    task cost one row write per batch. `get` sees the tasks not written
+    yet. A crash loses at most the last `flush_interval` seconds of saves;
+    `close` writes them on shutdown.
+
+    Tasks in a terminal state are deleted `completed_ttl` seconds after
+    their last update, checked every `compact_interval` seconds, together
+    with their push notification configs.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        flush_interval: float = 0.05,
+        completed_ttl: float = 24 * 3600,
+        compact_interval: float = 300,
+    ):
+        self._path = path
+        self.flush_interval = flush_interval
+        self.completed_ttl = completed_ttl
+        self.compact_interval = compact_interval
+        _create_schema(path)
+        self._pending: dict[str, _Pending] = {}
+        # The batch being written, still visible to get().
+        self._writing: dict[str, _Pending] = {}
+        self._flush_lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._flusher: asyncio.Task | None = None
+        self._last_compaction = time.monotonic()
+        self.stats = {
+            'saves': 0,
+            'coalesced': 0,
+            'rows_written': 0,
+            'commits': 0,
+            'compacted': 0,
+        }
+
+    async def save(
+        self, task: Task, context: ServerCallContext | None = None
+    ) -> None:
+        if self._pending.get(task.id) is not None:
+            self.stats['coalesced'] += 1
+        self._pending[task.id] = (
+            task.model_dump_json(exclude_none=True),
+            task.status.state.value,
+            task.context_id,
+            time.time(),
+        )
+        self.stats['saves'] += 1
+        self._schedule_flush()
+
+    async def get(
+        self, task_id: str, context: ServerCallContext | None = None
+    ) -> Task | None:
+        for batch in (self._pending, self._writing):
+            if task_id in batch:
+                entry = batch[task_id]
+                return Task.model_validate_json(entry[0]) if entry else None
+        row = await asyncio.to_thread(
+            self._fetchone, 'SELECT data FROM a2a_task WHERE id = ?', (task_id,)
+        )
+        return Task.model_validate_json(row[0]) if row else None
+
+    async def delete(
+        self, task_id: str, context: ServerCallContext | None = None
+    ) -> None:
+        self._pending[task_id] = None
+        self._schedule_flush()
+
+    async def flush(self) -> None:
+        """Writes the recorded saves and deletions in one transaction."""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, {}
+            self._writing = batch
+            try:
+                await asyncio.to_thread(self._write_batch, batch)
+            except BaseException:
+                # Record the batch again, unless saved again since.
+                for task_id, entry in batch.items():
+                    self._pending.setdefault(task_id, entry)
+                raise
+            finally:
+                self._writing = {}
+            self.stats['rows_written'] += len(batch)
+            self.stats['commits'] += 1
+
+    async def compact(self) -> int:
+        """Deletes the terminal tasks older than `completed_ttl`."""
+        self._last_compaction = time.monotonic()
+        deleted = await asyncio.to_thread(
+            self._delete_expired, time.time() - self.completed_ttl
+        )
+        if deleted:
+            logger.info(f'Compacted {deleted} finished tasks')
+        self.stats['compacted'] += deleted
+        return deleted
+
+    async def close(self) -> None:
+        """Stops the background writes and writes the recorded tasks."""
+        if self._flusher:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush()
+
+    def _schedule_flush(self) -> None:
+        self._wake.set()
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.get_running_loop().create_task(
+                self._flush_loop()
+            )
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await self._wake.wait()
+            # Let the saves of the next few milliseconds join the batch.
+            await asyncio.sleep(self.flush_interval)
+            self._wake.clear()
+            try:
+                await self.flush()
+                if (
+                    time.monotonic() - self._last_compaction
+                    >= self.compact_interval
+                ):
+                    await self.compact()
+            except sqlite3.Error:
+                logger.exception('Failed to write tasks, retrying')
+                await asyncio.sleep(1)
+                self._wake.set()
+
+    def _fetchone(self, query: str, params: tuple) -> tuple | None:
+        with closing(_connect(self._path)) as connection:
+            return connection.execute(query, params).fetchone()
+
+    def _write_batch(self, batch: dict[str, _Pending]) -> None:
+        saves = [
+            (task_id, context_id, state, data, updated_at)
+            for task_id, entry in batch.items()
+            if entry
+            for data, state, context_id, updated_at in (entry,)
+        ]
+        deletes = [(task_id,) for task_id, entry in batch.items() if not entry]
+        with closing(_connect(self._path)) as connection, connection:
+            connection.executemany(
+                'INSERT INTO a2a_task '
+                '(id, context_id, state, data, updated_at) '
+                'VALUES (?, ?, ?, ?, ?) ON CONFLICT (id) DO UPDATE SET '
+                'context_id = excluded.context_id, state = excluded.state, '
+                'data = excluded.data, updated_at = excluded.updated_at',
+                saves,
+            )
+            connection.executemany('DELETE FROM a2a_task WHERE id = ?', deletes)
+
+    def _delete_expired(self, cutoff: float) -> int:
+        states = ', '.join('?' * len(TERMINAL_STATES))
+        expired = f'state IN ({states}) AND updated_at < ?'
+        params = (*TERMINAL_STATES, cutoff)
+        with closing(_connect(self._path)) as connection, connection:
+            connection.execute(
+                'DELETE FROM a2a_push_config WHERE task_id IN '
+                f'(SELECT id FROM a2a_task WHERE {expired})',
+                params,
+            )
+            return connection.execute(
+                f'DELETE FROM a2a_task WHERE {expired}', params
+            ).rowcount
+
+
+class SqlitePushNotificationConfigStore(PushNotificationConfigStore):
+    """Keeps push notification configs in the SQLite database of the tasks.
+
+    Configs change rarely, each change is committed before returning.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        _create_schema(path)
+
+    async def set_info(
+        self, task_id: str, notification_config: PushNotificationConfig
+    ) -> None:
+        if notification_config.id is None:
+            notification_config.id = task_id
+        await asyncio.to_thread(
+            self._execute,
+            'INSERT OR REPLACE INTO a2a_push_config (task_id, config_id, data) '
+            'VALUES (?, ?, ?)',
+            (
+                task_id,
+                notification_config.id,
+                notification_config.model_dump_json(exclude_none=True),
+            ),
+        )
+
+    async def get_info(self, task_id: str) -> list[PushNotificationConfig]:
+        rows = await asyncio.to_thread(
+            self._execute,
+            'SELECT data FROM a2a_push_config WHERE task_id = ? ORDER BY rowid',
+            (task_id,),
+        )
+        return [PushNotificationConfig.model_validate_json(r[0]) for r in rows]
+
+    async def delete_info(
+        self, task_id: str, config_id: str | None = None
+    ) -> None:
+        await asyncio.to_thread(
+            self._execute,
+            'DELETE FROM a2a_push_config WHERE task_id = ? AND config_id = ?',
+            (task_id, config_id if config_id is not None else task_id),
+        )
+
+    def _execute(self, query: str, params: tuple) -> list[tuple]:
+        with closing(_connect(self._path)) as connection, connection:
+            return connection.execute(query, params).fetchall()
+
+
+def create_task_stores(
+    task_db: str | None,
+) -> tuple[TaskStore, PushNotificationConfigStore]:
+    """Returns the task and push config stores, in memory if no task_db."""
+    if task_db:
+        logger.info(f'Saving tasks in {task_db}')
+        return SqliteTaskStore(task_db), SqlitePushNotificationConfigStore(
+            task_db
+        )
+    return InMemoryTaskStore(), InMemoryPushNotificationConfigStore()
@@ -1,17 +1,19 @@
-import json
+import asyncio
 import logging
+import os
+import time
 import uuid
 
-from collections.abc import AsyncIterable
+from collections.abc import AsyncIterable, Awaitable, Callable, Collection
+from dataclasses import dataclass
 from enum import Enum
 from uuid import uuid4
 
-import httpx
 import networkx as nx
 
-from a2a.client import A2AClient
 from a2a.types import (
     AgentCard,
+    Artifact,
     MessageSendParams,
     SendStreamingMessageRequest,
     SendStreamingMessageSuccessResponse,
@@ -19,8 +21,8 @@ from a2a.types import (
     TaskState,
     TaskStatusUpdateEvent,
 )
-from a2a_mcp.common.utils import get_mcp_server_config
-from a2a_mcp.mcp import client
+from a2a_mcp.common.agent_router import AgentRouter
+from a2a_mcp.common.client_registry import AgentClientRegistry
 
 
 logger = logging.getLogger(__name__)
@@ -36,6 +38,41 @@ class Status(Enum):
     INITIALIZED = 'INITIALIZED'
 
 
+@dataclass
+class WorkflowRunStats:
+    """Timings of one run of a workflow graph, in seconds."""
+
+    wall_time: float
+    # The sum of the node run times, what running them one by one takes.
+    serial_time: float
+    # The longest chain of dependent nodes, the best any schedule can do.
+    critical_path_time: float
+
+    @classmethod
+    def from_durations(
+        cls,
+        graph: nx.DiGraph,
+        sub_graph: list[str],
+        durations: dict[str, float],
+        wall_time: float,
+    ) -> 'WorkflowRunStats':
+        finished_at: dict[str, float] = {}
+        for node_id in sub_graph:
+            if node_id in durations:
+                finished_at[node_id] = durations[node_id] + max(
+                    (
+                        finished_at.get(p, 0.0)
+                        for p in graph.predecessors(node_id)
+                    ),
+                    default=0.0,
+                )
+        return cls(
+            wall_time=wall_time,
+            serial_time=sum(durations.values()),
+            critical_path_time=max(finished_at.values(), default=0.0),
+        )
+
+
 class WorkflowNode:
     """Represents a single node in a workflow graph.
 
@@ -50,6 +87,8 @@ class WorkflowNode:
         task: str,
         node_key: str | None = None,
         node_label: str | None = None,
+        router: AgentRouter | None = None,
+        clients: AgentClientRegistry | None = None,
     ):
         self.id = str(uuid.uuid4())
         self.node_key = node_key
@@ -57,29 +96,52 @@ class WorkflowNode:
         self.task = task
         self.results = None
         self.state = Status.READY
+        self.router = router or AgentRouter()
+        self.clients = clients or AgentClientRegistry()
+
+    def to_dict(self) -> dict[str, any]:
+        return {
+            'id': self.id,
+            'task': self.task,
+            'node_key': self.node_key,
+            'node_label': self.node_label,
+            'state': self.state.value,
+            'results': self.results.model_dump(mode='json', exclude_none=True)
+            if self.results
+            else None,
+        }
+
+    @classmethod
+    def from_dict(
+        cls,
+        data: dict[str, any],
+        router: AgentRouter | None = None,
+        clients: AgentClientRegistry | None = None,
+    ) -> 'WorkflowNode':
+        node = cls(
+            task=data['task'],
+            node_key=data.get('node_key'),
+            node_label=data.get('node_label'),
+            router=router,
+            clients=clients,
+        )
+        node.id = data['id']
+        state = Status(data['state'])
+        # A node that was still running when it was saved runs again.
+        node.state = Status.READY if state == Status.RUNNING else state
+        if data.get('results'):
+            node.results = Artifact.model_validate(data['results'])
+        return node
 
     async def get_planner_resource(self) -> AgentCard | None:
         logger.info(f'Getting resource for node {self.id}')
-        config = get_mcp_server_config()
-        async with client.init_session(
-            config.host, config.port, config.transport
-        ) as session:
-            response = await client.find_resource(
-                session, 'resource://agent_cards/planner_agent'
-            )
-            data = json.loads(response.contents[0].text)
-            return AgentCard(**data['agent_card'][0])
+        return await self.router.get_planner_card()
 
     async def find_agent_for_task(self) -> AgentCard | None:
         logger.info(f'Find agent for task - {self.task}')
-        config = get_mcp_server_config()
-        async with client.init_session(
-            config.host, config.port, config.transport
-        ) as session:
-            result = await client.find_agent(session, self.task)
-            agent_card_json = json.loads(result.content[0].text)
-            logger.debug(f'Found agent {agent_card_json} for task {self.task}')
-            return AgentCard(**agent_card_json)
+        agent_card = await self.router.find_agent(self.task)
+        logger.debug(f'Found agent {agent_card.name} for task {self.task}')
+        return agent_card
 
     async def run_node(
         self,
@@ -93,9 +155,7 @@ class WorkflowNode:
             agent_card = await self.get_planner_resource()
         else:
             agent_card = await self.find_agent_for_task()
-        async with httpx.AsyncClient() as httpx_client:
-            client = A2AClient(httpx_client, agent_card)
-
+        async with self.clients.client(agent_card) as client:
             payload: dict[str, any] = {
                 'message': {
                     'role': 'user',
@@ -122,13 +182,22 @@ class WorkflowNode:
 class WorkflowGraph:
     """Represents a graph of workflow nodes."""
 
-    def __init__(self) -> None:
+    def __init__(self, max_concurrency: int | None = None) -> None:
         self.graph = nx.DiGraph()
         self.nodes = {}
         self.latest_node = None
         self.node_type = None
         self.state = Status.INITIALIZED
-        self.paused_node_id = None
+        # Ordered set of the paused node ids, the latest pause last.
+        self.paused_node_ids: dict[str, None] = {}
+        self.max_concurrency = max_concurrency or int(
+            os.getenv('A2A_MCP_WORKFLOW_CONCURRENCY', '4')
+        )
+        self.last_run: WorkflowRunStats | None = None
+        # Awaited after each node is done, e.g. to checkpoint the graph.
+        self.on_node_done: Callable[[WorkflowNode], Awaitable[None]] | None = (
+            None
+        )
 
     def add_node(self, node) -> None:
         logger.info(f'Adding node {node.id}')
@@ -143,13 +212,30 @@ class WorkflowGraph:
         self.graph.add_edge(from_node_id, to_node_id)
 
     async def run_workflow(
-        self, start_node_id: str | None = None
+        self, start_node_ids: Collection[str] | None = None
     ) -> AsyncIterable[dict[str, any]]:
+        """Runs the nodes reachable from the start nodes as a DAG.
+
+        Without start nodes, the graph runs from its roots.
+
+        Every node whose predecessors are complete runs concurrently, up to
+        `max_concurrency` at a time. Their chunks are merged into one stream
+        in the order they arrive; the chunks of each node stay in order.
+        Completed nodes are skipped, so restarting from a completed node
+        runs its remaining descendants.
+
+        A node that asks for input is PAUSED: its later chunks are dropped
+        and its descendants do not run, while the other branches run to
+        completion. It is added to `paused_node_ids` before its question
+        is yielded, so the last of them is the node that asked. The graph
+        is PAUSED if any node still is at the end.
+        """
         logger.info('Executing workflow graph')
-        if not start_node_id or start_node_id not in self.nodes:
+        start_nodes = [n for n in start_node_ids or [] if n in self.nodes]
+        if not start_nodes:
             start_nodes = [n for n, d in self.graph.in_degree() if d == 0]
-        else:
-            start_nodes = [self.nodes[start_node_id].id]
+        for node_id in start_nodes:
+            self.paused_node_ids.pop(node_id, None)
 
         applicable_graph = set()
 
@@ -161,39 +247,149 @@ class WorkflowGraph:
         sub_graph = [n for n in complete_graph if n in applicable_graph]
         logger.info(f'Sub graph {sub_graph} size {len(sub_graph)}')
         self.state = Status.RUNNING
-        # Alternative is to loop over all nodes, but we only need the connected nodes.
-        for node_id in sub_graph:
-            node = self.nodes[node_id]
-            node.state = Status.RUNNING
-            query = self.graph.nodes[node_id].get('query')
-            task_id = self.graph.nodes[node_id].get('task_id')
-            context_id = self.graph.nodes[node_id].get('context_id')
-            async for chunk in node.run_node(query, task_id, context_id):
-                # When the workflow node is paused, do not yield any chunks
-                # but, let the loop complete.
-                if node.state != Status.PAUSED:
+        pending = [
+            n for n in sub_graph if self.nodes[n].state != Status.COMPLETED
+        ]
+        durations: dict[str, float] = {}
+        chunks: asyncio.Queue = asyncio.Queue()
+        slots = asyncio.Semaphore(self.max_concurrency)
+        running: dict[str, asyncio.Task] = {}
+        started = time.monotonic()
+
+        def schedule():
+            for node_id in list(pending):
+                if node_id in start_nodes or all(
+                    self.nodes[p].state == Status.COMPLETED
+                    for p in self.graph.predecessors(node_id)
+                ):
+                    pending.remove(node_id)
+                    running[node_id] = asyncio.create_task(
+                        self._run_node(node_id, slots, chunks, durations)
+                    )
+
+        schedule()
+        try:
+            while running:
+                node_id, chunk, pauses = await chunks.get()
+                if chunk is None:
+                    # The node is done, re-raise its error if it failed.
+                    await running.pop(node_id)
+                    if self.on_node_done:
+                        await self.on_node_done(self.nodes[node_id])
+                    schedule()
+                    continue
+                if pauses:
+                    self.state = Status.PAUSED
+                    self.paused_node_ids[node_id] = None
+                yield chunk
+        finally:
+            for task in running.values():
+                task.cancel()
+            await asyncio.gather(*running.values(), return_exceptions=True)
+
+        paused = [
+            n for n, node in self.nodes.items() if node.state == Status.PAUSED
+        ]
+        self.paused_node_ids = dict.fromkeys(
+            [n for n in self.paused_node_ids if n in paused] + paused
+        )
+        if paused:
+            self.state = Status.PAUSED
+        else:
+            self.state = Status.COMPLETED
+        self.last_run = WorkflowRunStats.from_durations(
+            self.graph, sub_graph, durations, time.monotonic() - started
+        )
+        logger.info(
+            f'Ran {len(durations)} nodes in {self.last_run.wall_time:.2f}s, '
+            f'critical path {self.last_run.critical_path_time:.2f}s, '
+            f'serial {self.last_run.serial_time:.2f}s'
+        )
+
+    async def _run_node(
+        self,
+        node_id: str,
+        slots: asyncio.Semaphore,
+        chunks: asyncio.Queue,
+        durations: dict[str, float],
+    ):
+        node = self.nodes[node_id]
+        try:
+            async with slots:
+                node.state = Status.RUNNING
+                started = time.monotonic()
+                query = self.graph.nodes[node_id].get('query')
+                task_id = self.graph.nodes[node_id].get('task_id')
+                context_id = self.graph.nodes[node_id].get('context_id')
+                async for chunk in node.run_node(query, task_id, context_id):
+                    # When the workflow node is paused, do not yield any
+                    # chunks but, let the loop complete.
+                    if node.state == Status.PAUSED:
+                        continue
+                    pauses = False
                     if isinstance(
                         chunk.root, SendStreamingMessageSuccessResponse
                     ) and (
                         isinstance(chunk.root.result, TaskStatusUpdateEvent)
                     ):
                         task_status_event = chunk.root.result
-                        context_id = task_status_event.context_id
                         if (
                             task_status_event.status.state
                             == TaskState.input_required
-                            and context_id
+                            and task_status_event.context_id
                         ):
                             node.state = Status.PAUSED
-                            self.state = Status.PAUSED
-                            self.paused_node_id = node.id
-                    yield chunk
-            if self.state == Status.PAUSED:
-                break
-            if node.state == Status.RUNNING:
-                node.state = Status.COMPLETED
-        if self.state == Status.RUNNING:
-            self.state = Status.COMPLETED
+                            pauses = True
+                    await chunks.put((node_id, chunk, pauses))
+                durations[node_id] = time.monotonic() - started
+                if node.state == Status.RUNNING:
+                    node.state = Status.COMPLETED
+        finally:
+            await chunks.put((node_id, None, False))
+
+    def to_dict(self) -> dict[str, any]:
+        """Returns the graph, its nodes and their state as JSON data."""
+        return {
+            'state': self.state.value,
+            'paused_node_ids': list(self.paused_node_ids),
+            'latest_node': self.latest_node,
+            'nodes': [
+                {**node.to_dict(), 'attributes': self.graph.nodes[node_id]}
+                for node_id, node in self.nodes.items()
+            ],
+            'edges': list(self.graph.edges),
+        }
+
+    @classmethod
+    def from_dict(
+        cls,
+        data: dict[str, any],
+        router: AgentRouter | None = None,
+        clients: AgentClientRegistry | None = None,
+        max_concurrency: int | None = None,
+    ) -> 'WorkflowGraph':
+        """Restores a graph saved by to_dict.
+
+        Completed nodes keep their results and are not run again.
+        """
+        graph = cls(max_concurrency=max_concurrency)
+        for node_data in data['nodes']:
+            node = WorkflowNode.from_dict(node_data, router, clients)
+            graph.add_node(node)
+            graph.set_node_attributes(node.id, node_data['attributes'])
+        for from_node_id, to_node_id in data['edges']:
+            graph.add_edge(from_node_id, to_node_id)
+        graph.state = Status(data['state'])
+        graph.paused_node_ids = dict.fromkeys(
+            data.get('paused_node_ids')
+            or [
+                n
+                for n, node in graph.nodes.items()
+                if node.state == Status.PAUSED
+            ]
+        )
+        graph.latest_node = data.get('latest_node')
+        return graph
 
     def set_node_attribute(self, node_id, attribute, value) -> None:
         nx.set_node_attributes(self.graph, {node_id: value}, attribute)
@@ -0,0 +1,112 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+
+from abc import ABC, abstractmethod
+from contextlib import closing
+from typing import Any
+
+
+logger = logging.getLogger(__name__)
+
+
+class WorkflowStore(ABC):
+    """Stores the workflow state of each conversation, keyed by context id.
+
+    The state is the JSON data of a workflow, saved again each time one of
+    its nodes is done, so a paused or interrupted workflow can be resumed,
+    by any orchestrator sharing the store, without running its completed
+    nodes again.
+    """
+
+    @abstractmethod
+    async def get(self, context_id: str) -> dict[str, Any] | None:
+        """Returns the saved state of a context, if any."""
+
+    @abstractmethod
+    async def save(self, context_id: str, state: dict[str, Any]) -> None:
+        """Saves the state of a context, replacing the previous one."""
+
+    @abstractmethod
+    async def delete(self, context_id: str) -> None:
+        """Deletes the state of a context."""
+
+
+class InMemoryWorkflowStore(WorkflowStore):
+    """Keeps workflow states in memory, they are lost on restart."""
+
+    def __init__(self):
+        # Serialized, so a saved state is not changed by later updates.
+        self._states: dict[str, str] = {}
+
+    async def get(self, context_id: str) -> dict[str, Any] | None:
+        state = self._states.get(context_id)
+        return json.loads(state) if state is not None else None
+
+    async def save(self, context_id: str, state: dict[str, Any]) -> None:
+        self._states[context_id] = json.dumps(state)
+
+    async def delete(self, context_id: str) -> None:
+        self._states.pop(context_id, None)
+
+
+class SqliteWorkflowStore(WorkflowStore):
+    """Keeps workflow states in a SQLite database.
+
+    Queries run in a worker thread, each on its own connection, so they do
+    not block the event loop.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        with closing(self._connect()) as connection, connection:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS workflow_state ('
+                'context_id TEXT PRIMARY KEY, '
+                'state TEXT NOT NULL, '
+                'updated_at REAL NOT NULL)'
+            )
+
+    async def get(self, context_id: str) -> dict[str, Any] | None:
+        row = await asyncio.to_thread(
+            self._execute,
+            'SELECT state FROM workflow_state WHERE context_id = ?',
+            (context_id,),
+        )
+        return json.loads(row[0]) if row else None
+
+    async def save(self, context_id: str, state: dict[str, Any]) -> None:
+        await asyncio.to_thread(
+            self._execute,
+            'INSERT INTO workflow_state (context_id, state, updated_at) '
+            'VALUES (?, ?, ?) ON CONFLICT (context_id) DO UPDATE SET '
+            'state = excluded.state, updated_at = excluded.updated_at',
+            (context_id, json.dumps(state), time.time()),
+        )
+
+    async def delete(self, context_id: str) -> None:
+        await asyncio.to_thread(
+            self._execute,
+            'DELETE FROM workflow_state WHERE context_id = ?',
+            (context_id,),
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self._path, timeout=30)
+
+    def _execute(self, query: str, params: tuple) -> tuple | None:
+        with closing(self._connect()) as connection, connection:
+            return connection.execute(query, params).fetchone()
+
+
+def get_workflow_store() -> WorkflowStore:
+    """Returns the store set by A2A_MCP_WORKFLOW_DB, in memory if unset."""
+    path = os.getenv('A2A_MCP_WORKFLOW_DB')
+    if path:
+        logger.info(f'Saving workflow state in {path}')
+        return SqliteWorkflowStore(path)
+    return InMemoryWorkflowStore()
@@ -0,0 +1,138 @@
+import hashlib
+import json
+import re
+
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+from mcp.server.fastmcp.utilities.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+# Embeds a batch of texts for a task type ('retrieval_document' or
+# 'retrieval_query'), returning one row per text.
+EmbedFunction = Callable[[list[str], str], np.ndarray]
+
+
+def hashing_embeddings(
+    texts: list[str], task_type: str, dimensions: int = 512
+) -> np.ndarray:
+    """Embeds texts locally by hashing their words into a fixed size vector.
+
+    A cheap stand in for a real embedding model, used to exercise the index
+    offline, e.g. to benchmark it without calling an API.
+    """
+    matrix = np.zeros((len(texts), dimensions), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for word in re.findall(r'\w+', text.lower()):
+            digest = hashlib.blake2b(word.encode(), digest_size=8).digest()
+            matrix[row, int.from_bytes(digest, 'little') % dimensions] += 1
+    return matrix
+
+
+def card_key(agent_card: dict, model: str) -> str:
+    """Returns the cache key of a card's embedding: a hash of its content."""
+    content = json.dumps(agent_card, sort_keys=True)
+    return hashlib.sha256(f'{model}\n{content}'.encode()).hexdigest()
+
+
+class AgentCardIndex:
+    """Cosine similarity index over agent card embeddings.
+
+    The card embeddings are computed once, in batches, and kept as a single
+    row-normalized float32 matrix, so a query is one matrix-vector product
+    followed by a partial sort for the top k. Embeddings can be cached in a
+    `.npz` file keyed by a hash of the card content and the model name;
+    only new or changed cards are embedded on the next start.
+    """
+
+    def __init__(
+        self,
+        card_uris: list[str],
+        agent_cards: list[dict],
+        embed: EmbedFunction,
+        model: str = 'hashing',
+        cache_path: Path | None = None,
+        batch_size: int = 100,
+    ):
+        self.card_uris = card_uris
+        self.agent_cards = agent_cards
+        self._embed = embed
+        self._cards_by_uri = dict(zip(card_uris, agent_cards, strict=True))
+        keys = [card_key(card, model) for card in agent_cards]
+        cached = self._load_cache(cache_path)
+        missing = [i for i, key in enumerate(keys) if key not in cached]
+        if missing:
+            logger.info(f'Generating embeddings for {len(missing)} agent cards')
+            texts = [json.dumps(agent_cards[i]) for i in missing]
+            vectors = np.concatenate(
+                [
+                    embed(
+                        texts[start : start + batch_size], 'retrieval_document'
+                    )
+                    for start in range(0, len(texts), batch_size)
+                ]
+            )
+            for i, vector in zip(missing, vectors, strict=True):
+                cached[keys[i]] = vector
+            if cache_path:
+                self._save_cache(cache_path, keys, cached)
+        self._matrix = (
+            _normalize(np.stack([cached[key] for key in keys]))
+            if keys
+            else np.zeros((0, 0), dtype=np.float32)
+        )
+
+    def __len__(self) -> int:
+        return len(self.card_uris)
+
+    def get(self, card_uri: str) -> dict | None:
+        return self._cards_by_uri.get(card_uri)
+
+    def search(self, query: str, top_k: int = 1) -> list[tuple[int, float]]:
+        """Returns the (card index, cosine score) of the best matches."""
+        if not len(self):
+            return []
+        query_vector = _normalize(self._embed([query], 'retrieval_query'))[0]
+        scores = self._matrix @ query_vector
+        top_k = min(top_k, len(scores))
+        if top_k < len(scores):
+            best = np.argpartition(scores, -top_k)[-top_k:]
+        else:
+            best = np.arange(len(scores))
+        best = best[np.argsort(scores[best])[::-1]]
+        return [(int(i), float(scores[i])) for i in best]
+
+    def _load_cache(self, cache_path: Path | None) -> dict[str, np.ndarray]:
+        if not cache_path or not cache_path.is_file():
+            return {}
+        try:
+            with np.load(cache_path) as data:
+                return dict(zip(data['keys'], data['vectors'], strict=True))
+        except Exception as e:
+            logger.error(f'Ignoring unreadable embeddings cache {e}')
+            return {}
+
+    def _save_cache(
+        self,
+        cache_path: Path,
+        keys: list[str],
+        cached: dict[str, np.ndarray],
+    ):
+        try:
+            np.savez(
+                cache_path,
+                keys=np.array(keys),
+                vectors=np.stack([cached[key] for key in keys]),
+            )
+        except OSError as e:
+            logger.error(f'Could not write embeddings cache {e}')
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
@@ -0,0 +1,158 @@
+import asyncio
+import collections
+import itertools
+import json
+import os
+import queue
+import re
+import sqlite3
+import threading
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from mcp.server.fastmcp.utilities.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+
+def normalize_sql(sql: str) -> str:
+    """Collapses whitespace and drops the trailing semicolon of a query."""
+    return re.sub(r'\s+', ' ', sql).strip().rstrip(';').strip()
+
+
+class QueryEngine:
+    """Runs read-only queries against a SQLite database.
+
+    Queries run in a thread pool, so they do not block the event loop of
+    the MCP server, on a pool of connections opened read-only
+    (`mode=ro`) that are kept open and keep their prepared statements
+    cached across calls. A page holds at most `max_rows` rows and about
+    `max_bytes` of JSON; rows are fetched in batches and the query stops
+    as soon as the page is full, instead of materializing the whole
+    result. A page that was cut short has a `next_offset` to fetch the
+    next one.
+
+    Pages are cached in an LRU keyed by the normalized SQL and offset. The
+    cache is dropped when the database file (or its WAL) changes.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        pool_size: int = 4,
+        max_rows: int = 500,
+        max_bytes: int = 256 * 1024,
+        cache_size: int = 256,
+    ):
+        self._path = Path(path).resolve()
+        self._uri = f'{self._path.as_uri()}?mode=ro'
+        self._max_rows = max_rows
+        self._max_bytes = max_bytes
+        self._cache_size = cache_size
+        # One connection per worker thread at most.
+        self._executor = ThreadPoolExecutor(
+            max_workers=pool_size, thread_name_prefix='query-engine'
+        )
+        self._connections: queue.SimpleQueue[sqlite3.Connection] = (
+            queue.SimpleQueue()
+        )
+        self._cache: OrderedDict[tuple[str, int], dict[str, Any]] = (
+            OrderedDict()
+        )
+        self._cache_lock = threading.Lock()
+        self._version: tuple | None = None
+        self.hits = 0
+        self.misses = 0
+
+    async def query(self, sql: str, offset: int = 0) -> dict[str, Any]:
+        """Returns a page of the rows of a query, starting at offset.
+
+        Raises:
+          sqlite3.Error: if the query fails or tries to write.
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, self.query_sync, sql, offset
+        )
+
+    def query_sync(self, sql: str, offset: int = 0) -> dict[str, Any]:
+        """Like query, on the calling thread."""
+        key = (normalize_sql(sql), max(offset, 0))
+        version = self._database_version()
+        with self._cache_lock:
+            if version != self._version:
+                self._cache.clear()
+                self._version = version
+            page = self._cache.get(key)
+            if page is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return page
+            self.misses += 1
+        page = self._fetch_page(*key)
+        with self._cache_lock:
+            if self._cache_size and version == self._version:
+                self._cache[key] = page
+                if len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+        return page
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        while not self._connections.empty():
+            self._connections.get_nowait().close()
+
+    def _fetch_page(self, sql: str, offset: int) -> dict[str, Any]:
+        connection = self._acquire()
+        try:
+            cursor = connection.execute(sql)
+            columns = [column[0] for column in cursor.description or []]
+            # Skip the rows of the previous pages without building them.
+            collections.deque(itertools.islice(cursor, offset), maxlen=0)
+            rows = []
+            size = 0
+            truncated = False
+            while not truncated and (batch := cursor.fetchmany(100)):
+                for values in batch:
+                    row = dict(zip(columns, values, strict=True))
+                    size += len(json.dumps(row, default=str))
+                    if len(rows) >= self._max_rows or (
+                        rows and size > self._max_bytes
+                    ):
+                        truncated = True
+                        break
+                    rows.append(row)
+            cursor.close()
+        finally:
+            self._connections.put(connection)
+        page: dict[str, Any] = {'results': rows}
+        if truncated:
+            page['next_offset'] = offset + len(rows)
+        return page
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._connections.get_nowait()
+        except queue.Empty:
+            logger.info(f'Opening read-only connection to {self._path}')
+            connection = sqlite3.connect(
+                self._uri,
+                uri=True,
+                check_same_thread=False,
+                cached_statements=256,
+            )
+            connection.execute('PRAGMA query_only = ON')
+            return connection
+
+    def _database_version(self) -> tuple:
+        version = []
+        for path in (self._path, Path(f'{self._path}-wal')):
+            try:
+                stat = os.stat(path)
+                version.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                version.append(None)
+        return tuple(version)
@@ -8,10 +8,11 @@ from pathlib import Path
 
 import google.generativeai as genai
 import numpy as np
-import pandas as pd
 import requests
 
 from a2a_mcp.common.utils import init_api_key
+from a2a_mcp.mcp.agent_index import AgentCardIndex, hashing_embeddings
+from a2a_mcp.mcp.query_engine import QueryEngine
 from mcp.server.fastmcp import FastMCP
 from mcp.server.fastmcp.utilities.logging import get_logger
 
@@ -21,22 +22,30 @@ AGENT_CARDS_DIR = 'agent_cards'
 MODEL = 'models/embedding-001'
 SQLLITE_DB = 'travel_agency.db'
 PLACES_API_URL = 'https://places.googleapis.com/v1/places:searchText'
+# 'genai' embeds with MODEL, 'hashing' embeds locally without an API call.
+EMBEDDINGS = os.getenv('AGENT_CARD_EMBEDDINGS', 'genai')
+EMBEDDINGS_CACHE = os.getenv(
+    'AGENT_CARD_EMBEDDINGS_CACHE', f'{AGENT_CARDS_DIR}/.embeddings.npz'
+)
 
 
-def generate_embeddings(text):
-    """Generates embeddings for the given text using Google Generative AI.
+def generate_embeddings(texts, task_type='retrieval_document'):
+    """Generates embeddings for a batch of texts using Google Generative AI.
 
     Args:
-        text: The input string for which to generate embeddings.
+        texts: The input strings for which to generate embeddings.
+        task_type: The embedding task type, e.g. 'retrieval_query'.
 
     Returns:
-        A list of embeddings representing the input text.
+        A matrix with the embedding of each text as a row.
     """
-    return genai.embed_content(
-        model=MODEL,
-        content=text,
-        task_type='retrieval_document',
-    )['embedding']
+    return np.array(
+        genai.embed_content(
+            model=MODEL,
+            content=texts,
+            task_type=task_type,
+        )['embedding']
+    )
 
 
 def load_agent_cards():
@@ -86,28 +95,30 @@ def load_agent_cards():
     return card_uris, agent_cards
 
 
-def build_agent_card_embeddings() -> pd.DataFrame:
-    """Loads agent cards, generates embeddings for them, and returns a DataFrame.
+def build_agent_card_index() -> AgentCardIndex | None:
+    """Loads agent cards and builds the similarity index over them.
 
     Returns:
-        Optional[pd.DataFrame]: A Pandas DataFrame containing the original
-        'agent_card' data and their corresponding 'Embeddings'. Returns None
-        if no agent cards were loaded initially or if an exception occurred
-        during the embedding generation process.
+        Optional[AgentCardIndex]: The index over the loaded agent cards.
+        Returns None if an exception occurred during the embedding
+        generation process.
     """
     card_uris, agent_cards = load_agent_cards()
     logger.info('Generating Embeddings for agent cards')
     try:
-        if agent_cards:
-            df = pd.DataFrame(
-                {'card_uri': card_uris, 'agent_card': agent_cards}
-            )
-            df['card_embeddings'] = df.apply(
-                lambda row: generate_embeddings(json.dumps(row['agent_card'])),
-                axis=1,
-            )
-            return df
+        if EMBEDDINGS == 'hashing':
+            embed, model = hashing_embeddings, 'hashing'
+        else:
+            embed, model = generate_embeddings, MODEL
+        index = AgentCardIndex(
+            card_uris,
+            agent_cards,
+            embed,
+            model=model,
+            cache_path=Path(EMBEDDINGS_CACHE) if EMBEDDINGS_CACHE else None,
+        )
         logger.info('Done generating embeddings for agent cards')
+        return index
     except Exception as e:
         logger.error(f'An unexpected error occurred : {e}.', exc_info=True)
         return None
@@ -128,20 +139,20 @@ def serve(host, port, transport):  # noqa: PLR0915
     logger.info('Starting Agent Cards MCP Server')
     mcp = FastMCP('agent-cards', host=host, port=port)
 
-    df = build_agent_card_embeddings()
+    index = build_agent_card_index()
+    query_engine = QueryEngine(SQLLITE_DB)
 
     @mcp.tool(
         name='find_agent',
         description='Finds the most relevant agent card based on a natural language query string.',
     )
-    def find_agent(query: str) -> str:
+    def find_agent(query: str) -> dict:
         """Finds the most relevant agent card based on a query string.
 
         This function takes a user query, typically a natural language question or a task generated by an agent,
         generates its embedding, and compares it against the
-        pre-computed embeddings of the loaded agent cards. It uses the dot
-        product to measure similarity and identifies the agent card with the
-        highest similarity score.
+        pre-computed embeddings of the loaded agent cards. It uses cosine
+        similarity to identify the agent card with the highest score.
 
         Args:
             query: The natural language query string used to search for a
@@ -151,17 +162,39 @@ def serve(host, port, transport):  # noqa: PLR0915
             The json representing the agent card deemed most relevant
             to the input query based on embedding similarity.
         """
-        query_embedding = genai.embed_content(
-            model=MODEL, content=query, task_type='retrieval_query'
-        )
-        dot_products = np.dot(
-            np.stack(df['card_embeddings']), query_embedding['embedding']
-        )
-        best_match_index = np.argmax(dot_products)
+        best_match_index, score = index.search(query)[0]
         logger.debug(
-            f'Found best match at index {best_match_index} with score {dot_products[best_match_index]}'
+            f'Found best match at index {best_match_index} with score {score}'
         )
-        return df.iloc[best_match_index]['agent_card']
+        return index.agent_cards[best_match_index]
+
+    @mcp.tool(
+        name='find_agents',
+        description='Finds the top_k most relevant agent cards, with their similarity scores, for a natural language query string.',
+    )
+    def find_agents(query: str, top_k: int = 3) -> dict:
+        """Finds the most relevant agent cards based on a query string.
+
+        Args:
+            query: The natural language query string used to search for
+                   relevant agents.
+            top_k: The number of agent cards to return.
+
+        Returns:
+            A json / dictionary structured as {'agents': [...]}, with the
+            card uri, cosine similarity score and agent card of the best
+            matches, best first.
+        """
+        return {
+            'agents': [
+                {
+                    'card_uri': index.card_uris[i],
+                    'score': score,
+                    'agent_card': index.agent_cards[i],
+                }
+                for i, score in index.search(query, top_k)
+            ]
+        }
 
     @mcp.tool()
     def query_places_data(query: str):
@@ -208,16 +241,21 @@ def serve(host, port, transport):  # noqa: PLR0915
         return {'places': []}
 
     @mcp.tool()
-    def query_travel_data(query: str) -> dict:
+    async def query_travel_data(query: str, offset: int = 0) -> dict:
         """ "name": "query_travel_data",
         "description": "Retrieves the most up-to-date, ariline, hotel and car rental availability. Helps with the booking.
-        This tool should be used when a user asks for the airline ticket booking, hotel or accommodation booking, or car rental reservations.",
+        This tool should be used when a user asks for the airline ticket booking, hotel or accommodation booking, or car rental reservations.
+        Large results are returned in pages, when a page has a next_offset, call the tool again with that offset for the next page.",
         "parameters": {
             "type": "object",
             "properties": {
             "query": {
                 "type": "string",
                 "description": "A SQL to run against the travel database."
+            },
+            "offset": {
+                "type": "integer",
+                "description": "The number of rows to skip, the next_offset of the previous page."
             }
             },
             "required": ["query"]
@@ -230,21 +268,15 @@ def serve(host, port, transport):  # noqa: PLR0915
             raise ValueError(f'In correct query {query}')
 
         try:
-            with sqlite3.connect(SQLLITE_DB) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                cursor.execute(query)
-                rows = cursor.fetchall()
-                result = {'results': [dict(row) for row in rows]}
-                return json.dumps(result)
-        except Exception as e:
+            return await query_engine.query(query, offset)
+        except sqlite3.Error as e:
             logger.error(f'Exception running query {e}')
             logger.error(traceback.format_exc())
-            if 'no such column' in e:
+            if 'no such column' in str(e):
                 return {
                     'error': f'Please check your query, {e}. Use the table schema to regenerate the query'
                 }
-            return {'error': {e}}
+            return {'error': str(e)}
 
     @mcp.resource('resource://agent_cards/list', mime_type='application/json')
     def get_agent_cards() -> dict:
@@ -260,7 +292,7 @@ def serve(host, port, transport):  # noqa: PLR0915
         """
         resources = {}
         logger.info('Starting read resources')
-        resources['agent_cards'] = df['card_uri'].to_list()
+        resources['agent_cards'] = index.card_uris
         return resources
 
     @mcp.resource(
@@ -279,12 +311,8 @@ def serve(host, port, transport):  # noqa: PLR0915
         logger.info(
             f'Starting read resource resource://agent_cards/{card_name}'
         )
-        resources['agent_card'] = (
-            df.loc[
-                df['card_uri'] == f'resource://agent_cards/{card_name}',
-                'agent_card',
-            ]
-        ).to_list()
+        agent_card = index.get(f'resource://agent_cards/{card_name}')
+        resources['agent_card'] = [agent_card] if agent_card else []
 
         return resources
 
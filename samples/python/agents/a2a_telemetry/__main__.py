@@ -6,7 +6,6 @@ import uvicorn
 
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import InMemoryTaskStore
 from a2a.types import AgentCapabilities, AgentCard, AgentSkill
 from agent_executor import QnAAgentExecutor
 from opentelemetry import trace
@@ -17,6 +16,7 @@ from opentelemetry.instrumentation.starlette import StarletteInstrumentor
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from task_store import SqliteTaskStore, create_task_stores
 
 
 logger = logging.getLogger(__name__)
@@ -26,7 +26,13 @@ logging.basicConfig()
 @click.command()
 @click.option('--host', 'host', default='localhost')
 @click.option('--port', 'port', default=10020)
-def main(host: str, port: int):
+@click.option(
+    '--task-db',
+    'task_db',
+    envvar='A2A_TASK_DB',
+    help='SQLite database keeping the tasks across restarts.',
+)
+def main(host: str, port: int, task_db: str | None):
     """A2A Telemetry Sample GRPC Server."""
     if not os.getenv('GOOGLE_API_KEY'):
         raise ValueError('GOOGLE_API_KEY is not set.')
@@ -53,8 +59,9 @@ def main(host: str, port: int):
         capabilities=AgentCapabilities(streaming=True),
         skills=[skill],
     )
+    task_store, _ = create_task_stores(task_db)
     request_handler = DefaultRequestHandler(
-        agent_executor=agent_executor, task_store=InMemoryTaskStore()
+        agent_executor=agent_executor, task_store=task_store
     )
 
     logger.debug('Telemetry Configuration')
@@ -78,6 +85,8 @@ def main(host: str, port: int):
 
     server = A2AStarletteApplication(agent_card, request_handler)
     starlette_app = server.build()
+    if isinstance(task_store, SqliteTaskStore):
+        starlette_app.add_event_handler('shutdown', task_store.close)
     # Instrument the starlette app for tracing
     StarletteInstrumentor().instrument_app(starlette_app)
     uvicorn.run(starlette_app, host=host, port=port)
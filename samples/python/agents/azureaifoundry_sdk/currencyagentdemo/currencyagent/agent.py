@@ -1,7 +1,9 @@
+import asyncio
 import json
 import logging
 import os
 import time
+import traceback
 
 from collections.abc import AsyncGenerator
 from typing import Any
@@ -17,6 +19,8 @@ from azure.ai.agents.models import (
 )
 from azure.identity import DefaultAzureCredential
 from utils.mcp_tool_manager import MCPToolManager
+from utils.run_watcher import RunWatcher
+from utils.server_connection import MCPCircuitOpenError, MCPConfig
 
 
 class CurrencyAgent:
@@ -33,6 +37,18 @@ class CurrencyAgent:
         'Set response status to completed if the request is complete.'
     )
 
+    # Seconds a run may take, tool calls included, before giving up
+    RUN_TIMEOUT = 30
+    # Seconds a single tool call may take, its retries included
+    TOOL_CALL_TIMEOUT = 20
+    # Seconds one attempt of a tool call may take. Kept well below
+    # TOOL_CALL_TIMEOUT so a hung MCP server times out inside the
+    # connection, where it counts towards its circuit breaker, and the
+    # call can still be retried.
+    TOOL_ATTEMPT_TIMEOUT = 8
+    # Seconds an exchange rate is reused, Frankfurter updates them daily
+    EXCHANGE_RATE_CACHE_TTL = 300
+
     def __init__(self):
         # Check if required environment variable exists
         if 'AZURE_AI_FOUNDRY_PROJECT_ENDPOINT' not in os.environ:
@@ -57,6 +73,8 @@ class CurrencyAgent:
         self.mcp_tool_manager: MCPToolManager | None = (
             None  # Placeholder for MCPToolManager or similar
         )
+        # Polls the runs of all conversations from one background task
+        self.run_watcher = RunWatcher(self._get_client())
 
     def _get_client(self) -> AgentsClient:
         """Get a new AgentsClient instance for use in context managers."""
@@ -65,6 +83,14 @@ class CurrencyAgent:
             credential=self.credential,
         )
 
+    def _create_mcp_tool_manager(self) -> MCPToolManager:
+        """Create an MCP tool manager caching the exchange rate lookups."""
+        config = MCPConfig(
+            server_url=self.mcp_server_url,
+            cached_tools={'get_exchange_rate': self.EXCHANGE_RATE_CACHE_TTL},
+        )
+        return MCPToolManager(self.mcp_server_url, config)
+
     async def create_agent(self) -> Agent:
         """Create the AI Foundry agent with calendar instructions."""
         if self.agent:
@@ -72,7 +98,7 @@ class CurrencyAgent:
 
         logger = logging.getLogger(__name__)
 
-        self.mcp_tool_manager = MCPToolManager(self.mcp_server_url)
+        self.mcp_tool_manager = self._create_mcp_tool_manager()
 
         # Initialize the MCP tool manager (without async context manager)
         await self.mcp_tool_manager.initialize()
@@ -152,42 +178,26 @@ class CurrencyAgent:
                 thread_id=thread_id, agent_id=self.agent.id
             )
 
-            # Poll until completion
-            max_iterations = 30  # Prevent infinite loops
-            iterations = 0
-
-            while (
-                run.status in ['queued', 'in_progress', 'requires_action']
-                and iterations < max_iterations
-            ):
-                iterations += 1
-                time.sleep(1)
-                run = client.runs.get(thread_id=thread_id, run_id=run.id)
-
-                if run.status == 'failed':
-                    break
-
-                # Handle tool calls if needed
-                if run.status == 'requires_action':
+            # Wait until completion, handling tool calls if needed
+            deadline = time.monotonic() + self.RUN_TIMEOUT
+            try:
+                run = await self._wait_for_run(thread_id, run.id, deadline)
+                while run.status == 'requires_action':
                     try:
                         await self._handle_tool_calls(run, thread_id)
-                        # Get updated run status after tool submission
-                        run = client.runs.get(
-                            thread_id=thread_id, run_id=run.id
-                        )
                     except Exception as e:
                         # logger.error(f"Error handling tool calls: {e}")
                         # If tool handling fails, mark the run as failed
                         return [f'Error handling tool calls: {e!s}']
+                    run = await self._wait_for_run(thread_id, run.id, deadline)
+            except TimeoutError:
+                # logger.error(f"Run timed out after {self.RUN_TIMEOUT}s")
+                return ['Error: Request timed out']
 
             if run.status == 'failed':
                 # logger.error(f"Run failed: {run.last_error}")
                 return [f'Error: {run.last_error}']
 
-            if iterations >= max_iterations:
-                # logger.error(f"Run timed out after {max_iterations} iterations")
-                return ['Error: Request timed out']
-
             # Get response messages
             messages = client.messages.list(
                 thread_id=thread_id, order=ListSortOrder.DESCENDING
@@ -243,20 +253,11 @@ class CurrencyAgent:
                 thread_id=thread_id, agent_id=self.agent.id
             )
 
-            max_iterations = 30
-            iterations = 0
-
-            while (
-                run.status in ['queued', 'in_progress', 'requires_action']
-                and iterations < max_iterations
-            ):
-                iterations += 1
-                time.sleep(0.5)  # Shorter polling interval for streaming
-
-                run = client.runs.get(thread_id=thread_id, run_id=run.id)
-
+            deadline = time.monotonic() + self.RUN_TIMEOUT
+            try:
+                run = await self._wait_for_run(thread_id, run.id, deadline)
                 # If we need tool calls, handle them
-                if run.status == 'requires_action':
+                while run.status == 'requires_action':
                     try:
                         yield {
                             'content': 'Processing data sources...',
@@ -264,9 +265,6 @@ class CurrencyAgent:
                             'is_task_complete': False,
                         }
                         await self._handle_tool_calls(run, thread_id)
-                        run = client.runs.get(
-                            thread_id=thread_id, run_id=run.id
-                        )
                     except Exception as e:
                         yield {
                             'content': f'Error handling tool calls: {e!s}',
@@ -274,19 +272,19 @@ class CurrencyAgent:
                             'is_task_complete': True,
                         }
                         return
-
-            # Handle any terminal states
-            if run.status == 'failed':
+                    run = await self._wait_for_run(thread_id, run.id, deadline)
+            except TimeoutError:
                 yield {
-                    'content': f'Error: {run.last_error}',
+                    'content': 'Error: Request timed out',
                     'require_user_input': False,
                     'is_task_complete': True,
                 }
                 return
 
-            if iterations >= max_iterations:
+            # Handle any terminal states
+            if run.status == 'failed':
                 yield {
-                    'content': 'Error: Request timed out',
+                    'content': f'Error: {run.last_error}',
                     'require_user_input': False,
                     'is_task_complete': True,
                 }
@@ -314,6 +312,14 @@ class CurrencyAgent:
                 'is_task_complete': True,
             }
 
+    async def _wait_for_run(
+        self, thread_id: str, run_id: str, deadline: float
+    ) -> ThreadRun:
+        """Wait for a run to need tool calls or finish, until the deadline."""
+        return await self.run_watcher.wait(
+            thread_id, run_id, timeout=max(deadline - time.monotonic(), 0)
+        )
+
     async def _handle_tool_calls(self, run: ThreadRun, thread_id: str):
         """Handle tool calls during agent execution using MCP tool manager."""
         import logging
@@ -344,7 +350,7 @@ class CurrencyAgent:
             # Ensure MCP Tool Manager is initialized and connected
             if not self.mcp_tool_manager:
                 logger.warning('MCP Tool Manager not initialized, creating now')
-                self.mcp_tool_manager = MCPToolManager(self.mcp_server_url)
+                self.mcp_tool_manager = self._create_mcp_tool_manager()
                 await self.mcp_tool_manager.initialize()
             elif (
                 not self.mcp_tool_manager._connection
@@ -355,98 +361,36 @@ class CurrencyAgent:
                 )
                 await self.mcp_tool_manager.initialize()
 
-            # Process each tool call
+            # Run the tool calls concurrently, the connection bounds how
+            # many reach the MCP server at once. Identical calls are run
+            # once and share their output.
+            executions: dict[tuple[str, str], asyncio.Task] = {}
+            call_keys = []
             for tool_call in tool_calls:
                 function_name = tool_call.function.name
-                arguments_str = tool_call.function.arguments
-
-                logger.info(
-                    f'Processing mcp tool call: {function_name} with args: {arguments_str}'
+                arguments = self._parse_tool_arguments(
+                    function_name, tool_call.function.arguments
                 )
-
-                try:
-                    # Parse arguments from JSON string with defensive handling
-                    if not arguments_str or arguments_str.strip() == '':
-                        logger.warning(
-                            f'Empty or null arguments for tool {function_name}, using empty dict'
-                        )
-                        arguments = {}
-                    else:
-                        try:
-                            arguments = json.loads(arguments_str)
-                            logger.info(f'Parsed arguments: {arguments}')
-                            logger.info(f'Arguments type: {type(arguments)}')
-                            logger.info(
-                                f'Arguments keys: {list(arguments.keys()) if isinstance(arguments, dict) else "Not a dict"}'
-                            )
-                        except json.JSONDecodeError as json_error:
-                            logger.error(
-                                f'Failed to parse JSON arguments for tool {function_name}: {json_error}'
-                            )
-                            logger.error(
-                                f"Raw arguments string: '{arguments_str}'"
-                            )
-                            # Try to recover by using empty arguments or skip this tool call
-                            arguments = {}
-                            logger.warning(
-                                f'Using empty arguments for tool {function_name} due to JSON parse error'
-                            )
-
-                    # Check if the function exists in MCP tools
-                    available_tools = self.mcp_tool_manager.get_tools()
-                    if function_name in available_tools:
-                        logger.info(
-                            f'Executing MCP tool function: {function_name} with arguments: {arguments}'
-                        )
-
-                        # Debug: Log the exact argument values
-                        if isinstance(arguments, dict):
-                            for key, value in arguments.items():
-                                logger.info(
-                                    f"  Argument '{key}': '{value}' (type: {type(value)})"
-                                )
-
-                        # Ensure connection exists before using it
-                        if not self.mcp_tool_manager._connection:
-                            logger.error(
-                                'MCP connection is None after initialization'
-                            )
-                            output = {'error': 'MCP connection not available'}
-                        else:
-                            # Execute the MCP tool directly using the connection
-                            output = await self.mcp_tool_manager._connection.execute_tool(
-                                function_name, arguments
-                            )
-                            logger.info(f'MCP tool execution result: {output}')
-                    else:
-                        output = {'error': f'Unknown function: {function_name}'}
-                        logger.error(
-                            f'Unknown function requested: {function_name}'
-                        )
-                        logger.error(
-                            f'Available tools: {list(available_tools.keys())}'
-                        )
-
-                except json.JSONDecodeError as e:
-                    output = {'error': f'Invalid arguments JSON: {e!s}'}
-                    logger.error(
-                        f'JSON parsing error for tool {function_name}: {e!s}'
+                key = (function_name, json.dumps(arguments, sort_keys=True))
+                if key in executions:
+                    logger.info(
+                        f'Reusing the output of an identical {function_name} call'
                     )
-                except Exception as e:
-                    output = {
-                        'error': f'Error executing tool {function_name}: {e!s}'
-                    }
-                    logger.error(f'Error during tool execution: {e!s}')
-                    logger.error(f'Exception type: {type(e).__name__}')
-                    import traceback
-
-                    logger.error(f'Full traceback: {traceback.format_exc()}')
+                else:
+                    executions[key] = asyncio.create_task(
+                        self._execute_tool_call(function_name, arguments)
+                    )
+                call_keys.append(key)
+            await asyncio.gather(*executions.values())
 
+            # Collect the outputs in the order of the tool calls
+            for tool_call, key in zip(tool_calls, call_keys, strict=True):
                 # Ensure we have a valid tool_call_id
                 if not hasattr(tool_call, 'id') or not tool_call.id:
                     logger.error(f'Tool call missing ID: {tool_call}')
                     continue
 
+                output = executions[key].result()
                 # Convert output to JSON string if it's not already
                 if isinstance(output, str):
                     output_str = output
@@ -509,6 +453,83 @@ class CurrencyAgent:
                     logger.error(f'Fallback submission also failed: {e2}')
                     raise e
 
+    def _parse_tool_arguments(
+        self, function_name: str, arguments_str: str | None
+    ) -> dict[str, Any]:
+        """Parse the JSON arguments of a tool call, empty if invalid."""
+        logger = self.logger
+        logger.info(
+            f'Processing mcp tool call: {function_name} with args: {arguments_str}'
+        )
+        # Parse arguments from JSON string with defensive handling
+        if not arguments_str or arguments_str.strip() == '':
+            logger.warning(
+                f'Empty or null arguments for tool {function_name}, using empty dict'
+            )
+            return {}
+        try:
+            arguments = json.loads(arguments_str)
+        except json.JSONDecodeError as json_error:
+            logger.error(
+                f'Failed to parse JSON arguments for tool {function_name}: {json_error}'
+            )
+            logger.error(f"Raw arguments string: '{arguments_str}'")
+            # Try to recover by using empty arguments
+            logger.warning(
+                f'Using empty arguments for tool {function_name} due to JSON parse error'
+            )
+            return {}
+        logger.info(f'Parsed arguments: {arguments}')
+        return arguments
+
+    async def _execute_tool_call(
+        self, function_name: str, arguments: dict[str, Any]
+    ) -> dict[str, Any] | str:
+        """Execute one MCP tool call, returning its output or an error."""
+        logger = self.logger
+        try:
+            # Check if the function exists in MCP tools
+            available_tools = self.mcp_tool_manager.get_tools()
+            if function_name not in available_tools:
+                logger.error(f'Unknown function requested: {function_name}')
+                logger.error(f'Available tools: {list(available_tools.keys())}')
+                return {'error': f'Unknown function: {function_name}'}
+
+            # Ensure connection exists before using it
+            if not self.mcp_tool_manager._connection:
+                logger.error('MCP connection is None after initialization')
+                return {'error': 'MCP connection not available'}
+
+            logger.info(
+                f'Executing MCP tool function: {function_name} with arguments: {arguments}'
+            )
+            # Execute the MCP tool directly using the connection
+            output = await asyncio.wait_for(
+                self.mcp_tool_manager._connection.execute_tool(
+                    function_name, arguments, timeout=self.TOOL_ATTEMPT_TIMEOUT
+                ),
+                timeout=self.TOOL_CALL_TIMEOUT,
+            )
+            logger.info(f'MCP tool execution result: {output}')
+            return output
+        except TimeoutError:
+            logger.error(
+                f'Tool {function_name} timed out after {self.TOOL_CALL_TIMEOUT}s'
+            )
+            return {
+                'error': f'Tool {function_name} timed out after '
+                f'{self.TOOL_CALL_TIMEOUT}s'
+            }
+        except MCPCircuitOpenError as e:
+            # The MCP server is failing, answer right away instead of waiting
+            logger.warning(f'Tool {function_name} not called: {e!s}')
+            return {'error': f'The currency service is unavailable: {e!s}'}
+        except Exception as e:
+            logger.error(f'Error during tool execution: {e!s}')
+            logger.error(f'Exception type: {type(e).__name__}')
+            logger.error(f'Full traceback: {traceback.format_exc()}')
+            return {'error': f'Error executing tool {function_name}: {e!s}'}
+
     async def cleanup_agent(self):
         """Clean up the agent resources."""
         if self.agent:
@@ -517,6 +538,8 @@ class CurrencyAgent:
                 # logger.info(f"Deleted agent: {self.agent.id}")
                 self.agent = None
 
+        self.run_watcher.close()
+
         # Clean up MCP connection
         if self.mcp_tool_manager:
             await self.mcp_tool_manager.close()
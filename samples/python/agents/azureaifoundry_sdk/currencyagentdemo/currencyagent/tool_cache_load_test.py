@@ -0,0 +1,129 @@
+"""Measures tool call throughput with and without the MCP result cache.
+
+A mock MCP server with a slow get_exchange_rate tool is started over SSE
+on a local port, then `--calls` lookups of a few currency pairs are made
+through ServerConnection, `--concurrency` at a time:
+
+  uncached:  every call goes to the server.
+  cached:    get_exchange_rate listed in MCPConfig.cached_tools, repeated
+             pairs are served from the cache or join the call in flight.
+
+run:
+  uv run python tool_cache_load_test.py --calls 2000
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import socket
+import time
+
+import uvicorn
+
+from mcp.server.fastmcp import FastMCP
+from utils.server_connection import MCPConfig, ServerConnection
+
+
+CURRENCIES = ['USD', 'EUR', 'GBP', 'INR', 'JPY', 'CHF']
+
+
+def create_mock_server(latency: float) -> FastMCP:
+    mcp = FastMCP('mock-currency')
+
+    @mcp.tool()
+    async def get_exchange_rate(currency_from: str, currency_to: str) -> dict:
+        """Returns a made up exchange rate after a simulated API call."""
+        await asyncio.sleep(latency)
+        return {
+            'amount': 1.0,
+            'base': currency_from,
+            'rates': {currency_to: round(random.uniform(0.5, 2.0), 4)},
+        }
+
+    return mcp
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def run_calls(
+    config: MCPConfig, calls: list[tuple[str, str]], concurrency: int
+) -> tuple[float, ServerConnection]:
+    connection = ServerConnection(config)
+    await connection.connect()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call(currency_from: str, currency_to: str):
+        async with semaphore:
+            await connection.execute_tool(
+                'get_exchange_rate',
+                {'currency_from': currency_from, 'currency_to': currency_to},
+            )
+
+    began = time.perf_counter()
+    await asyncio.gather(*(call(*pair) for pair in calls))
+    elapsed = time.perf_counter() - began
+    await connection.disconnect()
+    return elapsed, connection
+
+
+async def main(calls: int, concurrency: int, latency: float, ttl: float):
+    logging.getLogger().setLevel(logging.WARNING)
+    port = free_port()
+    server = uvicorn.Server(
+        uvicorn.Config(
+            create_mock_server(latency).sse_app(),
+            port=port,
+            log_level='warning',
+        )
+    )
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    rng = random.Random(0)
+    pairs = [tuple(rng.sample(CURRENCIES, 2)) for _ in range(calls)]
+    url = f'http://127.0.0.1:{port}/sse'
+    print(
+        f'{len(pairs)} calls over {len(set(pairs))} currency pairs, '
+        f'{latency * 1000:.0f}ms per server call'
+    )
+    print(f'{"mode":>9} {"total (s)":>9} {"calls/s":>9} {"to server":>9}')
+    for name, config in (
+        ('uncached', MCPConfig(server_url=url, health_check_interval=0)),
+        (
+            'cached',
+            MCPConfig(
+                server_url=url,
+                health_check_interval=0,
+                cached_tools={'get_exchange_rate': ttl},
+            ),
+        ),
+    ):
+        elapsed, connection = await run_calls(config, pairs, concurrency)
+        stats = connection.get_stats()
+        print(
+            f'{name:>9} {elapsed:>9.2f} {len(pairs) / elapsed:>9.0f} '
+            f'{stats.total_requests:>9}'
+        )
+    print(
+        f'{"":>9} cache hits {stats.cache_hits}, misses {stats.cache_misses}, '
+        f'coalesced {stats.coalesced_requests}'
+    )
+
+    server.should_exit = True
+    await serving
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--calls', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--ttl', type=float, default=300)
+    args = parser.parse_args()
+    asyncio.run(main(args.calls, args.concurrency, args.latency, args.ttl))
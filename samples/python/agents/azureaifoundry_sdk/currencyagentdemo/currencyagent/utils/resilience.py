@@ -0,0 +1,172 @@
+import asyncio
+import logging
+import time
+
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from enum import Enum
+
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(Enum):
+    """Enum for circuit breaker states."""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """Stops sending requests to a server that keeps failing.
+
+    The circuit opens after `failure_threshold` consecutive failures and
+    rejects requests for `reset_timeout` seconds. It then lets a single
+    probe request through (half-open): the circuit closes if the probe
+    succeeds and opens again if it fails.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started: float | None = None
+        self.opened_count = 0
+        self.rejected_count = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Get the current state, half-open once the reset timeout passed."""
+        if (
+            self._state == CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self.reset_timeout
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._probe_started = None
+        return self._state
+
+    @property
+    def retry_after(self) -> float:
+        """Seconds until the open circuit lets a probe through."""
+        if self.state != CircuitState.OPEN:
+            return 0.0
+        return self.reset_timeout - (time.monotonic() - self._opened_at)
+
+    def allow_request(self) -> bool:
+        """Check whether a request may be sent, counting rejections."""
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN:
+            # One probe at a time; a probe that never reported back is
+            # replaced after reset_timeout.
+            now = time.monotonic()
+            if (
+                self._probe_started is None
+                or now - self._probe_started >= self.reset_timeout
+            ):
+                self._probe_started = now
+                return True
+        self.rejected_count += 1
+        return False
+
+    def record_success(self) -> None:
+        if self._state != CircuitState.CLOSED:
+            logger.info('Circuit closed, server is responding again')
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._probe_started = None
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._state == CircuitState.HALF_OPEN or (
+            self._state == CircuitState.CLOSED
+            and self._failures >= self.failure_threshold
+        ):
+            logger.warning(
+                f'Circuit opened after {self._failures} consecutive failures, '
+                f'rejecting requests for {self.reset_timeout}s'
+            )
+            self._state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+            self._probe_started = None
+            self.opened_count += 1
+
+
+class AdaptiveConcurrencyLimiter:
+    """Bounds concurrent requests with a limit adapted to the server.
+
+    Requests hold a `slot` while they run and report how they went with
+    `record`. The limit follows AIMD: it grows by about one per round of
+    requests answered within `latency_target` seconds, and is halved when a
+    request fails or is slower. A decrease is only triggered by requests
+    started after the previous one, so a burst of failures halves the limit
+    once.
+    """
+
+    def __init__(
+        self,
+        min_limit: int = 1,
+        max_limit: int = 10,
+        latency_target: float = 5.0,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self._limit = float(max_limit)
+        self._last_decrease = 0.0
+        self._waiters: deque[asyncio.Future] = deque()
+        self.in_flight = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one of the slots, waiting for one to be free."""
+        await self._acquire()
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._wake()
+
+    def record(self, started: float, succeeded: bool) -> None:
+        """Adapt the limit to a request started at `started` (monotonic)."""
+        now = time.monotonic()
+        if succeeded and now - started <= self.latency_target:
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+        elif started >= self._last_decrease:
+            self._limit = max(self.min_limit, self._limit / 2)
+            self._last_decrease = now
+            logger.info(f'Concurrency limit lowered to {self.limit}')
+
+    async def _acquire(self) -> None:
+        while self.in_flight >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Pass on a wakeup this waiter can no longer use
+                if waiter.done() and not waiter.cancelled():
+                    self._wake()
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self.in_flight += 1
+
+    def _wake(self) -> None:
+        free = self.limit - self.in_flight
+        for waiter in list(self._waiters):
+            if free <= 0:
+                break
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
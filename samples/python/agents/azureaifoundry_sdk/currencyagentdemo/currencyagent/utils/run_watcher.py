@@ -0,0 +1,222 @@
+"""Polls Azure AI Agents runs without blocking the event loop."""
+
+import asyncio
+import logging
+import statistics
+import time
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+
+logger = logging.getLogger(__name__)
+
+# Run statuses to keep polling through, any other status is returned.
+PENDING_STATUSES = {'queued', 'in_progress', 'cancelling'}
+
+
+@dataclass
+class RunStats:
+    """Latency metrics of one run, times in seconds."""
+
+    run_id: str
+    status: str | None = None
+    polls: int = 0
+    started: float = field(default_factory=time.monotonic)
+    # Time from the start of the watch to the first requires_action.
+    first_action: float | None = None
+    latency: float | None = None
+
+
+@dataclass
+class _Watch:
+    thread_id: str
+    run_id: str
+    stats: RunStats
+    interval: float
+    next_poll: float
+    waiters: list[asyncio.Future] = field(default_factory=list)
+    polling: bool = False
+
+
+class RunWatcher:
+    """Waits for Azure AI Agents runs to need action or to finish.
+
+    The runs of every caller are polled by one background task. The
+    blocking `runs.get` calls of the sync agents client are made from a
+    small thread pool, so the event loop keeps serving other users while
+    runs are in progress. A run is polled every `min_interval` seconds at
+    first, backing off by `backoff` up to `max_interval` while its status
+    does not change.
+
+    The stats of the last `history` finished runs are kept for `summary`.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        min_interval: float = 0.25,
+        max_interval: float = 2.0,
+        backoff: float = 1.5,
+        max_workers: int = 8,
+        history: int = 1000,
+    ):
+        self._client = client
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._backoff = backoff
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='run-watcher'
+        )
+        self._watches: dict[str, _Watch] = {}
+        self._stats: dict[str, RunStats] = {}
+        self._poller: asyncio.Task | None = None
+        self._polls: set[asyncio.Task] = set()
+        self._wakeup = asyncio.Event()
+        self.finished: deque[RunStats] = deque(maxlen=history)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._watches)
+
+    async def wait(
+        self, thread_id: str, run_id: str, timeout: float | None = None
+    ) -> Any:
+        """Returns the run once it needs action or is finished.
+
+        Raises:
+          TimeoutError: if the run is still pending after timeout seconds.
+        """
+        loop = asyncio.get_running_loop()
+        watch = self._watches.get(run_id)
+        if watch is None:
+            stats = self._stats.setdefault(run_id, RunStats(run_id=run_id))
+            watch = _Watch(
+                thread_id=thread_id,
+                run_id=run_id,
+                stats=stats,
+                interval=self._min_interval,
+                next_poll=loop.time() + self._min_interval,
+            )
+            self._watches[run_id] = watch
+        waiter = loop.create_future()
+        watch.waiters.append(waiter)
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._poll_runs())
+        self._wakeup.set()
+        try:
+            return await asyncio.wait_for(waiter, timeout)
+        except TimeoutError:
+            if self._watches.get(run_id) is watch:
+                watch.waiters.remove(waiter)
+                if not watch.waiters:
+                    del self._watches[run_id]
+            self._finish(run_id, 'timed_out')
+            raise
+
+    def summary(self) -> dict[str, float]:
+        """Returns the latency percentiles of the recently finished runs."""
+        latencies = sorted(s.latency for s in self.finished if s.latency)
+        if not latencies:
+            return {'runs': 0}
+        return {
+            'runs': len(latencies),
+            'p50_latency': latencies[len(latencies) // 2],
+            'p95_latency': latencies[int(len(latencies) * 0.95)],
+            'max_latency': latencies[-1],
+            'mean_polls': statistics.mean(s.polls for s in self.finished),
+            'in_flight': self.in_flight,
+        }
+
+    def close(self):
+        """Stops polling, the waits still in progress are cancelled."""
+        for task in [*self._polls, *([self._poller] if self._poller else [])]:
+            task.cancel()
+        for watch in self._watches.values():
+            for waiter in watch.waiters:
+                waiter.cancel()
+        self._watches.clear()
+        self._executor.shutdown(wait=False)
+
+    async def _poll_runs(self):
+        loop = asyncio.get_running_loop()
+        while self._watches:
+            self._wakeup.clear()
+            now = loop.time()
+            next_poll = None
+            for watch in list(self._watches.values()):
+                if watch.polling:
+                    continue
+                if watch.next_poll <= now:
+                    watch.polling = True
+                    poll = asyncio.create_task(self._poll(watch))
+                    self._polls.add(poll)
+                    poll.add_done_callback(self._polls.discard)
+                elif next_poll is None or watch.next_poll < next_poll:
+                    next_poll = watch.next_poll
+            timeout = None if next_poll is None else next_poll - now
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except TimeoutError:
+                pass
+
+    async def _poll(self, watch: _Watch):
+        loop = asyncio.get_running_loop()
+        try:
+            run = await loop.run_in_executor(
+                self._executor,
+                lambda: self._client.runs.get(
+                    thread_id=watch.thread_id, run_id=watch.run_id
+                ),
+            )
+        except Exception as e:
+            logger.error(f'Failed to poll run {watch.run_id}: {e}')
+            self._release(watch, error=e)
+            self._finish(watch.run_id, 'error')
+            return
+        finally:
+            watch.polling = False
+            self._wakeup.set()
+        watch.stats.polls += 1
+        # The SDK returns a str enum, compare and report its value.
+        status = getattr(run.status, 'value', run.status)
+        if status in PENDING_STATUSES:
+            if status == watch.stats.status:
+                watch.interval = min(
+                    watch.interval * self._backoff, self._max_interval
+                )
+            else:
+                watch.interval = self._min_interval
+            watch.stats.status = status
+            watch.next_poll = loop.time() + watch.interval
+            return
+        watch.stats.status = status
+        if status == 'requires_action':
+            if watch.stats.first_action is None:
+                watch.stats.first_action = (
+                    time.monotonic() - watch.stats.started
+                )
+        else:
+            self._finish(watch.run_id, status)
+        self._release(watch, run=run)
+
+    def _release(self, watch: _Watch, run: Any = None, error=None):
+        if self._watches.get(watch.run_id) is watch:
+            del self._watches[watch.run_id]
+        for waiter in watch.waiters:
+            if waiter.done():
+                continue
+            if error is not None:
+                waiter.set_exception(error)
+            else:
+                waiter.set_result(run)
+
+    def _finish(self, run_id: str, status: str):
+        stats = self._stats.pop(run_id, None)
+        if stats is None:
+            return
+        stats.status = status
+        stats.latency = time.monotonic() - stats.started
+        self.finished.append(stats)
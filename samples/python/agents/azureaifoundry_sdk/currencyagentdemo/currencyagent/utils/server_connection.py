@@ -1,9 +1,12 @@
 import asyncio
+import copy
 import json
 import logging
+import time
 
+from collections import OrderedDict
 from contextlib import AsyncExitStack
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 from typing import Any
@@ -11,6 +14,12 @@ from typing import Any
 from mcp.client.session import ClientSession
 from mcp.client.sse import sse_client
 
+from .resilience import (
+    AdaptiveConcurrencyLimiter,
+    CircuitBreaker,
+    CircuitState,
+)
+
 
 logging.basicConfig(
     level=logging.INFO,
@@ -37,6 +46,10 @@ class MCPExecutionError(MCPError):
     """Raised when tool execution fails."""
 
 
+class MCPCircuitOpenError(MCPError):
+    """Raised when the circuit breaker rejects a request to a failing server."""
+
+
 class ConnectionState(Enum):
     """Enum for connection states."""
 
@@ -60,6 +73,19 @@ class MCPConfig:
     enable_auto_reconnect: bool = True
     max_concurrent_requests: int = 10
     request_timeout: float = 30.0
+    # The concurrency limit adapts between these bounds, it is halved when a
+    # request fails or takes longer than latency_target seconds
+    min_concurrent_requests: int = 1
+    latency_target: float = 10.0
+    # Requests are rejected for circuit_reset_timeout seconds after this
+    # many consecutive failures, then a single probe request is let through
+    circuit_failure_threshold: int = 5
+    circuit_reset_timeout: float = 30.0
+    # Tools whose results are cached, mapped to how long in seconds. Only
+    # list tools that read data: concurrent identical calls to them are
+    # also coalesced into one request.
+    cached_tools: dict[str, float] = field(default_factory=dict)
+    max_cached_results: int = 256
 
     def __post_init__(self):
         if not self.server_url:
@@ -68,6 +94,20 @@ class MCPConfig:
             raise ValueError('connection_timeout must be positive')
         if self.max_retries < 0:
             raise ValueError('max_retries cannot be negative')
+        if (
+            not 1
+            <= self.min_concurrent_requests
+            <= self.max_concurrent_requests
+        ):
+            raise ValueError(
+                'min_concurrent_requests must be between 1 and max_concurrent_requests'
+            )
+        if self.circuit_failure_threshold < 1:
+            raise ValueError('circuit_failure_threshold must be at least 1')
+        if any(ttl <= 0 for ttl in self.cached_tools.values()):
+            raise ValueError('cached_tools TTLs must be positive')
+        if self.max_cached_results < 0:
+            raise ValueError('max_cached_results cannot be negative')
 
 
 @dataclass
@@ -92,6 +132,14 @@ class ConnectionStats:
     reconnection_count: int = 0
     last_error: str | None = None
     last_error_time: datetime | None = None
+    cache_hits: int = 0
+    cache_misses: int = 0
+    coalesced_requests: int = 0
+    circuit_state: str = 'closed'
+    circuit_opened_count: int = 0
+    rejected_requests: int = 0
+    concurrency_limit: int = 0
+    in_flight_requests: int = 0
 
     @property
     def success_rate(self) -> float:
@@ -100,6 +148,14 @@ class ConnectionStats:
             return 0.0
         return (self.successful_requests / self.total_requests) * 100
 
+    @property
+    def cache_hit_rate(self) -> float:
+        """Calculate the result cache hit rate as percentage."""
+        lookups = self.cache_hits + self.cache_misses
+        if lookups == 0:
+            return 0.0
+        return (self.cache_hits / lookups) * 100
+
     @property
     def uptime(self) -> timedelta | None:
         """Calculate connection uptime."""
@@ -125,8 +181,21 @@ class ServerConnection:
         self._connection_lock = asyncio.Lock()
         self.exit_stack = AsyncExitStack()
         self._tools_cache: dict[str, ToolInfo] = {}
+        # (tool name, arguments JSON) -> (expiry time, result)
+        self._result_cache: OrderedDict[
+            tuple[str, str], tuple[float, dict[str, Any]]
+        ] = OrderedDict()
+        self._pending_calls: dict[tuple[str, str], asyncio.Future] = {}
         self._connection_state = ConnectionState.DISCONNECTED
-        self._semaphore = asyncio.Semaphore(config.max_concurrent_requests)
+        self._limiter = AdaptiveConcurrencyLimiter(
+            min_limit=config.min_concurrent_requests,
+            max_limit=config.max_concurrent_requests,
+            latency_target=config.latency_target,
+        )
+        self._breaker = CircuitBreaker(
+            failure_threshold=config.circuit_failure_threshold,
+            reset_timeout=config.circuit_reset_timeout,
+        )
         self.stats = ConnectionStats()
         self._health_check_task: asyncio.Task | None = None
         self._reconnect_task: asyncio.Task | None = None
@@ -313,6 +382,10 @@ class ServerConnection:
     ) -> dict[str, Any]:
         """Execute a tool on the MCP server with enhanced retry logic and concurrency control.
 
+        Results of the tools listed in `config.cached_tools` are served from
+        a cache until they expire, and concurrent identical calls to them
+        share a single request.
+
         Args:
             tool_name: Name of the tool to execute
             arguments: Arguments to pass to the tool
@@ -328,107 +401,226 @@ class ServerConnection:
             MCPToolNotFoundError: If the tool doesn't exist
             MCPExecutionError: On tool execution failure after all retries
         """
+        ttl = self.config.cached_tools.get(tool_name)
+        if ttl is None:
+            return await self._execute_tool(
+                tool_name, arguments, retries, retry_delay, timeout
+            )
+
+        key = (tool_name, json.dumps(arguments, sort_keys=True, default=str))
+        cached = self._get_cached_result(key)
+        if cached is not None:
+            self.stats.cache_hits += 1
+            logger.info(f"Serving cached result of tool '{tool_name}'")
+            return copy.deepcopy(cached)
+        self.stats.cache_misses += 1
+
+        pending = self._pending_calls.get(key)
+        if pending is not None:
+            self.stats.coalesced_requests += 1
+            logger.info(f"Joining in-flight call to tool '{tool_name}'")
+            return copy.deepcopy(await asyncio.shield(pending))
+
+        pending = asyncio.get_running_loop().create_future()
+        self._pending_calls[key] = pending
+        try:
+            result = await self._execute_tool(
+                tool_name, arguments, retries, retry_delay, timeout
+            )
+        except asyncio.CancelledError:
+            pending.set_exception(
+                MCPExecutionError(f"Call to tool '{tool_name}' was cancelled")
+            )
+            raise
+        except Exception as e:
+            pending.set_exception(e)
+            raise
+        else:
+            pending.set_result(result)
+            self._cache_result(key, ttl, result)
+            return copy.deepcopy(result)
+        finally:
+            del self._pending_calls[key]
+            # The callers that joined the call have retrieved the error, do
+            # not warn about it when there are none.
+            if pending.done() and not pending.cancelled():
+                pending.exception()
+
+    def clear_result_cache(self) -> None:
+        """Drop all cached tool results."""
+        self._result_cache.clear()
+
+    def _get_cached_result(self, key: tuple[str, str]) -> dict[str, Any] | None:
+        entry = self._result_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at <= time.monotonic():
+            del self._result_cache[key]
+            return None
+        self._result_cache.move_to_end(key)
+        return result
+
+    def _cache_result(
+        self, key: tuple[str, str], ttl: float, result: dict[str, Any]
+    ) -> None:
+        # Error payloads are not worth keeping
+        if not self.config.max_cached_results or (
+            isinstance(result, dict) and 'error' in result
+        ):
+            return
+        self._result_cache[key] = (time.monotonic() + ttl, result)
+        self._result_cache.move_to_end(key)
+        while len(self._result_cache) > self.config.max_cached_results:
+            self._result_cache.popitem(last=False)
+
+    async def _execute_tool(
+        self,
+        tool_name: str,
+        arguments: dict[str, Any],
+        retries: int | None,
+        retry_delay: float | None,
+        timeout: float | None,
+    ) -> dict[str, Any]:
+        """Send a tool call to the server, retrying on failure."""
         logger.info(f"Executing tool '{tool_name}' with arguments: {arguments}")
 
         if not self.is_connected:
             raise MCPConnectionError('Not connected to MCP server')
 
-        # Use semaphore to limit concurrent requests
-        async with self._semaphore:
-            retries = (
-                retries if retries is not None else self.config.max_retries
-            )
-            retry_delay = (
-                retry_delay
-                if retry_delay is not None
-                else self.config.retry_delay
-            )
-            timeout = (
-                timeout if timeout is not None else self.config.request_timeout
-            )
+        retries = retries if retries is not None else self.config.max_retries
+        retry_delay = (
+            retry_delay if retry_delay is not None else self.config.retry_delay
+        )
+        timeout = (
+            timeout if timeout is not None else self.config.request_timeout
+        )
 
-            # Verify tool exists and update usage
-            tool_info = await self.get_tool_info(tool_name)
-            if not tool_info:
-                error_msg = f"Tool '{tool_name}' not found on MCP server"
-                self.stats.failed_requests += 1
-                raise MCPToolNotFoundError(error_msg)
+        # Verify tool exists and update usage
+        tool_info = await self.get_tool_info(tool_name)
+        if not tool_info:
+            error_msg = f"Tool '{tool_name}' not found on MCP server"
+            self.stats.failed_requests += 1
+            raise MCPToolNotFoundError(error_msg)
 
-            # Update tool usage statistics
-            tool_info.last_used = datetime.now()
-            tool_info.usage_count += 1
+        # Update tool usage statistics
+        tool_info.last_used = datetime.now()
+        tool_info.usage_count += 1
 
-            # Track request statistics
-            self.stats.total_requests += 1
+        # Track request statistics
+        self.stats.total_requests += 1
 
-            # Implement retry with exponential backoff
-            attempt = 0
-            last_exception = None
+        # Implement retry with exponential backoff
+        attempt = 0
+        last_exception = None
 
-            while attempt <= retries:
-                try:
-                    logger.debug(
-                        f"Executing tool '{tool_name}' (attempt {attempt + 1}/{retries + 1})"
-                    )
+        while attempt <= retries:
+            try:
+                logger.debug(
+                    f"Executing tool '{tool_name}' (attempt {attempt + 1}/{retries + 1})"
+                )
 
-                    # Execute with timeout
-                    execution_task = self.session.call_tool(
-                        tool_name, arguments
-                    )
-                    result = await asyncio.wait_for(
-                        execution_task, timeout=timeout
-                    )
+                # Execute with timeout
+                result = await self._call_tool(tool_name, arguments, timeout)
 
-                    if result and result.content:
-                        try:
-                            response_data = json.loads(result.content[0].text)
-                        except json.JSONDecodeError:
-                            response_data = {'text': result.content[0].text}
-
-                        self.stats.successful_requests += 1
-                        logger.info(f"Successfully executed tool '{tool_name}'")
-                        return response_data
-                    response_data = {'error': 'No content received from tool'}
-                    self.stats.successful_requests += (
-                        1  # Still counts as successful call
-                    )
+                if result and result.content:
+                    try:
+                        response_data = json.loads(result.content[0].text)
+                    except json.JSONDecodeError:
+                        response_data = {'text': result.content[0].text}
+
+                    self.stats.successful_requests += 1
+                    logger.info(f"Successfully executed tool '{tool_name}'")
                     return response_data
+                response_data = {'error': 'No content received from tool'}
+                self.stats.successful_requests += (
+                    1  # Still counts as successful call
+                )
+                return response_data
 
-                except TimeoutError:
-                    last_exception = MCPExecutionError(
-                        f'Tool execution timed out after {timeout}s'
-                    )
-                except Exception as e:
-                    last_exception = e
-
-                attempt += 1
-                if attempt <= retries:
-                    # Exponential backoff with jitter
-                    delay = min(
-                        retry_delay * (2 ** (attempt - 1)),
-                        self.config.max_retry_delay,
-                    )
-                    jitter = (
-                        delay
-                        * 0.1
-                        * (0.5 - asyncio.get_event_loop().time() % 1)
-                    )
-                    actual_delay = delay + jitter
+            except MCPCircuitOpenError as e:
+                # Fail fast instead of retrying against a failing server
+                self.stats.failed_requests += 1
+                logger.warning(f"Rejected call to tool '{tool_name}': {e}")
+                raise
+            except asyncio.CancelledError:
+                self.stats.failed_requests += 1
+                self.stats.last_error = (
+                    f"Call to tool '{tool_name}' was cancelled"
+                )
+                self.stats.last_error_time = datetime.now()
+                raise
+            except TimeoutError:
+                last_exception = MCPExecutionError(
+                    f'Tool execution timed out after {timeout}s'
+                )
+            except Exception as e:
+                last_exception = e
+
+            attempt += 1
+            if attempt <= retries:
+                # Exponential backoff with jitter
+                delay = min(
+                    retry_delay * (2 ** (attempt - 1)),
+                    self.config.max_retry_delay,
+                )
+                jitter = (
+                    delay * 0.1 * (0.5 - asyncio.get_event_loop().time() % 1)
+                )
+                actual_delay = delay + jitter
 
-                    logger.warning(
-                        f"Tool '{tool_name}' execution failed: {last_exception}. "
-                        f'Retrying in {actual_delay:.1f}s...'
-                    )
-                    await asyncio.sleep(actual_delay)
+                logger.warning(
+                    f"Tool '{tool_name}' execution failed: {last_exception}. "
+                    f'Retrying in {actual_delay:.1f}s...'
+                )
+                await asyncio.sleep(actual_delay)
 
-            # All retries exhausted
-            self.stats.failed_requests += 1
-            self.stats.last_error = str(last_exception)
-            self.stats.last_error_time = datetime.now()
+        # All retries exhausted
+        self.stats.failed_requests += 1
+        self.stats.last_error = str(last_exception)
+        self.stats.last_error_time = datetime.now()
 
-            error_msg = f"Failed to execute tool '{tool_name}' after {retries + 1} attempts: {last_exception}"
-            logger.error(error_msg)
-            raise MCPExecutionError(error_msg) from last_exception
+        error_msg = f"Failed to execute tool '{tool_name}' after {retries + 1} attempts: {last_exception}"
+        logger.error(error_msg)
+        raise MCPExecutionError(error_msg) from last_exception
+
+    async def _call_tool(
+        self, tool_name: str, arguments: dict[str, Any], timeout: float
+    ) -> Any:
+        """Send one tool call through the circuit breaker and concurrency limit.
+
+        Raises:
+            MCPCircuitOpenError: If the circuit breaker rejects the call
+        """
+        if self._breaker.state == CircuitState.OPEN:
+            raise self._circuit_open_error()
+        async with self._limiter.slot():
+            # The circuit may have opened while waiting for a slot
+            if not self._breaker.allow_request():
+                raise self._circuit_open_error()
+            started = time.monotonic()
+            succeeded = False
+            try:
+                result = await asyncio.wait_for(
+                    self.session.call_tool(tool_name, arguments),
+                    timeout=timeout,
+                )
+                succeeded = True
+            finally:
+                # A call cancelled by the caller's own timeout is a failure
+                # too, it is what a hung server looks like from here
+                self._limiter.record(started, succeeded=succeeded)
+                if succeeded:
+                    self._breaker.record_success()
+                else:
+                    self._breaker.record_failure()
+            return result
+
+    def _circuit_open_error(self) -> MCPCircuitOpenError:
+        return MCPCircuitOpenError(
+            f'MCP server at {self.config.server_url} is failing, '
+            f'retry in {self._breaker.retry_after:.0f}s'
+        )
 
     async def health_check(self) -> bool:
         """Perform a health check on the connection.
@@ -509,6 +701,11 @@ class ServerConnection:
         Returns:
             ConnectionStats object with current statistics
         """
+        self.stats.circuit_state = self._breaker.state.value
+        self.stats.circuit_opened_count = self._breaker.opened_count
+        self.stats.rejected_requests = self._breaker.rejected_count
+        self.stats.concurrency_limit = self._limiter.limit
+        self.stats.in_flight_requests = self._limiter.in_flight
         return self.stats
 
     def get_tools_usage(self) -> dict[str, dict[str, Any]]:
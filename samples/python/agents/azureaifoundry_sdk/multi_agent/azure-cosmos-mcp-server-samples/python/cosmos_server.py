@@ -11,6 +11,7 @@ data exploration.
 """
 
 import argparse
+import asyncio
 import json
 import logging
 import os
@@ -28,6 +29,10 @@ try:
 except ImportError:
     AZURE_IDENTITY_AVAILABLE = False
 
+from in_memory_container import InMemoryConnection, InMemoryContainer, synthetic_vehicles
+from metadata_cache import ContainerMetadata, MetadataCache
+from query_executor import CosmosContainer, QueryExecutor, QueryPage, format_json_lines
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -128,10 +133,41 @@ class CosmosDBConnection:
             logger.error(f"Failed to connect to CosmosDB container: {str(e)}")
             raise
 
+    def get_container(self, container_name: Optional[str] = None) -> CosmosContainer:
+        """Get a container for the query executor."""
+        return CosmosContainer(self.get_container_client(container_name))
+
+    def list_container_names(self) -> List[str]:
+        """List the names of the containers of the database."""
+        return [c['id'] for c in self.get_database_client().list_containers()]
+
 
-# Global connection instance
+# Global connection instance, a CosmosDBConnection or an InMemoryConnection
 cosmos_connection = None
 
+# Budget of a query tool call, set from the command line
+query_max_items = 100
+query_max_bytes = 256 * 1024
+
+
+# Container properties and inferred schemas, created in main()
+metadata_cache: Optional[MetadataCache] = None
+
+
+async def get_container_metadata(container_name: Optional[str] = None) -> ContainerMetadata:
+    """Get the cached metadata of a container, defaults to the configured container."""
+    return await metadata_cache.get(container_name or cosmos_connection.default_container)
+
+
+def get_query_executor(container_name: Optional[str] = None) -> QueryExecutor:
+    """Get a query executor on a container, with the configured budget."""
+    return QueryExecutor(
+        cosmos_connection.get_container(container_name),
+        max_items=query_max_items,
+        max_bytes=query_max_bytes,
+        page_size=min(query_max_items, 100)
+    )
+
 
 def initialize_server() -> FastMCP:
     """Initialize the FastMCP server with Cosmos DB tools."""
@@ -191,6 +227,36 @@ Example:
         action="store_true",
         help="Use Azure Managed Identity for authentication instead of access key"
     )
+    parser.add_argument(
+        "--max-items",
+        type=int,
+        default=100,
+        help="Maximum number of items returned by a query tool call (default: 100)"
+    )
+    parser.add_argument(
+        "--max-bytes",
+        type=int,
+        default=256 * 1024,
+        help="Maximum JSON size of the items returned by a query tool call (default: 262144)"
+    )
+    parser.add_argument(
+        "--metadata-ttl",
+        type=float,
+        default=300,
+        help="Seconds before cached container schemas are refreshed in the background (default: 300)"
+    )
+    parser.add_argument(
+        "--metadata-scan",
+        type=int,
+        default=1000,
+        help="Number of documents scanned to infer a container schema (default: 1000)"
+    )
+    parser.add_argument(
+        "--demo-vehicles",
+        type=int,
+        metavar="N",
+        help="Serve an in-memory 'vehicles' container of N synthetic documents instead of Cosmos DB"
+    )
     parser.add_argument(
         "--version",
         action="version",
@@ -227,27 +293,47 @@ def format_query_results(items: List[Dict[str, Any]]) -> str:
     return "\n".join(result)
 
 
+def format_continuation(page: QueryPage) -> str:
+    """Tell how to fetch the rest of a result cut short, empty if it is complete."""
+    if not page.has_more:
+        return ""
+    return (
+        f"\n\nMore results available. Call again with "
+        f"continuation_token=\"{page.continuation_token}\" to fetch them."
+    )
+
+
 @mcp.tool()
-def query_cosmos(query: str) -> str:
+async def query_cosmos(
+    query: str,
+    continuation_token: Optional[str] = None,
+    output_format: str = "text"
+) -> str:
     """
     Run an arbitrary SQL-like query on the active CosmosDB container and return formatted results.
     
     This is the primary tool for querying the data. Use SELECT queries to fetch specific records.
     Example: "SELECT * FROM c WHERE c.City = 'Miami'"
     
+    Large results are returned in parts: a result cut short ends with a
+    continuation token, pass it with the same query to get the next part.
+    
     Args:
         query: SQL-like query string
+        continuation_token: Token from a previous call, to continue its results (optional)
+        output_format: "text" for readable results, "jsonl" for one JSON document per line
+            followed by a line with the count and continuation token
         
     Returns:
         Formatted query results or error message
     """
+    if output_format not in ("text", "jsonl"):
+        return "output_format must be 'text' or 'jsonl'"
     try:
-        container = cosmos_connection.get_container_client()
-        items = list(container.query_items(
-            query=query,
-            enable_cross_partition_query=True
-        ))
-        return format_query_results(items)
+        page = await get_query_executor().query(query, continuation_token)
+        if output_format == "jsonl":
+            return format_json_lines(page)
+        return format_query_results(page.items) + format_continuation(page)
     except exceptions.CosmosHttpResponseError as e:
         return f"Cosmos DB error: {e.status_code} - {e.message}"
     except Exception as e:
@@ -255,7 +341,7 @@ def query_cosmos(query: str) -> str:
 
 
 @mcp.tool()
-def list_collections() -> str:
+async def list_collections() -> str:
     """
     List all container (collection) names present in the current CosmosDB database.
     
@@ -265,24 +351,23 @@ def list_collections() -> str:
         List of container names or error message
     """
     try:
-        db_client = cosmos_connection.get_database_client()
-        containers = list(db_client.list_containers())
+        container_names = await asyncio.to_thread(cosmos_connection.list_container_names)
         
-        if not containers:
+        if not container_names:
             return "No containers found in database"
         
-        container_names = [c['id'] for c in containers]
         return "Available containers:\n" + "\n".join(f"- {name}" for name in container_names)
     except Exception as e:
         return f"Error listing containers: {str(e)}"
 
 
 @mcp.tool()
-def describe_container(container_name: Optional[str] = None) -> str:
+async def describe_container(container_name: Optional[str] = None) -> str:
     """
-    Describe the schema of a container by inspecting a sample document.
+    Describe the schema of a container, merged from a sample of its documents.
     
-    Outputs a flat list of top-level fields to help understand the structure.
+    Outputs a flat list of top-level fields with their types, how often they are
+    missing or null, an estimate of their distinct values and an example value.
     Useful for building queries when no schema is predefined.
     
     Args:
@@ -292,27 +377,25 @@ def describe_container(container_name: Optional[str] = None) -> str:
         Schema description or error message
     """
     try:
-        container = cosmos_connection.get_container_client(container_name)
-        
-        # Get a sample document
-        sample_query = "SELECT * FROM c OFFSET 0 LIMIT 1"
-        items = list(container.query_items(
-            query=sample_query,
-            enable_cross_partition_query=True
-        ))
-        
-        if not items:
-            return f"No documents found in container '{container_name or cosmos_connection.default_container}'"
+        metadata = await get_container_metadata(container_name)
         
-        sample = items[0]
+        if not metadata.scanned:
+            return f"No documents found in container '{metadata.container_name}'"
         
         # Build schema description
-        result = [f"Schema for container '{container_name or cosmos_connection.default_container}':", "-" * 50]
-        result.append("Fields:")
-        
-        for key, value in sample.items():
-            value_type = type(value).__name__
-            result.append(f"- {key} ({value_type})")
+        result = [f"Schema for container '{metadata.container_name}':", "-" * 50]
+        result.append(f"Fields (from {metadata.scanned:,} sampled documents):")
+        
+        for key, stats in metadata.fields.items():
+            value_type = ", ".join(stats.type_names) or "null"
+            line = (
+                f"- {key} ({value_type}) - {metadata.null_rate(key):.0%} missing or null, "
+                f"~{stats.distinct.count():,} distinct"
+            )
+            example = metadata.example(key)
+            if example is not None:
+                line += f", e.g. {json.dumps(example, default=str)[:60]}"
+            result.append(line)
         
         return "\n".join(result)
     except Exception as e:
@@ -320,7 +403,7 @@ def describe_container(container_name: Optional[str] = None) -> str:
 
 
 @mcp.tool()
-def find_implied_links(container_name: Optional[str] = None) -> str:
+async def find_implied_links(container_name: Optional[str] = None) -> str:
     """
     Detect relationship hints in a container by analyzing field name patterns.
     
@@ -334,34 +417,26 @@ def find_implied_links(container_name: Optional[str] = None) -> str:
         Detected relationship patterns or message
     """
     try:
-        container = cosmos_connection.get_container_client(container_name)
-        
-        # Sample documents to analyze patterns
-        sample_query = "SELECT * FROM c OFFSET 0 LIMIT 10"
-        items = list(container.query_items(
-            query=sample_query,
-            enable_cross_partition_query=True
-        ))
+        metadata = await get_container_metadata(container_name)
         
-        if not items:
+        if not metadata.scanned:
             return "No documents found to analyze"
         
-        # Analyze field patterns
+        # Analyze the field patterns of the sampled documents
         relationship_hints = set()
         id_fields = set()
         
-        for doc in items:
-            for key in doc:
-                key_lower = key.lower()
-                
-                # Check for common foreign key patterns
-                if key_lower.endswith(('_id', 'id', '_fk', '_ref', '_key')):
-                    if key_lower != 'id' and key_lower != '_id':  # Exclude document ID
-                        relationship_hints.add(key)
-                
-                # Check for ID-like fields
-                if 'id' in key_lower:
-                    id_fields.add(key)
+        for key in metadata.fields:
+            key_lower = key.lower()
+            
+            # Check for common foreign key patterns
+            if key_lower.endswith(('_id', 'id', '_fk', '_ref', '_key')):
+                if key_lower != 'id' and key_lower != '_id':  # Exclude document ID
+                    relationship_hints.add(key)
+            
+            # Check for ID-like fields
+            if 'id' in key_lower:
+                id_fields.add(key)
         
         # Build result
         result = ["Potential relationships detected:", "-" * 50]
@@ -385,7 +460,7 @@ def find_implied_links(container_name: Optional[str] = None) -> str:
 
 
 @mcp.tool()
-def get_sample_documents(container_name: Optional[str] = None, limit: int = 5) -> str:
+async def get_sample_documents(container_name: Optional[str] = None, limit: int = 5) -> str:
     """
     Retrieve a small number of sample documents from a container to preview real data.
     
@@ -402,12 +477,9 @@ def get_sample_documents(container_name: Optional[str] = None, limit: int = 5) -
         if limit < 1 or limit > 100:
             return "Limit must be between 1 and 100"
         
-        container = cosmos_connection.get_container_client(container_name)
+        executor = get_query_executor(container_name)
         query = f"SELECT * FROM c OFFSET 0 LIMIT {limit}"
-        docs = list(container.query_items(
-            query=query,
-            enable_cross_partition_query=True
-        ))
+        docs = (await executor.query(query, max_items=limit)).items
         
         if not docs:
             return "No documents found"
@@ -425,7 +497,7 @@ def get_sample_documents(container_name: Optional[str] = None, limit: int = 5) -
 
 
 @mcp.tool()
-def count_documents(container_name: Optional[str] = None) -> str:
+async def count_documents(container_name: Optional[str] = None) -> str:
     """
     Count the total number of documents in the specified CosmosDB container.
     
@@ -438,14 +510,11 @@ def count_documents(container_name: Optional[str] = None) -> str:
         Document count or error message
     """
     try:
-        container = cosmos_connection.get_container_client(container_name)
+        executor = get_query_executor(container_name)
         
-        # Use COUNT query for efficiency
+        # Use COUNT query for efficiency, the count is computed by the server
         count_query = "SELECT VALUE COUNT(1) FROM c"
-        result = list(container.query_items(
-            query=count_query,
-            enable_cross_partition_query=True
-        ))
+        result = (await executor.query(count_query, max_items=1)).items
         
         count = result[0] if result else 0
         container_display = container_name or cosmos_connection.default_container
@@ -456,7 +525,7 @@ def count_documents(container_name: Optional[str] = None) -> str:
 
 
 @mcp.tool()
-def get_partition_key_info(container_name: Optional[str] = None) -> str:
+async def get_partition_key_info(container_name: Optional[str] = None) -> str:
     """
     Get the partition key path of the CosmosDB container.
     
@@ -469,14 +538,13 @@ def get_partition_key_info(container_name: Optional[str] = None) -> str:
         Partition key information or error message
     """
     try:
-        container = cosmos_connection.get_container_client(container_name)
-        properties = container.read()
+        metadata = await get_container_metadata(container_name)
         
-        partition_key = properties.get('partitionKey', {})
+        partition_key = metadata.properties.get('partitionKey', {})
         paths = partition_key.get('paths', [])
         kind = partition_key.get('kind', 'Hash')
         
-        container_display = container_name or cosmos_connection.default_container
+        container_display = metadata.container_name
         
         result = [f"Partition key info for '{container_display}':", "-" * 50]
         result.append(f"Paths: {', '.join(paths) if paths else 'None'}")
@@ -488,7 +556,7 @@ def get_partition_key_info(container_name: Optional[str] = None) -> str:
 
 
 @mcp.tool()
-def get_indexing_policy(container_name: Optional[str] = None) -> str:
+async def get_indexing_policy(container_name: Optional[str] = None) -> str:
     """
     Retrieve and display the indexing policy of the CosmosDB container.
     
@@ -501,11 +569,10 @@ def get_indexing_policy(container_name: Optional[str] = None) -> str:
         Indexing policy in JSON format or error message
     """
     try:
-        container = cosmos_connection.get_container_client(container_name)
-        properties = container.read()
+        metadata = await get_container_metadata(container_name)
         
-        indexing_policy = properties.get('indexingPolicy', {})
-        container_display = container_name or cosmos_connection.default_container
+        indexing_policy = metadata.properties.get('indexingPolicy', {})
+        container_display = metadata.container_name
         
         result = [
             f"Indexing policy for '{container_display}':",
@@ -519,37 +586,43 @@ def get_indexing_policy(container_name: Optional[str] = None) -> str:
 
 
 @mcp.tool()
-def list_distinct_values(field_name: str, container_name: Optional[str] = None) -> str:
+async def list_distinct_values(
+    field_name: str,
+    container_name: Optional[str] = None,
+    continuation_token: Optional[str] = None
+) -> str:
     """
     List all unique values for a given field in the container.
     
     Helps with filter creation, cardinality checks, and data discovery.
+    Fields with many values are listed in parts: pass the continuation
+    token of a call to get the next part.
     
     Args:
         field_name: Name of the field to get distinct values for
         container_name: Name of container (optional)
+        continuation_token: Token from a previous call, to continue its values (optional)
         
     Returns:
         List of distinct values or error message
     """
     try:
-        container = cosmos_connection.get_container_client(container_name)
+        executor = get_query_executor(container_name)
         
         # Query for distinct values
         query = f"SELECT DISTINCT VALUE c.{field_name} FROM c"
-        values = list(container.query_items(
-            query=query,
-            enable_cross_partition_query=True
-        ))
+        page = await executor.query(query, continuation_token)
+        values = page.items
         
         if not values:
             return f"No values found for field '{field_name}'"
         
         # Format results
         container_display = container_name or cosmos_connection.default_container
+        count_label = "Unique values in this part" if page.has_more or continuation_token else "Total unique values"
         result = [
             f"Distinct values for '{field_name}' in '{container_display}':",
-            f"Total unique values: {len(values)}",
+            f"{count_label}: {len(values)}",
             "-" * 50
         ]
         
@@ -567,7 +640,7 @@ def list_distinct_values(field_name: str, container_name: Optional[str] = None)
             else:
                 result.append(f"- {value}")
         
-        return "\n".join(result)
+        return "\n".join(result) + format_continuation(page)
     except Exception as e:
         return f"Error fetching distinct values: {str(e)}"
 
@@ -582,6 +655,9 @@ def validate_connection_params(args: argparse.Namespace) -> bool:
     Returns:
         True if all parameters are valid, False otherwise
     """
+    if args.demo_vehicles is not None:
+        return True
+    
     missing_params = []
     
     if not args.uri:
@@ -605,34 +681,49 @@ def validate_connection_params(args: argparse.Namespace) -> bool:
 
 def main():
     """Main entry point for the Cosmos DB MCP server."""
-    global cosmos_connection
+    global cosmos_connection, metadata_cache, query_max_items, query_max_bytes
     
     # Parse arguments
     args = parse_arguments()
+    query_max_items = args.max_items
+    query_max_bytes = args.max_bytes
     
     # Validate connection parameters
     if not validate_connection_params(args):
         sys.exit(1)
     
     # Initialize connection
-    try:
-        cosmos_connection = CosmosDBConnection(
-            uri=args.uri,
-            key=args.key,
-            database=args.db,
-            container=args.container,
-            use_managed_identity=args.use_managed_identity
+    if args.demo_vehicles is not None:
+        logger.info(f"Generating {args.demo_vehicles:,} synthetic vehicle documents")
+        cosmos_connection = InMemoryConnection(
+            [InMemoryContainer("vehicles", synthetic_vehicles(args.demo_vehicles))],
+            default_container="vehicles"
         )
-        
-        # Test connection
-        auth_method = "Managed Identity" if args.use_managed_identity else "Access Key"
-        logger.info(f"Connecting to Cosmos DB using {auth_method} - Database: {args.db}, Container: {args.container}")
-        cosmos_connection.get_container_client()
-        logger.info("Successfully connected to Cosmos DB")
-        
-    except Exception as e:
-        logger.error(f"Failed to initialize Cosmos DB connection: {str(e)}")
-        sys.exit(1)
+    else:
+        try:
+            cosmos_connection = CosmosDBConnection(
+                uri=args.uri,
+                key=args.key,
+                database=args.db,
+                container=args.container,
+                use_managed_identity=args.use_managed_identity
+            )
+            
+            # Test connection
+            auth_method = "Managed Identity" if args.use_managed_identity else "Access Key"
+            logger.info(f"Connecting to Cosmos DB using {auth_method} - Database: {args.db}, Container: {args.container}")
+            cosmos_connection.get_container_client()
+            logger.info("Successfully connected to Cosmos DB")
+            
+        except Exception as e:
+            logger.error(f"Failed to initialize Cosmos DB connection: {str(e)}")
+            sys.exit(1)
+    
+    metadata_cache = MetadataCache(
+        cosmos_connection.get_container,
+        ttl=args.metadata_ttl,
+        scan_limit=args.metadata_scan
+    )
     
     # MCP streamable-http server 
     try:
@@ -0,0 +1,235 @@
+"""
+In-memory containers for running the MCP server tools without Cosmos DB.
+
+InMemoryContainer implements the QueryContainer interface of
+query_executor.py on a list of documents. It understands the queries the
+tools generate, and simple filters:
+
+    SELECT * FROM c [WHERE c.field <op> value [AND ...]] [OFFSET n LIMIT m]
+    SELECT VALUE COUNT(1) FROM c [WHERE ...]
+    SELECT DISTINCT VALUE c.field FROM c [WHERE ...]
+
+where <op> is one of =, !=, <, <=, >, >= and value a string in single
+quotes, a number, true, false or null.
+"""
+
+import operator
+import random
+import re
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+_QUERY = re.compile(
+    r"^\s*SELECT\s+(?P<select>\*|VALUE\s+COUNT\(1\)|DISTINCT\s+VALUE\s+c\.(?P<distinct>\w+))"
+    r"\s+FROM\s+c"
+    r"(?:\s+WHERE\s+(?P<where>.+?))?"
+    r"(?:\s+OFFSET\s+(?P<offset>\d+)\s+LIMIT\s+(?P<limit>\d+))?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+_CONDITION = re.compile(
+    r"^\s*c\.(?P<field>\w+)\s*(?P<op>!=|<=|>=|=|<|>)\s*(?P<value>'[^']*'|-?\d+(?:\.\d+)?|true|false|null)\s*$",
+    re.IGNORECASE,
+)
+_OPERATORS = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+@dataclass
+class _CompiledQuery:
+    select: str  # "*", "count" or "distinct"
+    conditions: List[Tuple[str, Callable[[Any, Any], bool], Any]] = field(default_factory=list)
+    distinct_field: Optional[str] = None
+    offset: int = 0
+    limit: Optional[int] = None
+
+    def matches(self, document: Dict[str, Any]) -> bool:
+        for name, compare, value in self.conditions:
+            if name not in document:
+                return False
+            try:
+                if not compare(document[name], value):
+                    return False
+            except TypeError:
+                return False
+        return True
+
+
+def _parse_value(text: str) -> Any:
+    if text.startswith("'"):
+        return text[1:-1]
+    lowered = text.lower()
+    if lowered in ("true", "false"):
+        return lowered == "true"
+    if lowered == "null":
+        return None
+    return float(text) if "." in text else int(text)
+
+
+@lru_cache(maxsize=256)
+def _compile(query: str) -> _CompiledQuery:
+    match = _QUERY.match(query)
+    if not match:
+        raise ValueError(f"Query not supported by the in-memory container: {query}")
+    select = match["select"].upper()
+    compiled = _CompiledQuery(
+        select="*" if select == "*" else "count" if "COUNT" in select else "distinct",
+        distinct_field=match["distinct"],
+    )
+    if match["where"]:
+        for condition in re.split(r"\s+AND\s+", match["where"], flags=re.IGNORECASE):
+            parsed = _CONDITION.match(condition)
+            if not parsed:
+                raise ValueError(f"Condition not supported by the in-memory container: {condition}")
+            compiled.conditions.append(
+                (
+                    parsed["field"],
+                    _OPERATORS[parsed["op"]],
+                    _parse_value(parsed["value"]),
+                )
+            )
+    if match["offset"] is not None:
+        compiled.offset = int(match["offset"])
+        compiled.limit = int(match["limit"])
+    return compiled
+
+
+class InMemoryContainer:
+    """A QueryContainer on a list of documents."""
+
+    def __init__(
+        self,
+        container_id: str,
+        documents: List[Dict[str, Any]],
+        partition_key: str = "/id",
+    ):
+        self.id = container_id
+        self.documents = documents
+        self._properties = {
+            "id": container_id,
+            "partitionKey": {"paths": [partition_key], "kind": "Hash"},
+            "indexingPolicy": {
+                "indexingMode": "consistent",
+                "automatic": True,
+                "includedPaths": [{"path": "/*"}],
+                "excludedPaths": [{"path": '/"_etag"/?'}],
+            },
+        }
+
+    def query_page(
+        self, query: str, page_size: int, continuation: Optional[str]
+    ) -> Tuple[List[Any], Optional[str]]:
+        compiled = _compile(query)
+        if compiled.select == "count":
+            count = sum(1 for document in self.documents if compiled.matches(document))
+            return [count], None
+        if compiled.select == "distinct":
+            return self._distinct_page(compiled, page_size, continuation)
+
+        # The token is the position of the scan and the number of matches so far
+        position, matched = map(int, continuation.split(":")) if continuation else (0, 0)
+        end = compiled.offset + compiled.limit if compiled.limit is not None else None
+        items = []
+        for position in range(position, len(self.documents)):
+            if end is not None and matched >= end:
+                return items, None
+            if len(items) >= page_size:
+                return items, f"{position}:{matched}"
+            document = self.documents[position]
+            if not compiled.matches(document):
+                continue
+            matched += 1
+            if matched > compiled.offset:
+                items.append(document)
+        return items, None
+
+    def _distinct_page(
+        self,
+        compiled: _CompiledQuery,
+        page_size: int,
+        continuation: Optional[str],
+    ) -> Tuple[List[Any], Optional[str]]:
+        values = []
+        seen = set()
+        for document in self.documents:
+            value = document.get(compiled.distinct_field)
+            key = repr(value)
+            if key not in seen and compiled.matches(document):
+                seen.add(key)
+                values.append(value)
+        start = int(continuation) if continuation else 0
+        end = start + page_size
+        return values[start:end], str(end) if end < len(values) else None
+
+    def read(self) -> Dict[str, Any]:
+        return dict(self._properties)
+
+
+class InMemoryConnection:
+    """Stands in for CosmosDBConnection with in-memory containers."""
+
+    def __init__(self, containers: Iterable[InMemoryContainer], default_container: str):
+        self.containers = {container.id: container for container in containers}
+        self.default_container = default_container
+
+    def get_container(self, container_name: Optional[str] = None) -> InMemoryContainer:
+        name = container_name or self.default_container
+        if name not in self.containers:
+            raise RuntimeError(f"Container '{name}' not found")
+        return self.containers[name]
+
+    def list_container_names(self) -> List[str]:
+        return list(self.containers)
+
+
+MAKES = {
+    "Toyota": ["Corolla", "Camry", "RAV4", "Prius"],
+    "Ford": ["F-150", "Mustang", "Explorer", "Escape"],
+    "Tesla": ["Model 3", "Model Y", "Model S"],
+    "Honda": ["Civic", "Accord", "CR-V"],
+    "BMW": ["3 Series", "X5", "i4"],
+}
+CITIES = [
+    "Miami",
+    "Seattle",
+    "Austin",
+    "Chicago",
+    "Denver",
+    "Boston",
+    "Phoenix",
+]
+COLORS = ["white", "black", "silver", "blue", "red", "gray"]
+
+
+def synthetic_vehicles(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Generate vehicle documents like the ones of the sample vehicles container."""
+    rng = random.Random(seed)
+    makes = list(MAKES)
+    vehicles = []
+    for index in range(count):
+        make = rng.choice(makes)
+        year = rng.randint(2010, 2025)
+        vehicles.append(
+            {
+                "id": f"vehicle-{index}",
+                "vin": f"{rng.getrandbits(64):017X}"[:17],
+                "make": make,
+                "model": rng.choice(MAKES[make]),
+                "year": year,
+                "color": rng.choice(COLORS),
+                "City": rng.choice(CITIES),
+                "mileage": rng.randint(0, 15_000) * (2026 - year),
+                "price": round(rng.uniform(8_000, 90_000), 2),
+                "electric": make == "Tesla" or rng.random() < 0.05,
+                "owner_id": f"owner-{rng.randint(1, count // 3 + 1)}",
+            }
+        )
+    return vehicles
@@ -0,0 +1,261 @@
+"""
+Container metadata cache for the Cosmos DB MCP server introspection tools.
+
+The first call about a container reads its properties and scans up to
+scan_limit documents in a worker thread, then the schema tools answer from
+memory. For every top-level field the scan records the value types, how
+often the field is missing or null, and a HyperLogLog estimate of its
+distinct values; a reservoir keeps a uniform sample of the scanned documents
+for example values.
+
+Entries older than the TTL are still served while they are refreshed in the
+background, so the tools never wait for a scan after the first one.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import random
+import time
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Generic, List, Optional, TypeVar
+
+from query_executor import QueryContainer
+
+
+logger = logging.getLogger("cosmos-mcp-server")
+
+T = TypeVar("T")
+
+
+class HyperLogLog:
+    """
+    Estimates the number of distinct values added, in 2^precision bytes.
+
+    The standard error is about 1.04 / sqrt(2^precision), 1.6% for the
+    default precision.
+    """
+
+    def __init__(self, precision: int = 12):
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: Any):
+        key = json.dumps(value, sort_keys=True, default=str).encode()
+        hashed = int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "big")
+        bits = 64 - self.precision
+        index = hashed >> bits
+        rank = bits - (hashed & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0**-rank for rank in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
+
+
+class ReservoirSample(Generic[T]):
+    """A uniform sample of at most size items of a stream (algorithm R)."""
+
+    def __init__(self, size: int, rng: Optional[random.Random] = None):
+        self.size = size
+        self.items: List[T] = []
+        self.seen = 0
+        self._rng = rng or random.Random()
+
+    def add(self, item: T):
+        self.seen += 1
+        if len(self.items) < self.size:
+            self.items.append(item)
+            return
+        index = self._rng.randrange(self.seen)
+        if index < self.size:
+            self.items[index] = item
+
+
+@dataclass
+class FieldStats:
+    """What the scan found about one top-level field."""
+
+    name: str
+    present: int = 0
+    nulls: int = 0
+    types: Counter = field(default_factory=Counter)
+    distinct: HyperLogLog = field(default_factory=HyperLogLog)
+
+    def add(self, value: Any):
+        self.present += 1
+        if value is None:
+            self.nulls += 1
+            return
+        self.types[type(value).__name__] += 1
+        self.distinct.add(value)
+
+    @property
+    def type_names(self) -> List[str]:
+        """Value types, the most frequent first."""
+        return [name for name, _ in self.types.most_common()]
+
+
+@dataclass
+class ContainerMetadata:
+    """Properties and inferred schema of a container."""
+
+    container_name: str
+    properties: Dict[str, Any]
+    scanned: int
+    fields: Dict[str, FieldStats]
+    sample: List[Dict[str, Any]]
+    refreshed_at: float = field(default_factory=time.monotonic)
+
+    def null_rate(self, name: str) -> float:
+        """Fraction of the scanned documents where the field is missing or null."""
+        stats = self.fields[name]
+        if not self.scanned:
+            return 0.0
+        return (self.scanned - stats.present + stats.nulls) / self.scanned
+
+    def example(self, name: str) -> Any:
+        """A non-null value of the field from the sample, None if there is none."""
+        for document in self.sample:
+            if document.get(name) is not None:
+                return document[name]
+        return None
+
+
+def scan_container(
+    container: QueryContainer,
+    container_name: str,
+    scan_limit: int,
+    sample_size: int,
+    page_size: int = 100,
+) -> ContainerMetadata:
+    """Read the container properties and infer its schema. Blocking."""
+    properties = container.read()
+    fields: Dict[str, FieldStats] = {}
+    sample: ReservoirSample[Dict[str, Any]] = ReservoirSample(sample_size)
+    token = None
+    while sample.seen < scan_limit:
+        size = min(page_size, scan_limit - sample.seen)
+        documents, token = container.query_page("SELECT * FROM c", size, token)
+        for document in documents[: scan_limit - sample.seen]:
+            sample.add(document)
+            for name, value in document.items():
+                stats = fields.get(name)
+                if stats is None:
+                    stats = fields[name] = FieldStats(name)
+                stats.add(value)
+        if not token:
+            break
+    return ContainerMetadata(
+        container_name=container_name,
+        properties=properties,
+        scanned=sample.seen,
+        fields=fields,
+        sample=sample.items,
+    )
+
+
+class MetadataCache:
+    """
+    Caches ContainerMetadata per container, refreshed after ttl seconds.
+
+    A container is scanned once however many tools ask about it at the
+    same time. Once an entry is stale it is still returned while a
+    background task scans the container again; if that scan fails the old
+    entry is kept and the next call retries.
+    """
+
+    def __init__(
+        self,
+        get_container: Callable[[str], QueryContainer],
+        ttl: float = 300.0,
+        scan_limit: int = 1000,
+        sample_size: int = 100,
+    ):
+        self.get_container = get_container
+        self.ttl = ttl
+        self.scan_limit = scan_limit
+        self.sample_size = sample_size
+        self._entries: Dict[str, ContainerMetadata] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self.stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "refreshes": 0,
+            "refresh_failures": 0,
+        }
+
+    async def get(self, container_name: str) -> ContainerMetadata:
+        """Get the metadata of a container, scanning it on first use."""
+        entry = self._entries.get(container_name)
+        if entry is None:
+            self.stats["misses"] += 1
+            return await asyncio.shield(self._refresh(container_name))
+        if time.monotonic() - entry.refreshed_at < self.ttl:
+            self.stats["hits"] += 1
+        else:
+            self.stats["stale_hits"] += 1
+            self._refresh(container_name)
+        return entry
+
+    def invalidate(self, container_name: Optional[str] = None):
+        """Forget the metadata of a container, or of every container."""
+        if container_name is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(container_name, None)
+
+    async def close(self):
+        """Cancel the refreshes in progress."""
+        tasks = list(self._refreshing.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _refresh(self, container_name: str) -> asyncio.Task:
+        """Start scanning a container, unless a scan is already running."""
+        task = self._refreshing.get(container_name)
+        if task is None:
+            task = asyncio.create_task(self._scan(container_name))
+            # Background refreshes have no caller, their failure is logged
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._refreshing[container_name] = task
+        return task
+
+    async def _scan(self, container_name: str) -> ContainerMetadata:
+        try:
+            began = time.perf_counter()
+            metadata = await asyncio.to_thread(
+                scan_container,
+                self.get_container(container_name),
+                container_name,
+                self.scan_limit,
+                self.sample_size,
+            )
+            self._entries[container_name] = metadata
+            self.stats["refreshes"] += 1
+            logger.info(
+                f"Scanned {metadata.scanned:,} documents of '{container_name}' "
+                f"in {time.perf_counter() - began:.2f}s"
+            )
+            return metadata
+        except Exception as e:
+            self.stats["refresh_failures"] += 1
+            logger.warning(f"Failed to scan container '{container_name}': {e}")
+            raise
+        finally:
+            self._refreshing.pop(container_name, None)
@@ -0,0 +1,82 @@
+"""
+Benchmark of the container metadata cache on synthetic vehicles.
+
+Compares the introspection tools reading the container on every call (the
+container properties and a sample of documents, --latency-ms per request
+to stand in for the Cosmos DB round trip) with MetadataCache lookups, then
+checks the HyperLogLog distinct estimates against the exact counts.
+
+Run from this directory (no Cosmos DB account needed):
+    python metadata_cache_benchmark.py --documents 100000 --latency-ms 20
+"""
+
+import argparse
+import asyncio
+import time
+
+from in_memory_container import InMemoryContainer, synthetic_vehicles
+from metadata_cache import MetadataCache
+from query_executor import QueryExecutor
+
+
+class SlowContainer:
+    """Adds a fixed latency to every request to a container."""
+
+    def __init__(self, container: InMemoryContainer, latency: float):
+        self.container = container
+        self.id = container.id
+        self.latency = latency
+
+    def query_page(self, query, page_size, continuation):
+        time.sleep(self.latency)
+        return self.container.query_page(query, page_size, continuation)
+
+    def read(self):
+        time.sleep(self.latency)
+        return self.container.read()
+
+
+async def uncached_call(container: SlowContainer):
+    """What describe_container and get_partition_key_info read on each call."""
+    await asyncio.to_thread(container.read)
+    await QueryExecutor(container).query("SELECT * FROM c OFFSET 0 LIMIT 10", max_items=10)
+
+
+async def main(documents: int, latency_ms: float, calls: int, scan: int):
+    vehicles = synthetic_vehicles(documents)
+    container = SlowContainer(InMemoryContainer("vehicles", vehicles), latency_ms / 1000)
+    cache = MetadataCache(lambda name: container, scan_limit=scan)
+
+    print(f"{'mode':>10} {'calls':>6} {'per call (us)':>14}")
+    began = time.perf_counter()
+    for _ in range(calls):
+        await uncached_call(container)
+    print(f"{'uncached':>10} {calls:>6} {(time.perf_counter() - began) / calls * 1e6:>14,.0f}")
+
+    began = time.perf_counter()
+    metadata = await cache.get("vehicles")
+    print(f"{'first scan':>10} {1:>6} {(time.perf_counter() - began) * 1e6:>14,.0f}")
+
+    began = time.perf_counter()
+    for _ in range(calls * 1000):
+        await cache.get("vehicles")
+    print(f"{'cached':>10} {calls * 1000:>6} {(time.perf_counter() - began) / calls / 1000 * 1e6:>14,.2f}")
+
+    print(f"\nDistinct values in the {metadata.scanned:,} scanned documents:")
+    print(f"{'field':>10} {'exact':>8} {'estimate':>9} {'error':>7}")
+    scanned = vehicles[: metadata.scanned]
+    for name, stats in metadata.fields.items():
+        exact = len({repr(vehicle[name]) for vehicle in scanned})
+        estimate = stats.distinct.count()
+        print(f"{name:>10} {exact:>8,} {estimate:>9,} {abs(estimate - exact) / exact:>7.1%}")
+    print(f"\ncache stats: {cache.stats}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--documents", type=int, default=100_000)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--scan", type=int, default=10_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.documents, args.latency_ms, args.calls, args.scan))
@@ -0,0 +1,216 @@
+"""
+Async, paginated query execution for the Cosmos DB MCP server tools.
+
+The tools query a container through the QueryContainer interface, one page
+at a time, so the MCP server never loads a whole result set:
+
+- CosmosContainer runs the queries on an Azure Cosmos DB container.
+- InMemoryContainer (in_memory_container.py) runs a subset of the query
+  language on local documents, for tests and benchmarks without Cosmos DB.
+
+QueryExecutor fetches the pages in a worker thread, so the blocking Cosmos
+SDK does not stall the event loop, and stops at a budget of items and bytes.
+A result cut short comes with a continuation token to fetch the rest.
+"""
+
+import asyncio
+import base64
+import json
+
+from collections.abc import AsyncIterator
+from contextlib import aclosing
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Protocol, Tuple
+
+
+class QueryContainer(Protocol):
+    """The container operations used by the MCP tools."""
+
+    id: str
+
+    def query_page(
+        self, query: str, page_size: int, continuation: Optional[str]
+    ) -> Tuple[List[Any], Optional[str]]:
+        """
+        Run a query and return one page of results.
+
+        Args:
+            query: SQL-like query string
+            page_size: Maximum number of items in the page
+            continuation: Token of the page to fetch, None for the first
+
+        Returns:
+            The items of the page and the token of the next page, None on the last
+        """
+
+    def read(self) -> Dict[str, Any]:
+        """Return the container properties."""
+
+
+class CosmosContainer:
+    """QueryContainer on an Azure Cosmos DB container client."""
+
+    def __init__(self, container_client):
+        self._container = container_client
+        self.id = container_client.id
+
+    def query_page(
+        self, query: str, page_size: int, continuation: Optional[str]
+    ) -> Tuple[List[Any], Optional[str]]:
+        pages = self._container.query_items(
+            query=query,
+            enable_cross_partition_query=True,
+            max_item_count=page_size,
+        ).by_page(continuation)
+        page = next(pages, None)
+        items = list(page) if page is not None else []
+        return items, pages.continuation_token
+
+    def read(self) -> Dict[str, Any]:
+        return self._container.read()
+
+
+@dataclass
+class QueryPage:
+    """Items of a query within the budget, and the token to continue it."""
+
+    items: List[Any]
+    continuation_token: Optional[str] = None
+    size_bytes: int = 0
+
+    @property
+    def has_more(self) -> bool:
+        return self.continuation_token is not None
+
+
+def encode_continuation(page_token: Optional[str], skip: int) -> str:
+    """Encode the position after the skip-th item of a page as an opaque token."""
+    data = json.dumps({"page": page_token, "skip": skip})
+    return base64.urlsafe_b64encode(data.encode()).decode()
+
+
+def decode_continuation(token: Optional[str]) -> Tuple[Optional[str], int]:
+    """
+    Decode a token from encode_continuation.
+
+    Raises:
+        ValueError: If the token is not a continuation token of this server
+    """
+    if not token:
+        return None, 0
+    try:
+        data = json.loads(base64.urlsafe_b64decode(token.encode()))
+        return data["page"], int(data["skip"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid continuation token: {token}") from e
+
+
+class QueryExecutor:
+    """
+    Runs queries on a container page by page, within a budget.
+
+    A query returns at most max_items items and about max_bytes of JSON.
+    Pages of page_size items are fetched in a worker thread until the
+    budget is spent; the continuation token of a result cut short points
+    at the first item that was left out, even in the middle of a page.
+    """
+
+    def __init__(
+        self,
+        container: QueryContainer,
+        max_items: int = 100,
+        max_bytes: int = 256 * 1024,
+        page_size: int = 100,
+    ):
+        self.container = container
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.page_size = page_size
+
+    async def query(
+        self,
+        query: str,
+        continuation_token: Optional[str] = None,
+        max_items: Optional[int] = None,
+    ) -> QueryPage:
+        """
+        Run a query and return the items within the budget.
+
+        Args:
+            query: SQL-like query string
+            continuation_token: Token of a previous result, to continue it
+            max_items: Item budget of this call (overrides the executor's)
+
+        Returns:
+            The items, and a continuation token if there are more
+
+        Raises:
+            ValueError: If the continuation token is invalid
+        """
+        max_items = min(max_items or self.max_items, self.max_items)
+        result = QueryPage(items=[])
+        async with aclosing(self._iter_items(query, continuation_token)) as items:
+            async for item, size, token_at, token_after in items:
+                if result.items and result.size_bytes + size > self.max_bytes:
+                    result.continuation_token = token_at
+                    break
+                result.items.append(item)
+                result.size_bytes += size
+                if len(result.items) >= max_items:
+                    result.continuation_token = token_after
+                    break
+        return result
+
+    async def stream(
+        self, query: str, continuation_token: Optional[str] = None
+    ) -> AsyncIterator[Any]:
+        """Yield every item of a query, fetching the pages as they are needed."""
+        async with aclosing(self._iter_items(query, continuation_token)) as items:
+            async for item, *_ in items:
+                yield item
+
+    async def _iter_items(
+        self, query: str, continuation_token: Optional[str]
+    ) -> AsyncIterator[Tuple[Any, int, str, Optional[str]]]:
+        """
+        Yield each item with its JSON size, the token to resume at it and the
+        token to resume after it (None after the last item).
+        """
+        page_token, skip = decode_continuation(continuation_token)
+        while True:
+            items, next_token = await asyncio.to_thread(
+                self.container.query_page, query, self.page_size, page_token
+            )
+            for index in range(skip, len(items)):
+                item = items[index]
+                size = len(json.dumps(item, default=str))
+                if index + 1 < len(items):
+                    token_after = encode_continuation(page_token, index + 1)
+                elif next_token:
+                    token_after = encode_continuation(next_token, 0)
+                else:
+                    token_after = None
+                yield (
+                    item,
+                    size,
+                    encode_continuation(page_token, index),
+                    token_after,
+                )
+            if not next_token:
+                return
+            page_token, skip = next_token, 0
+
+
+def format_json_lines(page: QueryPage) -> str:
+    """
+    Format a query result as JSON lines.
+
+    One line per item, then a line with the number of items and the
+    continuation token, if there are more.
+    """
+    lines = [json.dumps(item, default=str) for item in page.items]
+    trailer: Dict[str, Any] = {"count": len(page.items)}
+    if page.has_more:
+        trailer["continuation_token"] = page.continuation_token
+    lines.append(json.dumps(trailer))
+    return "\n".join(lines)
@@ -0,0 +1,113 @@
+"""
+Benchmark of the query tools on an in-memory container of synthetic vehicles.
+
+Runs a query matching a large part of the container two ways:
+
+  unbounded: the way query_cosmos used to, every result read with
+             list(...) on the event loop and formatted into one string.
+  executor:  QueryExecutor with the server's default budget, the first
+             part of the results and a continuation token.
+
+While a query runs, a ticker task measures how long the event loop is
+blocked, which is how long every other MCP request waits. The executor
+is then used to page through all the results with continuation tokens.
+
+Run from this directory (no Cosmos DB account needed):
+    python query_executor_benchmark.py --documents 1000000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from in_memory_container import InMemoryContainer, synthetic_vehicles
+from query_executor import QueryExecutor, format_json_lines
+
+
+QUERY = "SELECT * FROM c WHERE c.year >= 2015"
+
+
+def format_all(items):
+    """The text format of query_cosmos (format_query_results)."""
+    result = ["Results:", "-" * 50]
+    for i, doc in enumerate(items, 1):
+        result.append(f"\nDocument {i}:")
+        for key, value in doc.items():
+            value_str = (
+                json.dumps(value, indent=2) if isinstance(value, (dict, list)) else str(value)
+            )
+            result.append(f"  {key}: {value_str}")
+    return "\n".join(result)
+
+
+def unbounded_query(container: InMemoryContainer, query: str) -> str:
+    items, token = [], None
+    while True:
+        page, token = container.query_page(query, 1000, token)
+        items.extend(page)
+        if not token:
+            return format_all(items)
+
+
+async def measure(name: str, run):
+    """Run a query while measuring the longest event loop stall."""
+    lag = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal lag
+        while not done:
+            before = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lag = max(lag, time.perf_counter() - before - 0.001)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    began = time.perf_counter()
+    output = await run()
+    elapsed = time.perf_counter() - began
+    done = True
+    await task
+    print(f"{name:>10} {elapsed:>9.2f} {len(output) / 1024:>12,.0f} {lag * 1000:>12,.0f}")
+
+
+async def main(documents: int, max_items: int, max_bytes: int):
+    began = time.perf_counter()
+    container = InMemoryContainer("vehicles", synthetic_vehicles(documents))
+    print(f"Generated {documents:,} vehicles in {time.perf_counter() - began:.1f}s")
+    executor = QueryExecutor(container, max_items=max_items, max_bytes=max_bytes)
+
+    print(f"{'mode':>10} {'time (s)':>9} {'output (KiB)':>12} {'max lag (ms)':>12}")
+
+    async def unbounded():
+        return unbounded_query(container, QUERY)
+
+    async def first_part():
+        return format_json_lines(await executor.query(QUERY))
+
+    await measure("unbounded", unbounded)
+    await measure("executor", first_part)
+
+    # Page through every result, the way a client follows the tokens
+    began = time.perf_counter()
+    token, parts, count = None, 0, 0
+    while True:
+        page = await executor.query(QUERY, token)
+        parts += 1
+        count += len(page.items)
+        token = page.continuation_token
+        if not token:
+            break
+    print(
+        f"\nPaged through {count:,} results in {parts:,} calls, {time.perf_counter() - began:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--documents", type=int, default=1_000_000)
+    parser.add_argument("--max-items", type=int, default=100)
+    parser.add_argument("--max-bytes", type=int, default=256 * 1024)
+    args = parser.parse_args()
+    asyncio.run(main(args.documents, args.max_items, args.max_bytes))
@@ -0,0 +1,143 @@
+"""Measures agent card discovery against local fake remote agents.
+
+Serves the agent cards of --agents remote agents, answering after
+--latency-ms, plus --dead agents that accept connections but never answer.
+Their cards are resolved three ways:
+
+  sequential:  the previous loop, one address after the other, each
+               within --timeout seconds.
+  concurrent:  AgentCardDiscovery.discover, every address at once.
+  warm start:  AgentCardDiscovery.warm_start from the snapshot written by
+               the concurrent discovery.
+
+run:
+  uv run python agent_discovery_benchmark.py --agents 4 --dead 1 --timeout 5
+"""
+
+import argparse
+import asyncio
+import socket
+import tempfile
+import time
+
+from pathlib import Path
+
+import httpx
+import uvicorn
+
+from a2a.client import A2ACardResolver
+from a2a.types import AgentCapabilities, AgentCard, AgentSkill
+from agent_discovery import AgentCardDiscovery
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+
+def make_card(index: int, url: str) -> AgentCard:
+    return AgentCard(
+        name=f'Agent {index}',
+        description=f'Fake remote agent {index}',
+        url=url,
+        version='1.0.0',
+        capabilities=AgentCapabilities(streaming=False),
+        default_input_modes=['text'],
+        default_output_modes=['text'],
+        skills=[
+            AgentSkill(
+                id=f'skill_{index}',
+                name='Echo',
+                description='Echoes the request',
+                tags=['echo'],
+            )
+        ],
+    )
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+async def serve_agent(
+    card: AgentCard | None, port: int, latency: float
+) -> uvicorn.Server:
+    """Serve an agent card, or hang forever if card is None."""
+
+    async def agent_card(request):
+        if card is None:
+            await asyncio.Event().wait()
+        await asyncio.sleep(latency)
+        return JSONResponse(card.model_dump(mode='json', exclude_none=True))
+
+    app = Starlette(routes=[Route('/.well-known/agent-card.json', agent_card)])
+    server = uvicorn.Server(
+        uvicorn.Config(app, port=port, log_level='critical', lifespan='off')
+    )
+    asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    return server
+
+
+async def sequential(addresses: list[str], timeout: float) -> int:
+    resolved = 0
+    async with httpx.AsyncClient(timeout=timeout) as client:
+        for address in addresses:
+            try:
+                await A2ACardResolver(client, address).get_agent_card()
+                resolved += 1
+            except Exception:
+                pass
+    return resolved
+
+
+async def main(agents: int, dead: int, latency: float, timeout: float):
+    servers = []
+    addresses = []
+    for index in range(agents + dead):
+        port = free_port()
+        address = f'http://127.0.0.1:{port}'
+        card = make_card(index, address) if index < agents else None
+        servers.append(await serve_agent(card, port, latency))
+        addresses.append(address)
+
+    print(f'{"mode":>11} {"cards":>6} {"time (s)":>9}')
+    began = time.perf_counter()
+    resolved = await sequential(addresses, timeout)
+    print(
+        f'{"sequential":>11} {resolved:>6} {time.perf_counter() - began:>9.2f}'
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot = Path(directory) / 'agent_cards.json'
+
+        discovery = AgentCardDiscovery(addresses, snapshot, timeout=timeout)
+        began = time.perf_counter()
+        await discovery.discover()
+        elapsed = time.perf_counter() - began
+        print(f'{"concurrent":>11} {len(discovery.cards):>6} {elapsed:>9.2f}')
+        report = discovery.report()
+
+        discovery = AgentCardDiscovery(addresses, snapshot, timeout=timeout)
+        began = time.perf_counter()
+        await discovery.warm_start()
+        elapsed = time.perf_counter() - began
+        print(f'{"warm start":>11} {len(discovery.cards):>6} {elapsed:>9.2f}')
+
+    print(f'\n{report}')
+    for server in servers:
+        server.should_exit = True
+    await asyncio.sleep(0.2)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--agents', type=int, default=4)
+    parser.add_argument('--dead', type=int, default=1)
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--timeout', type=float, default=5)
+    args = parser.parse_args()
+    asyncio.run(
+        main(args.agents, args.dead, args.latency_ms / 1000, args.timeout)
+    )
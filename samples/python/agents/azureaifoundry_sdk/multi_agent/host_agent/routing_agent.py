@@ -6,9 +6,6 @@ import uuid
 
 from typing import Any, Dict, List, Optional
 
-import httpx
-
-from a2a.client import A2ACardResolver
 from a2a.types import (
     AgentCard,
     MessageSendParams,
@@ -19,10 +16,12 @@ from a2a.types import (
     Task,
     TaskState,
 )
+from agent_discovery import AgentCardDiscovery
 from remote_agent_connection import (
     RemoteAgentConnections,
     TaskUpdateCallback,
 )
+from run_watcher import RunWatcher
 from azure.ai.projects import AIProjectClient
 from azure.identity import DefaultAzureCredential
 from dotenv import load_dotenv
@@ -80,6 +79,9 @@ class RoutingAgent:
     tasks to and coordinate their work using Azure AI Agents.
     """
 
+    # Seconds to wait for a remote agent before answering the run with an error
+    SEND_MESSAGE_TIMEOUT = 90
+
     def __init__(
         self,
         task_callback: TaskUpdateCallback | None = None,
@@ -88,6 +90,7 @@ class RoutingAgent:
         self.remote_agent_connections: dict[str, RemoteAgentConnections] = {}
         self.cards: dict[str, AgentCard] = {}
         self.agents: str = ''
+        self.discovery: AgentCardDiscovery | None = None
         self.context = AzureAgentContext()
         
         # Initialize Azure AI Project client (for Azure AI Foundry agents)
@@ -100,6 +103,8 @@ class RoutingAgent:
         )
         # Use the project client's agents interface, not the separate agents_client
         self.agents_client = self.project_client.agents
+        # Polls the runs of all users from one background task
+        self.run_watcher = RunWatcher(self.agents_client)
         self.azure_agent = None
         self.current_thread = None
 
@@ -107,31 +112,39 @@ class RoutingAgent:
         self, remote_agent_addresses: list[str]
     ) -> None:
         """Asynchronous part of initialization."""
-        # Use a single httpx.AsyncClient for all card resolutions for efficiency
-        async with httpx.AsyncClient(timeout=30) as client:
-            for address in remote_agent_addresses:
-                card_resolver = A2ACardResolver(
-                    client, address
-                )  # Constructor is sync
-                try:
-                    card = (
-                        await card_resolver.get_agent_card()
-                    )  # get_agent_card is async
+        # Cards are resolved concurrently; when the snapshot of the last run
+        # has every agent its cards are used at once and refreshed later.
+        self.discovery = AgentCardDiscovery(
+            remote_agent_addresses,
+            snapshot_path=os.getenv('AGENT_CARD_SNAPSHOT', '.agent_cards.json'),
+            timeout=float(os.getenv('AGENT_CARD_TIMEOUT', '5')),
+        )
+        results = await self.discovery.warm_start()
+        print(f'Agent card discovery:\n{self.discovery.report()}')
+        for address, result in results.items():
+            if result.card:
+                self._add_remote_agent(address, result.card)
+        self._update_agent_roster()
+
+    def _add_remote_agent(self, address: str, card: AgentCard) -> None:
+        """Connect to a remote agent, replacing any connection of the same name."""
+        try:
+            remote_connection = RemoteAgentConnections(
+                agent_card=card, agent_url=address
+            )
+            self.remote_agent_connections[card.name] = remote_connection
+            self.cards[card.name] = card
+        except Exception as e:
+            print(
+                f'ERROR: Failed to initialize connection for {address}: {e}'
+            )
 
-                    remote_connection = RemoteAgentConnections(
-                        agent_card=card, agent_url=address
-                    )
-                    self.remote_agent_connections[card.name] = remote_connection
-                    self.cards[card.name] = card
-                except httpx.ConnectError as e:
-                    print(
-                        f'ERROR: Failed to get agent card from {address}: {e}'
-                    )
-                except Exception as e:  # Catch other potential errors
-                    print(
-                        f'ERROR: Failed to initialize connection for {address}: {e}'
-                    )
+    def _on_card_update(self, address: str, card: AgentCard) -> None:
+        """Apply a card that changed since the last discovery."""
+        self._add_remote_agent(address, card)
+        self._update_agent_roster()
 
+    def _update_agent_roster(self) -> None:
         # Populate self.agents using the logic from original __init__ (via list_remote_agents)
         agent_info = []
         for agent_detail_dict in self.list_remote_agents():
@@ -360,6 +373,8 @@ Always be helpful and route requests to the most appropriate agent."""
         try:
             # Initialize session if needed
             self.initialize_session()
+            if self.discovery:
+                self.discovery.ensure_background_refresh(self._on_card_update)
             
             print(f"Processing message: {user_message[:50]}...")
             
@@ -379,24 +394,24 @@ Always be helpful and route requests to the most appropriate agent."""
             )
             print(f"Created run, run ID: {run.id}")
 
-            # Poll the run until completion
-            max_iterations = 120  # 120 seconds timeout (increased from 60)
-            iteration = 0
-            while run.status in ["queued", "in_progress", "requires_action"] and iteration < max_iterations:
-                # Handle function calls if needed
-                if run.status == "requires_action":
-                    await self._handle_required_actions(run)
-                
-                time.sleep(1)
-                iteration += 1
-                run = self.agents_client.runs.get(
-                    thread_id=self.current_thread.id, 
-                    run_id=run.id
+            # Wait for the run without blocking the event loop, handling
+            # function calls until it finishes
+            deadline = time.monotonic() + 120
+            try:
+                run = await self.run_watcher.wait(
+                    self.current_thread.id, run.id, timeout=120
                 )
-                print(f"Run status: {run.status} (iteration {iteration})")
-
-            if iteration >= max_iterations:
+                while run.status == "requires_action":
+                    await self._handle_required_actions(run)
+                    run = await self.run_watcher.wait(
+                        self.current_thread.id,
+                        run.id,
+                        timeout=deadline - time.monotonic()
+                    )
+                    print(f"Run status: {run.status}")
+            except TimeoutError:
                 return "Request timed out after 120 seconds. Please try again."
+            print(f"Run finished with status: {run.status}")
 
             if run.status == "failed":
                 error_info = f"Run error: {run.last_error}"
@@ -437,32 +452,28 @@ Always be helpful and route requests to the most appropriate agent."""
         try:
             if hasattr(run, 'required_action') and run.required_action:
                 tool_calls = run.required_action.submit_tool_outputs.tool_calls
-                tool_outputs = []
-                
+
+                # Call the remote agents concurrently, identical calls are
+                # made once and share their output
+                executions = {}
+                call_keys = []
                 for tool_call in tool_calls:
-                    function_name = tool_call.function.name
-                    function_args = json.loads(tool_call.function.arguments)
-                    
-                    print(f"Executing function: {function_name} with args: {function_args}")
-                    
-                    if function_name == "send_message":
-                        try:
-                            # Call our send_message method
-                            result = await self.send_message(
-                                agent_name=function_args["agent_name"],
-                                task=function_args["task"]
-                            )
-                            # Convert result to JSON string
-                            output = json.dumps(result.model_dump() if hasattr(result, 'model_dump') else str(result))
-                        except Exception as e:
-                            output = json.dumps({"error": str(e)})
-                    else:
-                        output = json.dumps({"error": f"Unknown function: {function_name}"})
-                    
-                    tool_outputs.append({
+                    key = (tool_call.function.name, tool_call.function.arguments)
+                    if key not in executions:
+                        executions[key] = asyncio.create_task(
+                            self._execute_function(*key)
+                        )
+                    call_keys.append(key)
+                await asyncio.gather(*executions.values())
+
+                # Submit the outputs in the order of the tool calls
+                tool_outputs = [
+                    {
                         "tool_call_id": tool_call.id,
-                        "output": output
-                    })
+                        "output": executions[key].result()
+                    }
+                    for tool_call, key in zip(tool_calls, call_keys)
+                ]
                 
                 # Submit the tool outputs
                 self.agents_client.runs.submit_tool_outputs(
@@ -477,6 +488,35 @@ Always be helpful and route requests to the most appropriate agent."""
             import traceback
             traceback.print_exc()
 
+    async def _execute_function(self, function_name: str, arguments: str) -> str:
+        """Execute a function called by the Azure AI Agent, returning its JSON output."""
+        try:
+            function_args = json.loads(arguments)
+        except json.JSONDecodeError as e:
+            return json.dumps({"error": f"Invalid arguments JSON: {e}"})
+
+        print(f"Executing function: {function_name} with args: {function_args}")
+
+        if function_name != "send_message":
+            return json.dumps({"error": f"Unknown function: {function_name}"})
+        try:
+            # Call our send_message method
+            result = await asyncio.wait_for(
+                self.send_message(
+                    agent_name=function_args["agent_name"],
+                    task=function_args["task"]
+                ),
+                timeout=self.SEND_MESSAGE_TIMEOUT
+            )
+            # Convert result to JSON string
+            return json.dumps(result.model_dump() if hasattr(result, 'model_dump') else str(result))
+        except TimeoutError:
+            return json.dumps({
+                "error": f"{function_args['agent_name']} did not respond within {self.SEND_MESSAGE_TIMEOUT} seconds"
+            })
+        except Exception as e:
+            return json.dumps({"error": str(e)})
+
     def cleanup(self):
         """Clean up Azure AI agent resources."""
         try:
@@ -486,6 +526,15 @@ Always be helpful and route requests to the most appropriate agent."""
         except Exception as e:
             print(f"Error cleaning up agent: {e}")
         finally:
+            if hasattr(self, 'run_watcher'):
+                try:
+                    self.run_watcher.close()
+                except Exception as e:
+                    print(f"Error closing run watcher: {e}")
+
+            if getattr(self, 'discovery', None):
+                self.discovery.close()
+
             # Close the client to clean up resources
             if hasattr(self, 'agents_client') and self.agents_client:
                 try:
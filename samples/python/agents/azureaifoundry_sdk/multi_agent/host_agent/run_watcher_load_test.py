@@ -0,0 +1,161 @@
+"""Load tests RunWatcher offline, against a fake Azure AI Agents client.
+
+Every simulated user creates a run that is queued, runs, asks for one
+tool call, and completes. The runs are waited on two ways:
+
+  sleep:    the previous loop, time.sleep between blocking runs.get calls
+            inside the coroutine (on a sample of the users).
+  watcher:  RunWatcher, every run polled by one background poller.
+
+The event loop lag is measured by a heartbeat task while the users run.
+
+run:
+  uv run python run_watcher_load_test.py --users 500
+"""
+
+import argparse
+import asyncio
+import itertools
+import random
+import time
+
+from types import SimpleNamespace
+
+from run_watcher import RunWatcher
+
+
+class FakeRuns:
+    """Simulates the runs operations of the sync AgentsClient."""
+
+    def __init__(self, run_time: float, request_time: float, seed: int = 0):
+        self._run_time = run_time
+        self._request_time = request_time
+        self._rng = random.Random(seed)
+        self._ids = itertools.count()
+        self._runs: dict[str, dict] = {}
+
+    def create(self, thread_id: str, agent_id: str) -> SimpleNamespace:
+        time.sleep(self._request_time)
+        run_id = f'run_{next(self._ids)}'
+        self._runs[run_id] = {
+            'created': time.monotonic(),
+            # Queued, running until the tool call, running after it.
+            'phases': [self._rng.uniform(0.5, 1.5) * self._run_time / 3] * 3,
+            'submitted': None,
+        }
+        return self.get(thread_id, run_id)
+
+    def get(self, thread_id: str, run_id: str) -> SimpleNamespace:
+        time.sleep(self._request_time)
+        run = self._runs[run_id]
+        queued, before_tool, after_tool = run['phases']
+        elapsed = time.monotonic() - run['created']
+        required_action = None
+        if elapsed < queued:
+            status = 'queued'
+        elif run['submitted'] is None:
+            if elapsed < queued + before_tool:
+                status = 'in_progress'
+            else:
+                status = 'requires_action'
+                required_action = SimpleNamespace(
+                    submit_tool_outputs=SimpleNamespace(
+                        tool_calls=[SimpleNamespace(id=f'{run_id}_call')]
+                    )
+                )
+        elif time.monotonic() - run['submitted'] < after_tool:
+            status = 'in_progress'
+        else:
+            status = 'completed'
+        return SimpleNamespace(
+            id=run_id,
+            thread_id=thread_id,
+            status=status,
+            required_action=required_action,
+        )
+
+    def submit_tool_outputs(self, thread_id, run_id, tool_outputs):
+        time.sleep(self._request_time)
+        self._runs[run_id]['submitted'] = time.monotonic()
+
+
+class FakeAgentsClient:
+    def __init__(self, run_time: float = 3.0, request_time: float = 0.02):
+        self.runs = FakeRuns(run_time, request_time)
+
+
+async def user_with_sleep(client: FakeAgentsClient, user: int):
+    run = client.runs.create(thread_id=f'thread_{user}', agent_id='agent')
+    while run.status in ['queued', 'in_progress', 'requires_action']:
+        if run.status == 'requires_action':
+            client.runs.submit_tool_outputs(run.thread_id, run.id, [])
+        time.sleep(1)
+        run = client.runs.get(thread_id=run.thread_id, run_id=run.id)
+
+
+async def user_with_watcher(
+    client: FakeAgentsClient, watcher: RunWatcher, user: int
+):
+    run = await asyncio.to_thread(
+        client.runs.create, thread_id=f'thread_{user}', agent_id='agent'
+    )
+    run = await watcher.wait(run.thread_id, run.id, timeout=60)
+    while run.status == 'requires_action':
+        await asyncio.to_thread(
+            client.runs.submit_tool_outputs, run.thread_id, run.id, []
+        )
+        run = await watcher.wait(run.thread_id, run.id, timeout=60)
+    assert run.status == 'completed', run.status
+
+
+async def measure(name: str, users: int, coroutines) -> None:
+    lag = 0.0
+    done = asyncio.Event()
+
+    async def heartbeat():
+        nonlocal lag
+        while not done.is_set():
+            began = time.monotonic()
+            await asyncio.sleep(0.05)
+            lag = max(lag, time.monotonic() - began - 0.05)
+
+    beat = asyncio.create_task(heartbeat())
+    began = time.monotonic()
+    await asyncio.gather(*coroutines)
+    elapsed = time.monotonic() - began
+    done.set()
+    await beat
+    print(f'{name:>8} {users:>6} {elapsed:>9.2f} {lag * 1000:>14.0f}')
+
+
+async def main(users: int, sample: int, run_time: float):
+    print(f'simulated run time {run_time:.1f}s')
+    print(f'{"mode":>8} {"users":>6} {"total (s)":>9} {"max lag (ms)":>14}')
+    client = FakeAgentsClient(run_time)
+    await measure(
+        'sleep',
+        sample,
+        [user_with_sleep(client, user) for user in range(sample)],
+    )
+    watcher = RunWatcher(client)
+    await measure(
+        'watcher',
+        users,
+        [user_with_watcher(client, watcher, user) for user in range(users)],
+    )
+    summary = watcher.summary()
+    print(
+        f'{"":>8} p50 {summary["p50_latency"]:.2f}s, '
+        f'p95 {summary["p95_latency"]:.2f}s, '
+        f'mean polls {summary["mean_polls"]:.1f} per run'
+    )
+    watcher.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--sample', type=int, default=5)
+    parser.add_argument('--run-time', type=float, default=3.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.sample, args.run_time))
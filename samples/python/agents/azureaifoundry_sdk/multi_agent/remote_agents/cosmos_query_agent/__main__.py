@@ -10,6 +10,8 @@ from pathlib import Path
 
 # Add the current directory to Python path for imports
 sys.path.insert(0, str(Path(__file__).parent))
+# and remote_agents, for the MCP session manager shared by the agents
+sys.path.insert(1, str(Path(__file__).parent.parent))
 
 import click
 import httpx
@@ -5,10 +5,10 @@ import os
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
-import httpx
 from dotenv import load_dotenv
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
+from mcp_session import MCPError, session_manager
 
 logger = logging.getLogger(__name__)
 load_dotenv()
@@ -55,68 +55,12 @@ class CosmosQueryAgent:
             return False
 
     async def _initialize_mcp_session(self):
-        """Initialize MCP session with proper session management."""
+        """Initialize the shared MCP session, reused by every tool call."""
         try:
-            async with httpx.AsyncClient(timeout=30) as client:
-                # Step 1: Initialize MCP session with proper capabilities
-                logger.info("Initializing MCP session...")
-                headers = {
-                    "Accept": "application/json, text/event-stream",
-                    "Content-Type": "application/json"
-                }
-                
-                init_response = await client.post(
-                    self.mcp_server_url,
-                    json={
-                        "jsonrpc": "2.0",
-                        "id": 1,
-                        "method": "initialize",
-                        "params": {
-                            "protocolVersion": "2024-11-05",
-                            "capabilities": {
-                                "tools": {}
-                            },
-                            "clientInfo": {
-                                "name": "CosmosQueryAgent",
-                                "version": "1.0.0"
-                            }
-                        }
-                    },
-                    headers=headers
-                )
-                
-                self.session_id = init_response.headers.get('mcp-session-id')
-                if not self.session_id:
-                    raise Exception("No session ID received from MCP server")
-                    
-                logger.info(f"✅ MCP session initialized with ID: {self.session_id}")
-                
-                if init_response.status_code != 200:
-                    raise Exception(f"MCP initialization failed: {init_response.text}")
-                
-                # Step 2: Send initialized notification (REQUIRED!)
-                logger.info("Sending initialized notification...")
-                headers_with_session = {
-                    "Accept": "application/json, text/event-stream",
-                    "Content-Type": "application/json",
-                    "mcp-session-id": self.session_id
-                }
-                
-                notification_response = await client.post(
-                    self.mcp_server_url,
-                    json={
-                        "jsonrpc": "2.0",
-                        "method": "notifications/initialized",
-                        "params": {}
-                    },
-                    headers=headers_with_session
-                )
-                
-                if notification_response.status_code not in [200, 202]:
-                    logger.warning(f"Initialized notification returned {notification_response.status_code}")
-                else:
-                    logger.info("✅ Initialized notification sent successfully")
-                    
+            self.mcp_session = session_manager.get(
+                self.mcp_server_url, client_name="CosmosQueryAgent"
+            )
+            self.session_id = await self.mcp_session.initialize()
         except Exception as e:
             logger.error(f"Failed to initialize MCP session: {e}")
             raise
@@ -152,79 +96,31 @@ class CosmosQueryAgent:
         Returns:
             Tool result as string
         """
-        if arguments is None:
-            arguments = {}
-            
         try:
-            async with httpx.AsyncClient(timeout=30) as client:
-                headers_with_session = {
-                    "Accept": "application/json, text/event-stream", 
-                    "Content-Type": "application/json",
-                    "mcp-session-id": self.session_id
-                }
-                
-                request_data = {
-                    "jsonrpc": "2.0",
-                    "id": f"tool_call_{datetime.now().isoformat()}",
-                    "method": "tools/call",
-                    "params": {
-                        "name": tool_name,
-                        "arguments": arguments
-                    }
-                }
-                
-                response = await client.post(
-                    self.mcp_server_url,
-                    json=request_data,
-                    headers=headers_with_session
-                )
-                
-                if response.status_code == 200:
-                    response_text = response.text
-                    
-                    # Handle event stream response
-                    if "event: message" in response_text and "data: " in response_text:
-                        lines = response_text.split('\n')
-                        for line in lines:
-                            if line.startswith('data: '):
-                                data_json = line[6:]
-                                result = json.loads(data_json)
-                                
-                                if "result" in result:
-                                    # Handle different result formats
-                                    result_data = result["result"]
-                                    if isinstance(result_data, dict):
-                                        if "content" in result_data:
-                                            content = result_data["content"]
-                                            if isinstance(content, list) and len(content) > 0:
-                                                return content[0].get("text", str(result_data))
-                                            else:
-                                                return str(content)
-                                        else:
-                                            return json.dumps(result_data, indent=2)
-                                    else:
-                                        return str(result_data)
-                                elif "error" in result:
-                                    return f"Error: {result['error'].get('message', 'Unknown error')}"
-                    
-                    # Fallback to JSON response
-                    try:
-                        result = response.json()
-                        if "result" in result:
-                            return str(result["result"])
-                        elif "error" in result:
-                            return f"Error: {result['error'].get('message', 'Unknown error')}"
-                        else:
-                            return "Unknown response format"
-                    except:
-                        return response_text
-                else:
-                    return f"HTTP Error {response.status_code}: {response.text}"
-                    
+            if self.mcp_session is None:
+                await self._initialize_mcp_session()
+            result = await self.mcp_session.call_tool(tool_name, arguments)
+            return self._format_tool_result(result)
+        except MCPError as e:
+            return f"Error: {e}"
         except Exception as e:
             logger.error(f"Error calling MCP tool {tool_name}: {e}")
             return f"Error calling tool: {str(e)}"
 
+    @staticmethod
+    def _format_tool_result(result: Any) -> str:
+        """Format the result of a tool call as text."""
+        if isinstance(result, dict):
+            if "content" in result:
+                content = result["content"]
+                if isinstance(content, list) and len(content) > 0:
+                    return content[0].get("text", str(result))
+                else:
+                    return str(content)
+            else:
+                return json.dumps(result, indent=2)
+        return str(result)
+
     async def query_cosmos_db(self, query: str) -> str:
         """
         Execute a SQL-like query on the Cosmos DB container.
@@ -0,0 +1,240 @@
+"""
+Shared MCP session manager for the remote agents.
+
+Keeps one persistent session per MCP server (streamable HTTP transport):
+a pooled httpx client reused by every call, the mcp-session-id from the
+first initialize reused until the server expires it, and responses read
+from the event stream as they arrive.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+from collections.abc import AsyncIterator
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+PROTOCOL_VERSION = "2024-11-05"
+
+
+class MCPError(Exception):
+    """Raised when an MCP request fails or returns a JSON-RPC error."""
+
+
+class _SessionExpired(Exception):
+    """The server no longer knows the session, it must be initialized again."""
+
+
+class MCPSession:
+    """
+    A persistent session with one MCP server.
+
+    Requests share a pooled HTTP client and the session id. When the server
+    answers 404 to a session id (it expired or the server restarted), the
+    session is initialized again and the request retried once. Concurrent
+    requests are bounded by max_concurrency.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        client_name: str = "RemoteAgent",
+        client_version: str = "1.0.0",
+        timeout: float = 30.0,
+        max_concurrency: int = 10,
+    ):
+        self.url = url
+        self.client_name = client_name
+        self.client_version = client_version
+        self.session_id: Optional[str] = None
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            headers={
+                "Accept": "application/json, text/event-stream",
+                "Content-Type": "application/json",
+            },
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency,
+            ),
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._init_lock = asyncio.Lock()
+        self._ids = itertools.count(1)
+        self.stats = {"requests": 0, "initializations": 0, "expirations": 0}
+
+    async def initialize(self) -> str:
+        """Initialize the session, if not done yet, and return its id."""
+        async with self._init_lock:
+            if self.session_id:
+                return self.session_id
+
+            logger.info(f"Initializing MCP session with {self.url}")
+            request_id = next(self._ids)
+            async with self._client.stream(
+                "POST",
+                self.url,
+                json={
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "method": "initialize",
+                    "params": {
+                        "protocolVersion": PROTOCOL_VERSION,
+                        "capabilities": {"tools": {}},
+                        "clientInfo": {
+                            "name": self.client_name,
+                            "version": self.client_version,
+                        },
+                    },
+                },
+            ) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    raise MCPError(f"MCP initialization failed: {response.text}")
+                session_id = response.headers.get("mcp-session-id")
+                if not session_id:
+                    raise MCPError("No session ID received from MCP server")
+                self._check_error(await self._read_response(response, request_id))
+
+            # The initialized notification is required before other requests
+            response = await self._client.post(
+                self.url,
+                json={"jsonrpc": "2.0", "method": "notifications/initialized", "params": {}},
+                headers={"mcp-session-id": session_id},
+            )
+            if response.status_code not in (200, 202):
+                logger.warning(f"Initialized notification returned {response.status_code}")
+
+            self.session_id = session_id
+            self.stats["initializations"] += 1
+            logger.info(f"✅ MCP session initialized with ID: {session_id}")
+            return session_id
+
+    async def list_tools(self) -> List[Dict[str, Any]]:
+        """List the tools of the server."""
+        result = await self.request("tools/list")
+        return result.get("tools", [])
+
+    async def call_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Call a tool and return its result, with its content and isError flag."""
+        return await self.request("tools/call", {"name": name, "arguments": arguments or {}})
+
+    async def call_tools(
+        self, calls: List[Tuple[str, Optional[Dict[str, Any]]]]
+    ) -> List[Any]:
+        """
+        Call several tools concurrently.
+
+        Returns:
+            The results in the order of the calls, with the exception in
+            place of the result of a call that failed.
+        """
+        return await asyncio.gather(
+            *(self.call_tool(name, arguments) for name, arguments in calls),
+            return_exceptions=True,
+        )
+
+    async def request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Send a JSON-RPC request in the session and return its result."""
+        async with self._semaphore:
+            for attempt in range(2):
+                session_id = self.session_id or await self.initialize()
+                try:
+                    message = await self._send(method, params, session_id)
+                except _SessionExpired:
+                    if attempt:
+                        raise MCPError("MCP session expired again after re-initialization")
+                    logger.info(f"MCP session {session_id} expired, initializing a new one")
+                    self.stats["expirations"] += 1
+                    self._expire(session_id)
+                    continue
+                return self._check_error(message)
+
+    async def close(self):
+        """End the session on the server and close the HTTP client."""
+        if self.session_id:
+            try:
+                await self._client.delete(self.url, headers={"mcp-session-id": self.session_id})
+            except httpx.HTTPError as e:
+                logger.debug(f"Could not end MCP session: {e}")
+            self.session_id = None
+        await self._client.aclose()
+
+    async def _send(
+        self, method: str, params: Optional[Dict[str, Any]], session_id: str
+    ) -> Dict[str, Any]:
+        request_id = next(self._ids)
+        payload: Dict[str, Any] = {"jsonrpc": "2.0", "id": request_id, "method": method}
+        if params is not None:
+            payload["params"] = params
+        self.stats["requests"] += 1
+        async with self._client.stream(
+            "POST", self.url, json=payload, headers={"mcp-session-id": session_id}
+        ) as response:
+            if response.status_code == 404:
+                raise _SessionExpired()
+            if response.status_code != 200:
+                await response.aread()
+                raise MCPError(f"HTTP Error {response.status_code}: {response.text}")
+            return await self._read_response(response, request_id)
+
+    async def _read_response(self, response: httpx.Response, request_id: int) -> Dict[str, Any]:
+        """Read the JSON-RPC response to request_id, from JSON or an event stream."""
+        content_type = response.headers.get("content-type", "")
+        if "text/event-stream" not in content_type:
+            return json.loads(await response.aread())
+        # Return as soon as the response arrives, skipping notifications
+        async for message in _iter_sse_messages(response):
+            if message.get("id") == request_id:
+                return message
+            logger.debug(f"Skipping MCP message: {message.get('method')}")
+        raise MCPError(f"MCP event stream ended without a response to request {request_id}")
+
+    def _check_error(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        if "error" in message:
+            raise MCPError(message["error"].get("message", "Unknown error"))
+        return message.get("result", {})
+
+    def _expire(self, session_id: str):
+        if self.session_id == session_id:
+            self.session_id = None
+
+
+async def _iter_sse_messages(response: httpx.Response) -> AsyncIterator[Dict[str, Any]]:
+    """Yield the JSON data of each event of a server-sent event stream."""
+    data: List[str] = []
+    async for line in response.aiter_lines():
+        if line.startswith("data:"):
+            data.append(line[5:].lstrip())
+        elif not line and data:
+            yield json.loads("\n".join(data))
+            data = []
+    if data:
+        yield json.loads("\n".join(data))
+
+
+class MCPSessionManager:
+    """Hands out one shared MCPSession per MCP server URL."""
+
+    def __init__(self):
+        self._sessions: Dict[str, MCPSession] = {}
+
+    def get(self, url: str, **kwargs) -> MCPSession:
+        """Get the session for url, created with kwargs on first use."""
+        session = self._sessions.get(url)
+        if session is None:
+            session = self._sessions[url] = MCPSession(url, **kwargs)
+        return session
+
+    async def close(self):
+        """Close every session."""
+        sessions, self._sessions = list(self._sessions.values()), {}
+        await asyncio.gather(*(session.close() for session in sessions), return_exceptions=True)
+
+
+# Shared by the agents of a process
+session_manager = MCPSessionManager()
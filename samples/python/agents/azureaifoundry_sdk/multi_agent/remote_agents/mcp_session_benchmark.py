@@ -0,0 +1,124 @@
+"""
+Benchmark of the shared MCP session against the mock MCP server.
+
+Starts ../mock_mcp_server.py (unless --url points at a running server) and
+calls its query_cosmos tool:
+
+  per-call:   a new httpx client per call and the whole response read
+              before parsing, the way the Cosmos query agent used to call
+              tools.
+  session:    one MCPSession, calls one after the other.
+  concurrent: one MCPSession, --concurrency calls at a time.
+
+The session id is then invalidated to check the session is initialized
+again transparently.
+
+Run from remote_agents:
+    python mcp_session_benchmark.py --calls 500
+"""
+
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+from mcp_session import MCPSession
+
+MOCK_SERVER = Path(__file__).parent.parent / "mock_mcp_server.py"
+QUERY = {"query": "SELECT * FROM c WHERE c.agent_name = 'TimeAgent'"}
+
+
+async def per_call(url: str, session_id: str, call: int) -> str:
+    async with httpx.AsyncClient(timeout=30) as client:
+        response = await client.post(
+            url,
+            json={
+                "jsonrpc": "2.0",
+                "id": f"tool_call_{call}",
+                "method": "tools/call",
+                "params": {"name": "query_cosmos", "arguments": QUERY},
+            },
+            headers={
+                "Accept": "application/json, text/event-stream",
+                "Content-Type": "application/json",
+                "mcp-session-id": session_id,
+            },
+        )
+        for line in response.text.split("\n"):
+            if line.startswith("data: "):
+                return json.loads(line[6:])["result"]["content"][0]["text"]
+        raise RuntimeError(f"Unexpected response: {response.text}")
+
+
+def report(name: str, calls: int, elapsed: float):
+    print(f"{name:>10} {calls:>6} {elapsed:>9.2f} {calls / elapsed:>9.0f}")
+
+
+async def wait_for_server(url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while True:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                if time.monotonic() > deadline:
+                    raise
+                await asyncio.sleep(0.2)
+
+
+async def main(url: str, calls: int, concurrency: int):
+    await wait_for_server(url)
+    session = MCPSession(url, client_name="Benchmark", max_concurrency=concurrency)
+    session_id = await session.initialize()
+    print(f"{'mode':>10} {'calls':>6} {'total (s)':>9} {'calls/s':>9}")
+
+    began = time.perf_counter()
+    for call in range(calls):
+        await per_call(url, session_id, call)
+    report("per-call", calls, time.perf_counter() - began)
+
+    began = time.perf_counter()
+    for _ in range(calls):
+        await session.call_tool("query_cosmos", QUERY)
+    report("session", calls, time.perf_counter() - began)
+
+    began = time.perf_counter()
+    results = await session.call_tools([("query_cosmos", QUERY)] * calls)
+    report("concurrent", calls, time.perf_counter() - began)
+    failures = [result for result in results if isinstance(result, Exception)]
+    if failures:
+        print(f"{len(failures)} calls failed, first: {failures[0]}")
+
+    # Pretend the server forgot the session
+    session.session_id = "expired-session"
+    await session.call_tool("query_cosmos", QUERY)
+    print(f"\nsession stats: {session.stats}")
+    await session.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="URL of a running MCP server, the mock server is started if not set")
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    server = None
+    if not args.url:
+        server = subprocess.Popen(
+            [sys.executable, str(MOCK_SERVER)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    try:
+        asyncio.run(main(args.url or "http://127.0.0.1:8080/mcp", args.calls, args.concurrency))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
@@ -7,7 +7,6 @@ import grpc
 
 from a2a.grpc import a2a_pb2, a2a_pb2_grpc
 from a2a.server.request_handlers import DefaultRequestHandler, GrpcHandler
-from a2a.server.tasks import InMemoryTaskStore
 from a2a.types import (
     AgentCapabilities,
     AgentCard,
@@ -17,6 +16,7 @@ from a2a.types import (
 from agent_executor import DiceAgentExecutor  # type: ignore[import-untyped]
 from dotenv import load_dotenv
 from grpc_reflection.v1alpha import reflection
+from task_store import SqliteTaskStore, create_task_stores  # type: ignore[import-untyped]
 
 
 load_dotenv()
@@ -27,7 +27,13 @@ logging.basicConfig()
 @click.command()
 @click.option('--host', 'host', default='localhost')
 @click.option('--port', 'port', default=11001)
-async def main(host: str, port: int) -> None:
+@click.option(
+    '--task-db',
+    'task_db',
+    envvar='A2A_TASK_DB',
+    help='SQLite database keeping the tasks across restarts.',
+)
+async def main(host: str, port: int, task_db: str | None) -> None:
     # Verify an API key is set.
     # Not required if using Vertex AI APIs.
     if os.getenv('GOOGLE_GENAI_USE_VERTEXAI') != 'TRUE' and not os.getenv(
@@ -68,8 +74,9 @@ async def main(host: str, port: int) -> None:
     )
 
     agent_executor = DiceAgentExecutor()
+    task_store, _ = create_task_stores(task_db)
     request_handler = DefaultRequestHandler(
-        agent_executor=agent_executor, task_store=InMemoryTaskStore()
+        agent_executor=agent_executor, task_store=task_store
     )
 
     server = grpc.aio.server()
@@ -85,7 +92,11 @@ async def main(host: str, port: int) -> None:
     server.add_insecure_port(f'[::]:{port}')
     print(f'Starting server on port [::]:{port}')
     await server.start()
-    await server.wait_for_termination()
+    try:
+        await server.wait_for_termination()
+    finally:
+        if isinstance(task_store, SqliteTaskStore):
+            await task_store.close()
 
 
 if __name__ == '__main__':
@@ -19,6 +19,7 @@ The agent is implemented with the official A2A Python SDK and a small helper
 layer – the code focuses on game logic rather than protocol plumbing.
 """
 
+import argparse
 import uuid
 
 from a2a.server.agent_execution.agent_executor import AgentExecutor
@@ -103,9 +104,16 @@ class NumberGuessExecutor(AgentExecutor):
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run AgentAlice.')
+    parser.add_argument(
+        '--task-db',
+        help='SQLite database keeping the tasks across restarts.',
+    )
+    args = parser.parse_args()
     run_agent_blocking(
         name='AgentAlice',
         port=AGENT_ALICE_PORT,
         agent_card=alice_card,
         executor=NumberGuessExecutor(),
+        task_db=args.task_db,
     )
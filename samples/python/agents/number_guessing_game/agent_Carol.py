@@ -7,6 +7,7 @@ entries randomly shuffled, depending on the request.  This functionality
 is intentionally simple to keep the focus on A2A message flow.
 """
 
+import argparse
 import json
 import random
 import uuid
@@ -194,9 +195,16 @@ class HistoryHelperExecutor(AgentExecutor):
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run AgentCarol.')
+    parser.add_argument(
+        '--task-db',
+        help='SQLite database keeping the tasks across restarts.',
+    )
+    args = parser.parse_args()
     run_agent_blocking(
         name='AgentCarol',
         port=AGENT_CAROL_PORT,
         agent_card=carol_card,
         executor=HistoryHelperExecutor(),
+        task_db=args.task_db,
     )
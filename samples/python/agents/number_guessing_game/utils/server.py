@@ -12,14 +12,16 @@ from a2a.server.apps.jsonrpc.starlette_app import A2AStarletteApplication
 from a2a.server.request_handlers.default_request_handler import (
     DefaultRequestHandler,
 )
-from a2a.server.tasks.inmemory_task_store import InMemoryTaskStore
 from a2a.types import AgentCard
 
+from utils.task_store import SqliteTaskStore, create_task_stores
+
 
 def build_starlette_app(
     agent_card,
     *,
     executor,
+    task_db: str | None = None,
 ):
     """Create and return a ready-to-serve Starlette ASGI application.
 
@@ -28,6 +30,8 @@ def build_starlette_app(
             instance describing the agent.
         executor: Concrete implementation of the A2A ``AgentExecutor``
             interface that will handle incoming requests.
+        task_db: Optional path of a SQLite database keeping the tasks across
+            restarts; tasks are kept in memory if omitted.
 
     Returns:
         Starlette: Configured Starlette application with the SDK request handler
@@ -41,10 +45,15 @@ def build_starlette_app(
     if executor is None:
         raise ValueError('executor must be supplied')
 
-    handler = DefaultRequestHandler(executor, InMemoryTaskStore())
-    return A2AStarletteApplication(
+    task_store, _ = create_task_stores(task_db)
+    handler = DefaultRequestHandler(executor, task_store)
+    app = A2AStarletteApplication(
         agent_card=agent_card, http_handler=handler
     ).build(rpc_url='/a2a/v1')
+    if isinstance(task_store, SqliteTaskStore):
+        # Write the tasks still buffered by the store before exiting.
+        app.add_event_handler('shutdown', task_store.close)
+    return app
 
 
 def run_agent_blocking(
@@ -53,6 +62,7 @@ def run_agent_blocking(
     agent_card,
     *,
     executor,
+    task_db: str | None = None,
 ) -> None:
     """Spin up a Uvicorn server for the given agent and block the current thread.
 
@@ -61,7 +71,8 @@ def run_agent_blocking(
         port: TCP port to bind to.
         agent_card: Metadata describing the agent (``dict`` or ``AgentCard``).
         executor: Instance of an ``AgentExecutor`` to handle requests.
+        task_db: Optional path of a SQLite database keeping the tasks.
     """
-    app = build_starlette_app(agent_card, executor=executor)
+    app = build_starlette_app(agent_card, executor=executor, task_db=task_db)
     print(f'{name} listening on http://localhost:{port}')
     uvicorn.run(app, host='127.0.0.1', port=port, log_level='error')
@@ -0,0 +1,247 @@
+"""Resolves remote agent cards concurrently, with a snapshot for warm starts."""
+
+import asyncio
+import json
+import logging
+import os
+import time
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+import httpx
+
+from a2a.client import A2ACardResolver
+from a2a.types import AgentCard
+from pydantic import ValidationError
+
+
+logger = logging.getLogger(__name__)
+
+# Called with the address and the new card when a refresh finds a changed card.
+CardUpdateCallback = Callable[[str, AgentCard], None]
+
+
+@dataclass
+class DiscoveryResult:
+    """What is known about the card of one remote agent."""
+
+    address: str
+    card: AgentCard | None = None
+    # 'network' if resolved in this process, 'snapshot' if loaded from disk.
+    source: str = 'network'
+    # Seconds taken by the last resolution, None if never resolved.
+    latency: float | None = None
+    # Error of the last resolution; the card is the last known good one.
+    error: str | None = None
+
+
+class AgentCardDiscovery:
+    """Resolves the agent cards of the remote agents.
+
+    Addresses are resolved concurrently, each within `timeout` seconds, so
+    an agent that is down delays startup by `timeout` at most instead of
+    adding a timeout per address. The outcome is saved to `snapshot_path`:
+    `warm_start` returns the cards of the snapshot at once, only waiting
+    for addresses the snapshot knows nothing about (agents unreachable last
+    time are not waited for), and `ensure_background_refresh` resolves the
+    addresses again every `refresh_interval` seconds. A resolution that
+    fails keeps the last known good card.
+    """
+
+    def __init__(
+        self,
+        addresses: list[str],
+        snapshot_path: str | Path | None = None,
+        timeout: float = 5.0,
+        refresh_interval: float = 300.0,
+    ):
+        self.addresses = list(addresses)
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self.timeout = timeout
+        self.refresh_interval = refresh_interval
+        self.results: dict[str, DiscoveryResult] = {}
+        self._last_discovery: float | None = None
+        self._refresh_task: asyncio.Task | None = None
+
+    @property
+    def cards(self) -> dict[str, AgentCard]:
+        """The last known good card of each address."""
+        return {
+            address: result.card
+            for address, result in self.results.items()
+            if result.card is not None
+        }
+
+    async def warm_start(self) -> dict[str, DiscoveryResult]:
+        """Load the snapshot and resolve the addresses it has never seen."""
+        self.load_snapshot()
+        missing = [a for a in self.addresses if a not in self.results]
+        if missing:
+            await self.discover(missing)
+        return self.results
+
+    async def discover(
+        self, addresses: list[str] | None = None
+    ) -> dict[str, DiscoveryResult]:
+        """Resolve the cards of the addresses, all of them by default."""
+        addresses = self.addresses if addresses is None else addresses
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            results = await asyncio.gather(
+                *(self._resolve(client, address) for address in addresses)
+            )
+        if len(addresses) == len(self.addresses):
+            self._last_discovery = time.monotonic()
+        for result in results:
+            previous = self.results.get(result.address)
+            if result.card is None and previous and previous.card:
+                result.card = previous.card
+                result.source = previous.source
+            self.results[result.address] = result
+        self.save_snapshot()
+        return self.results
+
+    def ensure_background_refresh(self, on_update: CardUpdateCallback) -> None:
+        """Refresh the cards every `refresh_interval` seconds from now on.
+
+        Does nothing if the refresh is already running, so it can be called
+        on every request. Hosts initialized in a short-lived `asyncio.run`
+        start the refresh from their first request, in the serving loop.
+        """
+        if self._refresh_task and not self._refresh_task.done():
+            return
+        self._refresh_task = asyncio.get_running_loop().create_task(
+            self._refresh_forever(on_update)
+        )
+
+    def close(self) -> None:
+        """Stop the background refresh."""
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+    def load_snapshot(self) -> int:
+        """Load the cards of the snapshot, returning how many were loaded."""
+        if not self.snapshot_path or not self.snapshot_path.exists():
+            return 0
+        try:
+            data = json.loads(self.snapshot_path.read_text())
+            cards = data['cards']
+            unreachable = set(data.get('unreachable', []))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(
+                f'Ignoring agent card snapshot {self.snapshot_path}: {e}'
+            )
+            return 0
+        loaded = 0
+        for address in self.addresses:
+            if address in self.results:
+                continue
+            if address not in cards:
+                if address in unreachable:
+                    self.results[address] = DiscoveryResult(
+                        address,
+                        source='snapshot',
+                        error='unreachable at the last discovery',
+                    )
+                continue
+            try:
+                card = AgentCard.model_validate(cards[address])
+            except ValidationError as e:
+                logger.warning(f'Ignoring snapshot card of {address}: {e}')
+                continue
+            self.results[address] = DiscoveryResult(address, card, 'snapshot')
+            loaded += 1
+        return loaded
+
+    def save_snapshot(self) -> None:
+        """Write the known cards to the snapshot, replacing it atomically."""
+        if not self.snapshot_path:
+            return
+        data = {
+            'saved_at': time.time(),
+            'cards': {
+                address: card.model_dump(mode='json', exclude_none=True)
+                for address, card in self.cards.items()
+            },
+            'unreachable': [
+                address
+                for address, result in self.results.items()
+                if result.card is None
+            ],
+        }
+        temporary = self.snapshot_path.with_name(
+            self.snapshot_path.name + '.tmp'
+        )
+        try:
+            temporary.write_text(json.dumps(data, indent=2))
+            os.replace(temporary, self.snapshot_path)
+        except OSError as e:
+            logger.warning(f'Could not save agent card snapshot: {e}')
+
+    def report(self) -> str:
+        """Describe how the card of each address was obtained."""
+        lines = []
+        for address in self.addresses:
+            result = self.results.get(address)
+            if result is None:
+                lines.append(f'{address}: not resolved')
+                continue
+            line = f'{address}: '
+            if result.card:
+                line += f"'{result.card.name}' from {result.source}"
+            else:
+                line += 'no card'
+            if result.latency is not None:
+                line += f' in {result.latency * 1000:.0f} ms'
+            if result.error:
+                line += f' (last resolution failed: {result.error})'
+            lines.append(line)
+        return '\n'.join(lines)
+
+    async def _resolve(
+        self, client: httpx.AsyncClient, address: str
+    ) -> DiscoveryResult:
+        started = time.perf_counter()
+        try:
+            card = await asyncio.wait_for(
+                A2ACardResolver(client, address).get_agent_card(), self.timeout
+            )
+        except Exception as e:
+            if isinstance(e, asyncio.TimeoutError):
+                error = f'timed out after {self.timeout}s'
+            else:
+                error = str(e) or type(e).__name__
+            return DiscoveryResult(
+                address, latency=time.perf_counter() - started, error=error
+            )
+        return DiscoveryResult(
+            address, card, latency=time.perf_counter() - started
+        )
+
+    async def _refresh_forever(self, on_update: CardUpdateCallback) -> None:
+        while True:
+            if self._last_discovery is not None:
+                delay = (
+                    self._last_discovery
+                    + self.refresh_interval
+                    - time.monotonic()
+                )
+                await asyncio.sleep(max(delay, 0))
+            before = self.cards
+            try:
+                await self.discover()
+            except Exception:
+                logger.exception('Agent card refresh failed')
+                self._last_discovery = time.monotonic()
+                continue
+            for address, card in self.cards.items():
+                if before.get(address) != card:
+                    logger.info(f'Agent card of {address} changed')
+                    try:
+                        on_update(address, card)
+                    except Exception:
+                        logger.exception(
+                            f'Failed to apply the card of {address}'
+                        )
@@ -7,9 +7,6 @@ import uuid
 
 from typing import Any
 
-import httpx
-
-from a2a.client import A2ACardResolver
 from a2a.types import (
     AgentCard,
     MessageSendParams,
@@ -19,6 +16,7 @@ from a2a.types import (
     SendMessageSuccessResponse,
     Task,
 )
+from agent_discovery import AgentCardDiscovery
 from dotenv import load_dotenv
 from google.adk import Agent
 from google.adk.agents.callback_context import CallbackContext
@@ -85,36 +83,43 @@ class RoutingAgent:
         self.remote_agent_connections: dict[str, RemoteAgentConnections] = {}
         self.cards: dict[str, AgentCard] = {}
         self.agents: str = ''
+        self.discovery: AgentCardDiscovery | None = None
 
     async def _async_init_components(
         self, remote_agent_addresses: list[str]
     ) -> None:
         """Asynchronous part of initialization."""
-        # Use a single httpx.AsyncClient for all card resolutions for efficiency
-        async with httpx.AsyncClient(timeout=30) as client:
-            for address in remote_agent_addresses:
-                card_resolver = A2ACardResolver(
-                    client, address
-                )  # Constructor is sync
-                try:
-                    card = (
-                        await card_resolver.get_agent_card()
-                    )  # get_agent_card is async
-
-                    remote_connection = RemoteAgentConnections(
-                        agent_card=card, agent_url=address
-                    )
-                    self.remote_agent_connections[card.name] = remote_connection
-                    self.cards[card.name] = card
-                except httpx.ConnectError as e:
-                    print(
-                        f'ERROR: Failed to get agent card from {address}: {e}'
-                    )
-                except Exception as e:  # Catch other potential errors
-                    print(
-                        f'ERROR: Failed to initialize connection for {address}: {e}'
-                    )
+        # Cards are resolved concurrently; the cards in the snapshot of the
+        # last run are used at once and refreshed from the first request.
+        self.discovery = AgentCardDiscovery(
+            remote_agent_addresses,
+            snapshot_path=os.getenv('AGENT_CARD_SNAPSHOT', '.agent_cards.json'),
+            timeout=float(os.getenv('AGENT_CARD_TIMEOUT', '5')),
+        )
+        results = await self.discovery.warm_start()
+        print(f'Agent card discovery:\n{self.discovery.report()}')
+        for address, result in results.items():
+            if result.card:
+                self._add_remote_agent(address, result.card)
+        self._update_agent_roster()
+
+    def _add_remote_agent(self, address: str, card: AgentCard) -> None:
+        """Connect to a remote agent, replacing any connection of the same name."""
+        try:
+            remote_connection = RemoteAgentConnections(
+                agent_card=card, agent_url=address
+            )
+            self.remote_agent_connections[card.name] = remote_connection
+            self.cards[card.name] = card
+        except Exception as e:
+            print(f'ERROR: Failed to initialize connection for {address}: {e}')
+
+    def _on_card_update(self, address: str, card: AgentCard) -> None:
+        """Apply a card that changed since the last discovery."""
+        self._add_remote_agent(address, card)
+        self._update_agent_roster()
 
+    def _update_agent_roster(self) -> None:
         # Populate self.agents using the logic from original __init__ (via list_remote_agents)
         agent_info = []
         for agent_detail_dict in self.list_remote_agents():
@@ -188,6 +193,10 @@ class RoutingAgent:
     def before_model_callback(
         self, callback_context: CallbackContext, llm_request
     ):
+        # The host is initialized in its own asyncio.run(), so the refresh
+        # is started here, in the loop that serves the requests.
+        if self.discovery:
+            self.discovery.ensure_background_refresh(self._on_card_update)
         state = callback_context.state
         if 'session_active' not in state or not state['session_active']:
             if 'session_id' not in state: